@@ -1,4 +1,4 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
 from typing import List, Dict, Optional
@@ -93,6 +93,15 @@ def obter_financiamento(fin_id: int):
     except Exception as e:
         return {"success": False, "error": str(e)}
 
+@app.get("/api/financiamentos/{fin_id}/plano.bin")
+def exportar_plano(fin_id: int):
+    """Plano com aportes no formato binário (colunas int64 em centavos)"""
+    try:
+        dados = sistema.exportar_plano_binario(fin_id)
+        return Response(content=dados, media_type="application/octet-stream")
+    except Exception as e:
+        return {"success": False, "error": str(e)}
+
 # ========== APORTES ==========
 @app.post("/api/aportes")
 def registrar_aporte(aporte: NovoAporte):
@@ -150,6 +159,28 @@ def simular_aporte(fin_id: int, valor: float, numero_parcela: int):
     except Exception as e:
         return {"success": False, "error": str(e)}
 
+# ========== METAS DE QUITAÇÃO ==========
+@app.get("/api/metas/{fin_id}/parcela")
+def parcela_para_quitar(fin_id: int, meses: int):
+    """Parcela fixa necessária para quitar em `meses` parcelas"""
+    try:
+        parcela = sistema.parcela_para_quitar_em(fin_id, meses)
+        return {"success": True, "data": {"meses": meses, "parcela": float(parcela)}}
+    except Exception as e:
+        return {"success": False, "error": str(e)}
+
+@app.get("/api/metas/{fin_id}/aporte")
+def aporte_para_quitar(fin_id: int, numero_parcela: int, meses: int):
+    """Aporte necessário na parcela para quitar em `meses` parcelas"""
+    try:
+        aporte = sistema.aporte_para_quitar_em(fin_id, numero_parcela, meses)
+        return {
+            "success": True,
+            "data": {"meses": meses, "numero_parcela": numero_parcela, "aporte": float(aporte)}
+        }
+    except Exception as e:
+        return {"success": False, "error": str(e)}
+
 # ========== HEALTH CHECK ==========
 @app.get("/api/health")
 def health_check():
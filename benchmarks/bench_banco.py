@@ -0,0 +1,85 @@
+#!/usr/bin/env python
+"""
+Microbenchmark: latência por chamada do banco com e sem o pool de conexões
+
+"Sem pool" reproduz o comportamento anterior: sqlite3.connect a cada
+chamada (a conexão é fechada quando sai de escopo). No fim, compara o
+custo de uma escrita com o perfil seguro (rollback journal + FULL, o padrão
+do SQLite) e com o perfil concorrente (WAL + NORMAL).
+
+Uso: python benchmarks/bench_banco.py
+"""
+
+import sqlite3
+import sys
+import tempfile
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.database import GerenciadorBancoDados
+from src.pool_conexoes import PERFIL_CONCORRENTE, PerfilDurabilidade
+
+
+class BancoSemPool(GerenciadorBancoDados):
+    """Uma conexão nova por chamada, como antes do pool"""
+
+    def _conexao(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(str(self.db_path))
+        conn.row_factory = sqlite3.Row
+        return conn
+
+
+def medir(funcao, repeticoes: int = 200) -> float:
+    """Retorna o melhor tempo médio (µs) de uma chamada"""
+    tempos = timeit.repeat(funcao, number=repeticoes, repeat=5)
+    return min(tempos) / repeticoes * 1e6
+
+
+def main():
+    print("=" * 80)
+    print("BENCHMARK: latência por chamada (conexão por chamada vs pool)")
+    print("=" * 80)
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        caminho = Path(tmpdir) / "bench.db"
+        com_pool = GerenciadorBancoDados(caminho)
+        sem_pool = BancoSemPool(caminho)
+        fin_id = com_pool.criar_financiamento("Moto", 15000, 0.012, 400)
+        com_pool.registrar_aportes_em_lote(fin_id, (
+            {'numero_parcela': numero, 'valor_aporte': 100} for numero in range(1, 13)
+        ))
+
+        operacoes = [
+            ("obter_financiamento", lambda bd: bd.obter_financiamento(fin_id)),
+            ("obter_aportes_dict", lambda bd: bd.obter_aportes_dict(fin_id)),
+            ("gerar_resumo_financiamento (7 consultas)",
+             lambda bd: bd.gerar_resumo_financiamento(fin_id)),
+        ]
+        for nome, operacao in operacoes:
+            antes = medir(lambda: operacao(sem_pool))
+            depois = medir(lambda: operacao(com_pool))
+            print(f"\n  {nome}")
+            print(f"    Sem pool: {antes:8.1f} µs | Com pool: {depois:8.1f} µs | "
+                  f"Speedup: {antes / depois:5.2f}x")
+
+        print(f"\n  {com_pool.estatisticas_pool()}")
+        com_pool.fechar()
+
+    print("\n  registrar_aporte (um commit por chamada)")
+    perfis = [
+        ("DELETE + FULL", PerfilDurabilidade(journal_mode='DELETE', synchronous='FULL')),
+        ("WAL + NORMAL", PERFIL_CONCORRENTE),
+    ]
+    for nome, perfil in perfis:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            bd = GerenciadorBancoDados(Path(tmpdir) / "bench.db", perfil)
+            fin_id = bd.criar_financiamento("Moto", 15000, 0.012, 400)
+            tempo = medir(lambda: bd.registrar_aporte(fin_id, 1, 100), repeticoes=50)
+            print(f"    {nome:14s}: {tempo:8.1f} µs")
+            bd.fechar()
+
+
+if __name__ == "__main__":
+    main()
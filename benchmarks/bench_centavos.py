@@ -0,0 +1,72 @@
+#!/usr/bin/env python
+"""
+Microbenchmark: backend em centavos vs laço em Decimal
+
+Uso: python benchmarks/bench_centavos.py
+"""
+
+import sys
+import timeit
+from pathlib import Path
+from datetime import datetime
+from decimal import Decimal
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.amortizacao import CalculadoraAmortizacao, BACKEND_CENTAVOS, BACKEND_DECIMAL
+
+
+CENARIOS = [
+    ("Moto 15k / 1,2% / 400", 15000, 0.012, 400, {3: 500, 7: 1000}),
+    ("Imóvel 250k / 0,79% / 2.100", 250000, 0.0079, 2100, {12: 10000, 24: 10000}),
+    ("Habitacional 300k / 0,75% / 420 meses", 300000, 0.0075, 2352, {60: 20000}),
+]
+
+
+def medir(funcao, repeticoes: int = 20) -> float:
+    """Retorna o melhor tempo médio (ms) de uma chamada"""
+    tempos = timeit.repeat(funcao, number=repeticoes, repeat=5)
+    return min(tempos) / repeticoes * 1000
+
+
+def nucleo_decimal(calc: CalculadoraAmortizacao, aportes) -> Decimal:
+    """Só a aritmética do laço Decimal (sem montar Parcela)"""
+    saldo = calc.saldo_devedor
+    total_juros = Decimal('0')
+    numero = 1
+    while saldo > Decimal('0.01'):
+        juros = calc.calcular_juros(saldo)
+        aporte = Decimal(str(aportes.get(numero, 0)))
+        principal = calc.parcela_fixa - juros
+        if aporte == 0 and principal <= 0:
+            raise ValueError("Parcela não cobre os juros")
+        saldo = max(saldo - principal - aporte, Decimal('0.00'))
+        total_juros += juros
+        numero += 1
+    return total_juros
+
+
+def main():
+    print("=" * 80)
+    print("BENCHMARK: gerar_plano_completo (centavos vs Decimal)")
+    print("=" * 80)
+
+    for nome, saldo, taxa, parcela, aportes in CENARIOS:
+        inicio = datetime(2026, 1, 1)
+        calc_d = CalculadoraAmortizacao(saldo, taxa, parcela, inicio, backend=BACKEND_DECIMAL)
+        calc_c = CalculadoraAmortizacao(saldo, taxa, parcela, inicio, backend=BACKEND_CENTAVOS)
+
+        nucleo_d = medir(lambda: nucleo_decimal(calc_d, aportes))
+        nucleo_c = medir(lambda: calc_c.gerar_colunas(aportes))
+        plano_d = medir(lambda: calc_d.gerar_plano_completo(aportes))
+        plano_c = medir(lambda: calc_c.gerar_plano_completo(aportes))
+
+        print(f"\n  {nome}")
+        print(f"    Núcleo aritmético  Decimal: {nucleo_d:7.3f} ms | "
+              f"Centavos: {nucleo_c:7.3f} ms | Speedup: {nucleo_d / nucleo_c:5.2f}x")
+        print(f"    Plano completo     Decimal: {plano_d:7.3f} ms | "
+              f"Centavos: {plano_c:7.3f} ms | Speedup: {plano_d / plano_c:5.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+#!/usr/bin/env python
+"""
+Benchmark: vazão do Monte Carlo de renda de revenda (simulações por segundo)
+
+Uso: python benchmarks/bench_monte_carlo.py [simulacoes]
+"""
+
+import os
+import sys
+import time
+from pathlib import Path
+from datetime import datetime
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.amortizacao import CalculadoraAmortizacao
+from src.monte_carlo import ModeloRenda, simular
+
+
+CENARIOS = [
+    ("Moto 15k / 1,2% / 400", 15000, 0.012, 400, ModeloRenda(0.4, 6.0, 0.5)),
+    ("Imóvel 250k / 0,79% / 2.100", 250000, 0.0079, 2100, ModeloRenda(0.3, 7.5, 0.6)),
+]
+
+
+def medir(calc, modelo, simulacoes: int, processos: int) -> float:
+    """Retorna a vazão (simulações por segundo)"""
+    inicio = time.perf_counter()
+    simular(calc, modelo, simulacoes, semente=42, processos=processos)
+    return simulacoes / (time.perf_counter() - inicio)
+
+
+def main():
+    simulacoes = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    cpus = os.cpu_count() or 1
+
+    print("=" * 80)
+    print(f"BENCHMARK: Monte Carlo ({simulacoes} simulações, {cpus} CPUs)")
+    print("=" * 80)
+
+    for nome, saldo, taxa, parcela, modelo in CENARIOS:
+        calc = CalculadoraAmortizacao(saldo, taxa, parcela, datetime(2026, 1, 1))
+        serial = medir(calc, modelo, simulacoes, processos=1)
+        paralelo = medir(calc, modelo, simulacoes, processos=cpus)
+
+        print(f"\n  {nome}")
+        print(f"    1 processo : {serial:9.0f} sim/s")
+        print(f"    {cpus} processos: {paralelo:9.0f} sim/s | Speedup: {paralelo / serial:5.2f}x")
+
+
+if __name__ == "__main__":
+    main()
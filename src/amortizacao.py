@@ -6,15 +6,82 @@ Este módulo implementa a lógica correta de amortização com foco no saldo dev
 permitindo tanto redução de prazo quanto redução de parcela.
 """
 
+import copy
+from array import array
+from functools import lru_cache
+from bisect import bisect_left, bisect_right
+from itertools import accumulate, islice, zip_longest
+from collections.abc import Sequence as SequenceABC
 from dataclasses import dataclass
-from typing import Optional, List, Dict, Tuple
-from datetime import datetime, timedelta
+from typing import TYPE_CHECKING, Callable, Optional, List, Dict, Tuple, Sequence, Iterable, Iterator
+from datetime import date, datetime, time
 from decimal import Decimal, ROUND_HALF_UP
+from fractions import Fraction
+from math import ceil
 
+import numpy as np
 
-@dataclass
+from src.calendario import CALENDARIO_PADRAO, Calendario
+from src.centavos import parcela_price_centavos, para_centavos, para_reais, taxa_racional
+from src.estimativa import estimar_totais
+from src.sensibilidade import Sensibilidades, calcular_sensibilidades
+
+if TYPE_CHECKING:
+    from src.motor_vetorizado import GradeSimulacao
+
+
+BACKEND_CENTAVOS = "centavos"  # Aritmética inteira em centavos (padrão)
+BACKEND_DECIMAL = "decimal"    # Laço original em Decimal (referência)
+
+MODO_PRAZO = "prazo"      # Aporte reduz o prazo (parcela fixa, plano termina antes)
+MODO_PARCELA = "parcela"  # Aporte reduz a parcela (prazo original mantido)
+
+# Colunas do plano, na ordem dos campos de Parcela
+COLUNAS = (
+    'saldo_anterior', 'juros', 'principal',
+    'amortizacao_extra', 'saldo_posterior', 'valor_parcela',
+)
+# Colunas com somas de prefixo no plano (consultas por intervalo em O(1))
+COLUNAS_ACUMULADAS = ('juros', 'principal', 'amortizacao_extra')
+
+
+class FinanciamentoNaoAmortizavel(ValueError):
+    """
+    A parcela não cobre os juros do mês e não há aporte: o saldo nunca cairia
+
+    Detectado no próprio mês (com taxa fixa, já na primeira parcela sem
+    aporte), em vez de simular um plano que não termina.
+    """
+    
+    def __init__(self, numero_parcela: int, saldo: Decimal, juros: Decimal, parcela: Decimal):
+        self.numero_parcela = numero_parcela
+        self.saldo = saldo
+        self.juros = juros
+        self.parcela = parcela
+        super().__init__(
+            f"Parcela de R$ {parcela:,.2f} não cobre os juros de R$ {juros:,.2f} "
+            f"da parcela {numero_parcela} (saldo R$ {saldo:,.2f}); "
+            f"parcela mínima: R$ {self.parcela_minima:,.2f}"
+        )
+    
+    @classmethod
+    def em_centavos(cls, numero_parcela: int, saldo: int, juros: int,
+                    parcela: int) -> 'FinanciamentoNaoAmortizavel':
+        return cls(numero_parcela, para_reais(saldo), para_reais(juros), para_reais(parcela))
+    
+    @property
+    def parcela_minima(self) -> Decimal:
+        """Menor parcela que amortiza o saldo nesse mês"""
+        return self.juros + Decimal('0.01')
+
+
+@dataclass(slots=True)
 class Parcela:
-    """Representa uma parcela mensal da amortização"""
+    """
+    Representa uma parcela mensal da amortização
+    
+    Objeto leve (__slots__) criado sob demanda a partir das colunas do plano.
+    """
     numero: int
     data: datetime
     saldo_anterior: Decimal
@@ -35,32 +102,204 @@ class Parcela:
         )
 
 
+@dataclass(frozen=True)
+class ResumoPlano:
+    """Resumo de um plano de amortização, sem as parcelas"""
+    parcelas: int
+    total_juros: Decimal
+    total_amortizacao_extra: Decimal
+    data_quitacao: Optional[datetime]
+
+
 @dataclass
+class ResumoAnual:
+    """Totais das parcelas que vencem em um ano"""
+    ano: int
+    parcelas: int
+    juros: Decimal
+    principal: Decimal
+    amortizacao_extra: Decimal
+    saldo_final: Decimal
+
+
+@dataclass(frozen=True)
+class ComparacaoModos:
+    """Resumos dos dois modos de aporte para os mesmos aportes"""
+    reducao_prazo: ResumoPlano
+    reducao_parcela: ResumoPlano
+    parcela_final: Decimal  # Parcela após o último aporte no modo redução de parcela
+
+
+class ParcelasPlano(SequenceABC):
+    """Sequência somente leitura que cria cada Parcela ao ser acessada"""
+    
+    __slots__ = ('_plano',)
+    
+    def __init__(self, plano: 'PlanoAmortizacao'):
+        self._plano = plano
+    
+    def __len__(self) -> int:
+        return self._plano.quantidade_parcelas
+    
+    def __getitem__(self, indice):
+        if isinstance(indice, slice):
+            return [self._plano.parcela(i) for i in range(*indice.indices(len(self)))]
+        if indice < 0:
+            indice += len(self)
+        if not 0 <= indice < len(self):
+            raise IndexError("Parcela fora do plano")
+        return self._plano.parcela(indice)
+    
+    def __iter__(self) -> Iterator[Parcela]:
+        plano = self._plano
+        converter = plano._converter
+        valores = [map(converter, plano.colunas[nome]) for nome in COLUNAS]
+        for i, (sa, j, p, e, sp, v) in enumerate(zip(*valores)):
+            yield Parcela(i + 1, plano.data_parcela(i), sa, j, p, e, sp, v)
+    
+    def __eq__(self, outro) -> bool:
+        if isinstance(outro, (ParcelasPlano, list, tuple)):
+            return len(self) == len(outro) and all(a == b for a, b in zip(self, outro))
+        return NotImplemented
+    
+    def __repr__(self) -> str:
+        return f"<ParcelasPlano: {len(self)} parcelas>"
+
+
+def _identidade(valor):
+    return valor
+
+
 class PlanoAmortizacao:
-    """Contém o plano completo de amortização"""
-    saldo_inicial: Decimal
-    taxa_mensal: Decimal
-    parcela_fixa: Decimal
-    data_inicio: datetime
-    parcelas: List[Parcela]
+    """
+    Contém o plano completo de amortização
+    
+    Armazenamento colunar: uma coluna por campo de Parcela (COLUNAS), com
+    valores inteiros em centavos (array/NumPy) ou, no backend 'decimal',
+    listas de Decimal. Os totais são calculados uma vez, na geração.
+    """
+    
+    def __init__(self, saldo_inicial: Decimal, taxa_mensal: Decimal,
+                 parcela_fixa: Decimal, data_inicio: datetime,
+                 colunas: Dict[str, Sequence], em_centavos: bool = True,
+                 calendario: Calendario = CALENDARIO_PADRAO,
+                 acumulados: Optional[Dict[str, Sequence]] = None):
+        self.saldo_inicial = saldo_inicial
+        self.taxa_mensal = taxa_mensal
+        self.parcela_fixa = parcela_fixa
+        self.data_inicio = data_inicio
+        self.colunas = colunas
+        self.em_centavos = em_centavos
+        self._converter = para_reais if em_centavos else _identidade
+        self.quantidade_parcelas = len(colunas['juros'])
+        self.calendario = calendario
+        # Coluna de vencimentos compartilhada (cache do calendário)
+        self.datas = calendario.datas(data_inicio, self.quantidade_parcelas)
+        # Somas de prefixo: acumulados[nome][k] = soma das k primeiras parcelas
+        # (podem vir prontas, ex: de um arquivo de plano)
+        self.acumulados = acumulados or {
+            nome: list(accumulate(colunas[nome], initial=0)) for nome in COLUNAS_ACUMULADAS
+        }
+        self._total_juros = self._converter(self.acumulados['juros'][-1])
+        self._total_extra = self._converter(self.acumulados['amortizacao_extra'][-1])
+    
+    @property
+    def parcelas(self) -> ParcelasPlano:
+        """Parcelas do plano, criadas sob demanda"""
+        return ParcelasPlano(self)
+    
+    def data_parcela(self, indice: int) -> datetime:
+        """Data de vencimento da parcela de índice `indice` (base 0)"""
+        return self.datas[indice]
+    
+    def parcela(self, indice: int) -> Parcela:
+        """Cria a Parcela de índice `indice` (base 0) a partir das colunas"""
+        c = self.colunas
+        converter = self._converter
+        return Parcela(
+            numero=indice + 1,
+            data=self.data_parcela(indice),
+            saldo_anterior=converter(c['saldo_anterior'][indice]),
+            juros=converter(c['juros'][indice]),
+            principal=converter(c['principal'][indice]),
+            amortizacao_extra=converter(c['amortizacao_extra'][indice]),
+            saldo_posterior=converter(c['saldo_posterior'][indice]),
+            valor_parcela=converter(c['valor_parcela'][indice])
+        )
+    
+    def soma_entre(self, coluna: str, inicio: int, fim: int) -> Decimal:
+        """
+        Soma de uma coluna acumulada (COLUNAS_ACUMULADAS) das parcelas
+        inicio..fim (base 1, inclusivo), em O(1)
+        
+        Intervalos fora do plano são limitados às parcelas existentes.
+        """
+        prefixo = self.acumulados[coluna]
+        inicio = min(max(inicio, 1), self.quantidade_parcelas + 1)
+        fim = min(max(fim, inicio - 1), self.quantidade_parcelas)
+        return self._converter(prefixo[fim] - prefixo[inicio - 1])
+    
+    def juros_entre(self, inicio: int, fim: int) -> Decimal:
+        """Juros pagos nas parcelas inicio..fim (base 1, inclusivo)"""
+        return self.soma_entre('juros', inicio, fim)
+    
+    def principal_entre(self, inicio: int, fim: int) -> Decimal:
+        """Principal amortizado pelas parcelas inicio..fim (sem aportes)"""
+        return self.soma_entre('principal', inicio, fim)
+    
+    def amortizacao_extra_entre(self, inicio: int, fim: int) -> Decimal:
+        """Aportes feitos nas parcelas inicio..fim"""
+        return self.soma_entre('amortizacao_extra', inicio, fim)
+    
+    def _parcelas_vencidas_ate(self, data: date) -> int:
+        """Quantidade de parcelas com vencimento até a data (inclusive)"""
+        if not isinstance(data, datetime):
+            data = datetime.combine(data, time.max)
+        return bisect_right(self.datas, data)
+    
+    def saldo_em(self, data: date) -> Decimal:
+        """Saldo devedor após as parcelas vencidas até a data (inclusive)"""
+        pagas = self._parcelas_vencidas_ate(data)
+        if pagas == 0:
+            if not self.quantidade_parcelas:
+                return self.saldo_inicial
+            return self._converter(self.colunas['saldo_anterior'][0])
+        return self._converter(self.colunas['saldo_posterior'][pagas - 1])
+    
+    def resumo_anual(self) -> List[ResumoAnual]:
+        """Totais por ano de vencimento (O(log n) por ano, via somas de prefixo)"""
+        if not self.quantidade_parcelas:
+            return []
+        anos = []
+        inicio = 1
+        for ano in range(self.datas[0].year, self.datas[-1].year + 1):
+            fim = bisect_left(self.datas, datetime(ano + 1, 1, 1))
+            anos.append(ResumoAnual(
+                ano=ano,
+                parcelas=fim - inicio + 1,
+                juros=self.juros_entre(inicio, fim),
+                principal=self.principal_entre(inicio, fim),
+                amortizacao_extra=self.amortizacao_extra_entre(inicio, fim),
+                saldo_final=self._converter(self.colunas['saldo_posterior'][fim - 1])
+            ))
+            inicio = fim + 1
+        return anos
     
     @property
     def total_juros_pago(self) -> Decimal:
         """Soma total de juros pagos"""
-        return sum(p.juros for p in self.parcelas)
+        return self._total_juros
     
     @property
     def total_amortizacao_extra(self) -> Decimal:
         """Soma total de amortizações extras"""
-        return sum(p.amortizacao_extra for p in self.parcelas)
+        return self._total_extra
     
     @property
     def prazo_original_meses(self) -> int:
         """Prazo original em meses (calculado teoricamente)"""
         # Calcula quantas parcelas seriam necessárias sem aportes extras
-        if not self.parcelas:
-            return 0
-        return len(self.parcelas)
+        return self.quantidade_parcelas
     
     @property
     def economias_juros(self) -> Decimal:
@@ -69,6 +308,174 @@ class PlanoAmortizacao:
         return self.total_amortizacao_extra * self.taxa_mensal
 
 
+def _gerar_passos(saldo_atual: int, num: int, den: int, parcela_fixa: int,
+                  aportes: Dict[int, int], numero_inicial: int = 1) -> Iterator[Tuple[int, ...]]:
+    """
+    Mesmo algoritmo de CalculadoraAmortizacao._gerar_plano_decimal, com
+    inteiros em centavos e taxa num/den (num >= 0)
+    
+    Gera, mês a mês, uma tupla com os valores de COLUNAS em centavos.
+    Com numero_inicial > 1, continua um plano a partir do saldo devedor no
+    início dessa parcela (checkpoint).
+    """
+    dobro_den = 2 * den
+    numero_parcela = numero_inicial
+    
+    while saldo_atual > 1:  # Enquanto houver mais de 1 centavo
+        # Mesmo que juros_centavos(), em linha (saldo e taxa >= 0)
+        juros = (2 * saldo_atual * num + den) // dobro_den
+        aporte_extra = aportes.get(numero_parcela, 0)
+        principal = parcela_fixa - juros
+        
+        if aporte_extra == 0 and principal <= 0:
+            raise FinanciamentoNaoAmortizavel.em_centavos(numero_parcela, saldo_atual,
+                                                          juros, parcela_fixa)
+        saldo_posterior = saldo_atual - principal - aporte_extra
+        
+        if saldo_posterior < 0:
+            principal = saldo_atual - aporte_extra
+            saldo_posterior = 0
+        
+        yield (saldo_atual, juros, principal, aporte_extra,
+               saldo_posterior, parcela_fixa + aporte_extra)
+        saldo_atual = saldo_posterior
+        numero_parcela += 1
+
+
+def _gerar_passos_reduzindo_parcela(saldo_atual: int, num: int, den: int, parcela_fixa: int,
+                                    aportes: Dict[int, int], prazo: int,
+                                    numero_inicial: int = 1) -> Iterator[Tuple[int, ...]]:
+    """
+    Como _gerar_passos, mas no modo redução de parcela: depois de cada aporte
+    a parcela é recalculada pela fórmula Price para quitar o saldo no prazo
+    original (`prazo` parcelas contadas desde a parcela 1)
+    """
+    dobro_den = 2 * den
+    numero_parcela = numero_inicial
+    parcela = parcela_fixa
+    
+    while saldo_atual > 1:
+        juros = (2 * saldo_atual * num + den) // dobro_den
+        aporte_extra = aportes.get(numero_parcela, 0)
+        principal = parcela - juros
+        
+        if aporte_extra == 0 and principal <= 0:
+            raise FinanciamentoNaoAmortizavel.em_centavos(numero_parcela, saldo_atual,
+                                                          juros, parcela)
+        saldo_posterior = saldo_atual - principal - aporte_extra
+        
+        if saldo_posterior < 0:
+            principal = saldo_atual - aporte_extra
+            saldo_posterior = 0
+        
+        yield (saldo_atual, juros, principal, aporte_extra,
+               saldo_posterior, parcela + aporte_extra)
+        
+        if aporte_extra and prazo > numero_parcela:
+            parcela = parcela_price_centavos(saldo_posterior, num, den, prazo - numero_parcela)
+        saldo_atual = saldo_posterior
+        numero_parcela += 1
+
+
+def _validar_modo(modo: str):
+    if modo not in (MODO_PRAZO, MODO_PARCELA):
+        raise ValueError(f"Modo desconhecido: {modo}")
+
+
+def _menor_inteiro(atende: Callable[[int], bool], palpite: int, minimo: int,
+                   maximo: Optional[int] = None) -> Optional[int]:
+    """
+    Menor inteiro em [minimo, maximo] que atende a um critério monotônico
+    (falso, ..., falso, verdadeiro, ..., verdadeiro)
+
+    Parte do palpite e dobra o passo até cercar a fronteira (poucas avaliações
+    quando o palpite é bom); depois fecha o intervalo por bisseção.
+
+    Returns:
+        O menor valor, ou None se nem `maximo` atende
+    """
+    palpite = max(palpite, minimo) if maximo is None else min(max(palpite, minimo), maximo)
+    passo = 1
+    if atende(palpite):
+        baixo, alto = palpite - passo, palpite
+        while baixo >= minimo and atende(baixo):
+            alto, passo = baixo, passo * 2
+            baixo = alto - passo
+        baixo = max(baixo, minimo - 1)  # minimo - 1: sentinela "não atende"
+    else:
+        baixo, alto = palpite, palpite + passo
+        while True:
+            if maximo is not None and alto >= maximo:
+                if not atende(maximo):
+                    return None
+                alto = maximo
+                break
+            if atende(alto):
+                break
+            baixo, passo = alto, passo * 2
+            alto = baixo + passo
+    while alto - baixo > 1:
+        meio = (baixo + alto) // 2
+        if atende(meio):
+            alto = meio
+        else:
+            baixo = meio
+    return alto
+
+
+def _colunas_de_passos(passos: Iterable[Tuple[int, ...]]) -> Dict[str, array]:
+    """Transpõe os passos mês a mês em colunas array('q') de centavos"""
+    passos = list(passos)
+    colunas = zip(*passos) if passos else ((),) * len(COLUNAS)
+    return {nome: array('q', coluna) for nome, coluna in zip(COLUNAS, colunas)}
+
+
+def _totais_passos(passos: Iterable[Tuple[int, ...]]) -> Tuple[int, int, int]:
+    """Soma os passos sem guardá-los: (parcelas, juros, aportes) em centavos"""
+    parcelas = total_juros = total_extra = 0
+    for _, juros, _, extra, _, _ in passos:
+        parcelas += 1
+        total_juros += juros
+        total_extra += extra
+    return parcelas, total_juros, total_extra
+
+
+# ============= CACHE DO PLANO BASE (SEM APORTES) =============
+# O plano sem aportes depende só de (saldo, taxa, parcela) e é refeito várias
+# vezes por requisição (simular_aporte, dashboard, simulador). Os caches são
+# do processo inteiro, com tamanho limitado (LRU) e contadores de acertos.
+
+TAMANHO_CACHE_PLANOS = 256
+TAMANHO_CACHE_RESUMOS = 4096
+
+
+@lru_cache(maxsize=TAMANHO_CACHE_PLANOS)
+def _colunas_base(saldo: int, num: int, den: int, parcela: int) -> Tuple[memoryview, ...]:
+    """Colunas do plano sem aportes, somente leitura (compartilhadas entre planos)"""
+    colunas = _colunas_de_passos(_gerar_passos(saldo, num, den, parcela, {}))
+    return tuple(memoryview(colunas[nome]).toreadonly() for nome in COLUNAS)
+
+
+@lru_cache(maxsize=TAMANHO_CACHE_RESUMOS)
+def _resumo_base(saldo: int, num: int, den: int, parcela: int) -> Tuple[int, int, int]:
+    """Totais do plano sem aportes: (parcelas, juros, aportes) em centavos"""
+    return _totais_passos(_gerar_passos(saldo, num, den, parcela, {}))
+
+
+def info_cache_base() -> Dict[str, dict]:
+    """Estatísticas dos caches de plano base: acertos, faltas e ocupação"""
+    return {
+        nome: cache.cache_info()._asdict()
+        for nome, cache in (('planos', _colunas_base), ('resumos', _resumo_base))
+    }
+
+
+def limpar_cache_base():
+    """Esvazia os caches de plano base (e zera os contadores)"""
+    _colunas_base.cache_clear()
+    _resumo_base.cache_clear()
+
+
 class CalculadoraAmortizacao:
     """
     Calculadora de amortização com suporte a:
@@ -78,7 +485,9 @@ class CalculadoraAmortizacao:
     """
     
     def __init__(self, saldo_devedor: float, taxa_mensal: float, 
-                 parcela_mensal: float, data_inicio: datetime = None):
+                 parcela_mensal: float, data_inicio: datetime = None,
+                 backend: str = BACKEND_CENTAVOS,
+                 calendario: Calendario = CALENDARIO_PADRAO):
         """
         Inicializa a calculadora
         
@@ -86,53 +495,347 @@ class CalculadoraAmortizacao:
             saldo_devedor: Saldo devedor total em reais
             taxa_mensal: Taxa de juros mensal em decimal (ex: 0.01 para 1%)
             parcela_mensal: Valor da parcela mensal em reais
-            data_inicio: Data inicial (default: hoje)
+            data_inicio: Data da primeira parcela (default: hoje, 00:00)
+            backend: 'centavos' (inteiros, padrão) ou 'decimal' (laço original)
+            calendario: Regras de vencimento (mesmo dia a cada mês; dia útil opcional)
         """
+        if backend not in (BACKEND_CENTAVOS, BACKEND_DECIMAL):
+            raise ValueError(f"Backend desconhecido: {backend}")
         self.saldo_devedor = Decimal(str(saldo_devedor))
         self.taxa_mensal = Decimal(str(taxa_mensal))
         self.parcela_fixa = Decimal(str(parcela_mensal))
-        self.data_inicio = data_inicio or datetime.now()
+        # Meia-noite: a mesma data de início reaproveita a tabela de vencimentos
+        self.data_inicio = data_inicio or datetime.combine(date.today(), time())
+        self.backend = backend
+        self.calendario = calendario
+    
+    def taxa_da_parcela(self, numero_parcela: int) -> Decimal:
+        """Taxa mensal aplicada na parcela (taxa fixa: sempre taxa_mensal)"""
+        return self.taxa_mensal
     
-    def calcular_juros(self, saldo: Decimal) -> Decimal:
-        """Calcula juros do mês sobre o saldo"""
+    def calcular_juros(self, saldo: Decimal, numero_parcela: int = 1) -> Decimal:
+        """Calcula juros do mês sobre o saldo (taxa fixa: numero_parcela não altera)"""
         return (saldo * self.taxa_mensal).quantize(
             Decimal('0.01'), rounding=ROUND_HALF_UP
         )
     
-    def gerar_plano_completo(self, aportes: Optional[Dict[int, float]] = None) -> PlanoAmortizacao:
+    def verificar_amortizacao(self):
+        """
+        Confere, em O(1), se a primeira parcela cobre os juros do mês
+        
+        Sem aportes, um plano que amortiza no primeiro mês amortiza até o fim
+        (o saldo só cai); com taxa variável, meses com taxa maior ainda são
+        conferidos pelo motor.
+        
+        Raises:
+            FinanciamentoNaoAmortizavel: se juros >= parcela já na parcela 1
+        """
+        if self.saldo_devedor <= Decimal('0.01'):
+            return
+        juros = self.calcular_juros(self.saldo_devedor, 1)
+        if self.parcela_fixa - juros <= 0:
+            raise FinanciamentoNaoAmortizavel(1, self.saldo_devedor, juros, self.parcela_fixa)
+    
+    def gerar_plano_completo(self, aportes: Optional[Dict[int, float]] = None,
+                             modo: str = MODO_PRAZO) -> PlanoAmortizacao:
         """
         Gera o plano completo de amortização com aportes opcionais
         
         Args:
             aportes: Dicionário com {número_parcela: valor_aporte}
                      Exemplo: {3: 500, 7: 1000} para aportes nas parcelas 3 e 7
+            modo: MODO_PRAZO (parcela fixa, termina antes) ou MODO_PARCELA
+                  (parcela recalculada após cada aporte, mantendo o prazo original)
         
         Returns:
             PlanoAmortizacao com todas as parcelas calculadas
+        
+        Raises:
+            FinanciamentoNaoAmortizavel: se em algum mês sem aporte a parcela
+                não cobrir os juros (o plano nunca terminaria)
         """
         aportes = aportes or {}
-        parcelas = []
+        if self.backend == BACKEND_CENTAVOS:
+            try:
+                return self._montar_plano(self.gerar_colunas(aportes, modo))
+            except FinanciamentoNaoAmortizavel:
+                raise
+            except ValueError:
+                pass  # Valores com fração de centavo: usa o laço em Decimal
+        return self._gerar_plano_decimal(aportes, modo)
+    
+    def _parametros_inteiros(self) -> Tuple[int, int, int, int]:
+        """
+        Parâmetros do backend em centavos: (saldo, num, den, parcela)
+        
+        Raises:
+            ValueError: se saldo ou parcela tiverem fração de centavo, ou a taxa for negativa
+        """
+        num, den = taxa_racional(self.taxa_mensal)
+        if num < 0:
+            raise ValueError("Taxa negativa: usa o laço em Decimal")
+        return (para_centavos(self.saldo_devedor), num, den,
+                para_centavos(self.parcela_fixa))
+    
+    def _parametros_curva(self) -> Tuple[int, Tuple[Tuple[int, int], ...], int]:
+        """
+        Parâmetros em centavos com a taxa de cada parcela: (saldo, frações, parcela)
+        
+        frações[k] é a taxa num/den da parcela k + 1; a última vale até quitar.
+        
+        Raises:
+            ValueError: nos mesmos casos de _parametros_inteiros
+        """
+        saldo, num, den, parcela = self._parametros_inteiros()
+        return saldo, ((num, den),), parcela
+    
+    def _passos_centavos(self, aportes: Optional[Dict[int, float]] = None,
+                         modo: str = MODO_PRAZO) -> Iterator[Tuple[int, ...]]:
+        """
+        Passos mês a mês do backend em centavos (ver _gerar_passos)
+        
+        Raises:
+            ValueError: (imediatamente) se saldo, parcela ou aportes tiverem fração de centavo
+        """
+        aportes_c = {n: para_centavos(v) for n, v in (aportes or {}).items()}
+        if modo == MODO_PARCELA and aportes_c:
+            saldo, num, den, parcela = self._parametros_inteiros()
+            return _gerar_passos_reduzindo_parcela(saldo, num, den, parcela, aportes_c,
+                                                   self._totais_sem_aportes()[0])
+        _validar_modo(modo)
+        return self._passos_desde(para_centavos(self.saldo_devedor), aportes_c)
+    
+    def _passos_desde(self, saldo: int, aportes_c: Dict[int, int],
+                      numero_inicial: int = 1) -> Iterator[Tuple[int, ...]]:
+        """Passos em centavos a partir do saldo no início de numero_inicial (validação imediata)"""
+        _, num, den, parcela = self._parametros_inteiros()
+        return _gerar_passos(saldo, num, den, parcela, aportes_c, numero_inicial)
+    
+    def _colunas_sem_aportes(self) -> Tuple[Sequence[int], ...]:
+        """Colunas do plano sem aportes, na ordem de COLUNAS (cache do processo)"""
+        return _colunas_base(*self._parametros_inteiros())
+    
+    def _totais_sem_aportes(self) -> Tuple[int, int, int]:
+        """Totais do plano sem aportes: (parcelas, juros, aportes) em centavos"""
+        return _resumo_base(*self._parametros_inteiros())
+    
+    def gerar_colunas(self, aportes: Optional[Dict[int, float]] = None,
+                      modo: str = MODO_PRAZO) -> Dict[str, Sequence[int]]:
+        """
+        Gera apenas as colunas do plano, em centavos
+        
+        Returns:
+            Dicionário {nome_coluna: array de centavos}, chaves em COLUNAS
+            (sem aportes, as colunas são memoryviews somente leitura do cache)
+        
+        Raises:
+            ValueError: se saldo, parcela ou aportes tiverem fração de centavo
+        """
+        if not aportes:
+            # Plano base: colunas somente leitura vindas do cache do processo
+            _validar_modo(modo)
+            return dict(zip(COLUNAS, self._colunas_sem_aportes()))
+        return _colunas_de_passos(self._passos_centavos(aportes, modo))
+    
+    def iter_parcelas(self, aportes: Optional[Dict[int, float]] = None,
+                      modo: str = MODO_PRAZO) -> Iterator[Parcela]:
+        """
+        Gera as parcelas uma a uma, sem montar o plano inteiro
+        
+        Útil quando só as primeiras parcelas interessam:
+            for parcela in itertools.islice(calc.iter_parcelas(), 12): ...
+        """
+        passos = None
+        if self.backend == BACKEND_CENTAVOS:
+            try:
+                passos = self._passos_centavos(aportes, modo)
+            except ValueError:
+                pass  # Valores com fração de centavo: usa o laço em Decimal
+        
+        if passos is None:
+            yield from self._gerar_plano_decimal(aportes or {}, modo).parcelas
+            return
+        
+        for indice, passo in enumerate(passos):
+            yield Parcela(indice + 1, self.data_parcela(indice), *map(para_reais, passo))
+    
+    def resumir(self, aportes: Optional[Dict[int, float]] = None,
+                modo: str = MODO_PRAZO) -> ResumoPlano:
+        """
+        Resumo do plano (quantidade de parcelas, juros, aportes e quitação)
+        sem criar nenhuma Parcela
+        """
+        _validar_modo(modo)
+        if self.backend == BACKEND_CENTAVOS:
+            try:
+                if aportes and modo == MODO_PRAZO:
+                    totais = self._totais_com_aportes(aportes)
+                elif aportes:
+                    totais = _totais_passos(self._passos_centavos(aportes, modo))
+                else:
+                    totais = self._totais_sem_aportes()
+                parcelas, total_juros, total_extra = totais
+                return ResumoPlano(
+                    parcelas=parcelas,
+                    total_juros=para_reais(total_juros),
+                    total_amortizacao_extra=para_reais(total_extra),
+                    data_quitacao=self.data_parcela(parcelas - 1) if parcelas else None
+                )
+            except FinanciamentoNaoAmortizavel:
+                raise
+            except ValueError:
+                pass  # Valores com fração de centavo: usa o laço em Decimal
+        
+        plano = self._gerar_plano_decimal(aportes or {}, modo)
+        return ResumoPlano(
+            parcelas=plano.quantidade_parcelas,
+            total_juros=plano.total_juros_pago,
+            total_amortizacao_extra=plano.total_amortizacao_extra,
+            data_quitacao=plano.data_parcela(plano.quantidade_parcelas - 1) if plano.quantidade_parcelas else None
+        )
+    
+    def _totais_com_aportes(self, aportes: Dict[int, float]) -> Tuple[int, int, int]:
+        """
+        Totais do plano com aportes (redução de prazo), em centavos
+        
+        Até o primeiro aporte o plano é o base: o prefixo vem das colunas em
+        cache e só o sufixo é simulado (como em simular_aporte).
+        
+        Raises:
+            ValueError: se saldo, parcela ou aportes tiverem fração de centavo
+        """
+        aportes_c = {n: para_centavos(v) for n, v in aportes.items()}
+        try:
+            base = self.gerar_colunas()
+        except FinanciamentoNaoAmortizavel:
+            # Sem aportes o plano não termina, mas os aportes podem fazê-lo terminar
+            return _totais_passos(self._passos_desde(para_centavos(self.saldo_devedor), aportes_c))
+        
+        primeiro = min((n for n in aportes_c if n >= 1), default=0)
+        sufixo = self._passos_a_partir_de(base, primeiro, aportes_c)
+        if sufixo is None:
+            return self._totais_sem_aportes()  # Aportes só depois da quitação
+        parcelas, juros, extra = _totais_passos(sufixo)
+        return parcelas + primeiro - 1, juros + sum(base['juros'][:primeiro - 1]), extra
+    
+    def estimar_resumo(self, aportes: Optional[Dict[int, float]] = None) -> ResumoPlano:
+        """
+        Resumo estimado pela fórmula fechada da tabela Price (ver src.estimativa)
+        
+        Custa O(1) sem aportes e O(quantidade de aportes) com aportes. O prazo
+        normalmente coincide com o de resumir(), mas os juros são aproximados:
+        o motor exato arredonda os juros mês a mês, e esses arredondamentos se
+        acumulam e são capitalizados ao longo do prazo. Em prazos de centenas
+        de meses, ou com a parcela pouco acima dos juros do mês, a diferença
+        chega a alguns reais. Use resumir() quando o valor exato importar.
+        
+        Se a estimativa não se aplicar (taxa negativa, fração de centavo ou
+        parcela que não amortiza), devolve o resumo exato.
+        """
+        try:
+            aportes_c = {numero: para_centavos(valor) for numero, valor in (aportes or {}).items()}
+            totais = estimar_totais(*self._parametros_inteiros(), aportes_c)
+        except ValueError:
+            totais = None
+        if totais is None:
+            return self.resumir(aportes)
+        
+        parcelas, total_juros, total_extra = totais
+        return ResumoPlano(
+            parcelas=parcelas,
+            total_juros=para_reais(total_juros),
+            total_amortizacao_extra=para_reais(total_extra),
+            data_quitacao=self.data_parcela(parcelas - 1) if parcelas else None
+        )
+    
+    def data_parcela(self, indice: int) -> datetime:
+        """Data de vencimento da parcela de índice `indice` (base 0)"""
+        return self.calendario.data_parcela(self.data_inicio, indice)
+    
+    def _passos_a_partir_de(self, colunas_base: Dict[str, Sequence[int]], numero_parcela: int,
+                            aportes_c: Dict[int, int]) -> Optional[Iterator[Tuple[int, ...]]]:
+        """
+        Passos a partir da parcela `numero_parcela`, usando como checkpoint o
+        saldo no início dessa parcela em colunas_base
+        
+        As parcelas anteriores de colunas_base precisam coincidir com o plano
+        desejado (mesmos parâmetros e mesmos aportes antes de numero_parcela).
+        
+        Returns:
+            Iterador do sufixo, ou None se o plano base já terminou antes
+            (nesse caso o plano desejado é idêntico ao base)
+        """
+        if not 1 <= numero_parcela <= len(colunas_base['saldo_anterior']):
+            return None
+        saldo = colunas_base['saldo_anterior'][numero_parcela - 1]
+        return self._passos_desde(int(saldo), aportes_c, numero_parcela)
+    
+    def continuar_plano(self, plano_base: PlanoAmortizacao, numero_parcela: int,
+                        aportes: Optional[Dict[int, float]] = None) -> PlanoAmortizacao:
+        """
+        Gera o plano com `aportes` reaproveitando as parcelas 1..numero_parcela-1
+        de plano_base e recalculando apenas o sufixo divergente
+        
+        Args:
+            plano_base: Plano calculado com os mesmos parâmetros desta calculadora
+                        e com os mesmos aportes antes de numero_parcela
+            numero_parcela: Primeira parcela em que os aportes diferem
+            aportes: Aportes do novo plano
+        """
+        try:
+            if not plano_base.em_centavos or self.backend != BACKEND_CENTAVOS:
+                raise ValueError("Plano base fora do backend em centavos")
+            aportes_c = {n: para_centavos(v) for n, v in (aportes or {}).items()}
+            sufixo = self._passos_a_partir_de(plano_base.colunas, numero_parcela, aportes_c)
+        except ValueError:
+            return self.gerar_plano_completo(aportes)
+        
+        if sufixo is None:
+            return self._montar_plano(plano_base.colunas)
+        
+        corte = numero_parcela - 1
+        colunas = _colunas_de_passos(sufixo)
+        for nome in COLUNAS:
+            colunas[nome][0:0] = array('q', plano_base.colunas[nome][:corte])
+        return self._montar_plano(colunas)
+    
+    def _montar_plano(self, colunas: Dict[str, Sequence], em_centavos: bool = True) -> PlanoAmortizacao:
+        """Monta o PlanoAmortizacao a partir das colunas calculadas"""
+        return PlanoAmortizacao(
+            saldo_inicial=self.saldo_devedor,
+            taxa_mensal=self.taxa_mensal,
+            parcela_fixa=self.parcela_fixa,
+            data_inicio=self.data_inicio,
+            colunas=colunas,
+            em_centavos=em_centavos,
+            calendario=self.calendario
+        )
+    
+    def _gerar_plano_decimal(self, aportes: Dict[int, float], modo: str = MODO_PRAZO) -> PlanoAmortizacao:
+        """Laço de referência em Decimal (usado pelo backend 'decimal')"""
+        _validar_modo(modo)
+        colunas = {nome: [] for nome in COLUNAS}
         saldo_atual = self.saldo_devedor
         numero_parcela = 1
+        parcela_atual = self.parcela_fixa
+        prazo = self.resumir().parcelas if modo == MODO_PARCELA and aportes else 0
         
         while saldo_atual > Decimal('0.01'):  # Enquanto houver saldo
-            # Calcula data da parcela
-            data_parcela = self.data_inicio + timedelta(days=30 * (numero_parcela - 1))
-            
             # Calcula juros sobre o saldo atual
-            juros = self.calcular_juros(saldo_atual)
+            juros = self.calcular_juros(saldo_atual, numero_parcela)
             
             # Aporte extra (se houver)
             aporte_extra = Decimal(str(aportes.get(numero_parcela, 0)))
             
             # Principal (parcela - juros + aporte)
-            principal = self.parcela_fixa - juros
+            principal = parcela_atual - juros
             
             # Se não há aporte, abate a parcela normalmente
             if aporte_extra == 0:
                 if principal <= 0:
-                    # Se juros >= parcela, temos problema - usar principal mínimo
-                    principal = Decimal('1.00')
+                    # Juros >= parcela: o saldo nunca cairia
+                    raise FinanciamentoNaoAmortizavel(numero_parcela, saldo_atual,
+                                                      juros, parcela_atual)
                 saldo_posterior = saldo_atual - principal
                 aporte_extra = Decimal('0.00')
             else:
@@ -146,32 +849,90 @@ class CalculadoraAmortizacao:
                 principal = saldo_atual
                 saldo_posterior = Decimal('0.00')
             
-            parcela = Parcela(
-                numero=numero_parcela,
-                data=data_parcela,
-                saldo_anterior=saldo_atual,
-                juros=juros,
-                principal=principal - aporte_extra,  # Principal sem o aporte
-                amortizacao_extra=aporte_extra,
-                saldo_posterior=saldo_posterior,
-                valor_parcela=self.parcela_fixa + aporte_extra
-            )
+            colunas['saldo_anterior'].append(saldo_atual)
+            colunas['juros'].append(juros)
+            colunas['principal'].append(principal - aporte_extra)  # Principal sem o aporte
+            colunas['amortizacao_extra'].append(aporte_extra)
+            colunas['saldo_posterior'].append(saldo_posterior)
+            colunas['valor_parcela'].append(parcela_atual + aporte_extra)
+            
+            # Redução de parcela: nova parcela Price para o prazo restante
+            if aporte_extra and prazo > numero_parcela:
+                num, den = taxa_racional(self.taxa_da_parcela(numero_parcela + 1))
+                parcela_atual = para_reais(parcela_price_centavos(
+                    Fraction(saldo_posterior) * 100, num, den, prazo - numero_parcela
+                ))
             
-            parcelas.append(parcela)
             saldo_atual = saldo_posterior
             numero_parcela += 1
-            
-            # Proteção contra loops infinitos
-            if numero_parcela > 1000:
-                break
         
-        return PlanoAmortizacao(
-            saldo_inicial=self.saldo_devedor,
-            taxa_mensal=self.taxa_mensal,
-            parcela_fixa=self.parcela_fixa,
-            data_inicio=self.data_inicio,
-            parcelas=parcelas
+        return self._montar_plano(colunas, em_centavos=False)
+    
+    def comparar_modos(self, aportes: Optional[Dict[int, float]] = None) -> ComparacaoModos:
+        """
+        Resume os modos redução de prazo e redução de parcela para os mesmos aportes
+        
+        Os dois planos são idênticos até o primeiro aporte: o prefixo vem do
+        plano base (cache) e os dois sufixos avançam juntos em uma única passada.
+        """
+        aportes = {n: v for n, v in (aportes or {}).items() if v}
+        try:
+            if self.backend != BACKEND_CENTAVOS:
+                raise ValueError("Passada única exige o backend em centavos")
+            aportes_c = {n: para_centavos(v) for n, v in aportes.items()}
+            base = self.gerar_colunas()
+            _, num, den, parcela = self._parametros_inteiros()
+        except ValueError:
+            plano_parcela = self._gerar_plano_decimal(aportes, MODO_PARCELA)
+            ultima = plano_parcela.parcelas[-1] if plano_parcela.quantidade_parcelas else None
+            return ComparacaoModos(
+                reducao_prazo=self.resumir(aportes, MODO_PRAZO),
+                reducao_parcela=ResumoPlano(
+                    parcelas=plano_parcela.quantidade_parcelas,
+                    total_juros=plano_parcela.total_juros_pago,
+                    total_amortizacao_extra=plano_parcela.total_amortizacao_extra,
+                    data_quitacao=ultima.data if ultima else None
+                ),
+                parcela_final=ultima.valor_parcela - ultima.amortizacao_extra if ultima else self.parcela_fixa
+            )
+        
+        prazo = len(base['juros'])
+        primeiro = min(aportes_c, default=prazo + 1)
+        sufixo_prazo = self._passos_a_partir_de(base, primeiro, aportes_c)
+        if sufixo_prazo is None:
+            # Sem aportes antes da quitação: os dois modos são o plano base
+            resumo = self.resumir()
+            ultima = base['valor_parcela'][-1] - base['amortizacao_extra'][-1] if prazo else para_centavos(self.parcela_fixa)
+            return ComparacaoModos(resumo, resumo, para_reais(ultima))
+        
+        sufixo_parcela = _gerar_passos_reduzindo_parcela(
+            int(base['saldo_anterior'][primeiro - 1]), num, den, parcela, aportes_c, prazo, primeiro
         )
+        
+        # Prefixo comum + os dois sufixos em uma única passada
+        juros_prefixo = sum(base['juros'][:primeiro - 1])
+        totais = {MODO_PRAZO: [primeiro - 1, juros_prefixo, 0], MODO_PARCELA: [primeiro - 1, juros_prefixo, 0]}
+        parcela_final = parcela
+        for passo_prazo, passo_parcela in zip_longest(sufixo_prazo, sufixo_parcela):
+            for modo, passo in ((MODO_PRAZO, passo_prazo), (MODO_PARCELA, passo_parcela)):
+                if passo is not None:
+                    total = totais[modo]
+                    total[0] += 1
+                    total[1] += passo[1]
+                    total[2] += passo[3]
+            if passo_parcela is not None:
+                parcela_final = passo_parcela[5] - passo_parcela[3]
+        
+        resumos = {
+            modo: ResumoPlano(
+                parcelas=parcelas,
+                total_juros=para_reais(juros),
+                total_amortizacao_extra=para_reais(extra),
+                data_quitacao=self.data_parcela(parcelas - 1) if parcelas else None
+            )
+            for modo, (parcelas, juros, extra) in totais.items()
+        }
+        return ComparacaoModos(resumos[MODO_PRAZO], resumos[MODO_PARCELA], para_reais(parcela_final))
     
     def simular_aporte(self, valor_aporte: float, numero_parcela: int) -> Tuple[int, Decimal]:
         """
@@ -184,19 +945,192 @@ class CalculadoraAmortizacao:
         Returns:
             (meses_economizados, economia_juros)
         """
-        # Plano sem aporte
-        plano_sem = self.gerar_plano_completo()
-        meses_sem = len(plano_sem.parcelas)
+        try:
+            base = self.gerar_colunas() if self.backend == BACKEND_CENTAVOS else None
+            aporte_c = para_centavos(valor_aporte)
+        except ValueError:
+            base = None
+        
+        if base is None:
+            # Fração de centavo: compara os dois resumos pelo laço em Decimal
+            resumo_sem = self.resumir()
+            resumo_com = self.resumir({numero_parcela: valor_aporte})
+            return (resumo_sem.parcelas - resumo_com.parcelas,
+                    resumo_sem.total_juros - resumo_com.total_juros)
         
-        # Plano com aporte
-        aportes = {numero_parcela: valor_aporte}
-        plano_com = self.gerar_plano_completo(aportes)
-        meses_com = len(plano_com.parcelas)
+        # Os planos são idênticos até numero_parcela - 1: só o sufixo é recalculado
+        sufixo = self._passos_a_partir_de(base, numero_parcela, {numero_parcela: aporte_c})
+        if sufixo is None:
+            return (0, para_reais(0))  # Aporte depois da quitação não muda nada
         
-        meses_economizados = meses_sem - meses_com
-        economia_juros = plano_sem.total_juros_pago - plano_com.total_juros_pago
+        meses_sufixo_base = len(base['juros']) - (numero_parcela - 1)
+        juros_sufixo_base = sum(base['juros'][numero_parcela - 1:])
+        meses_sufixo = juros_sufixo = 0
+        for _, juros, _, _, _, _ in sufixo:
+            meses_sufixo += 1
+            juros_sufixo += juros
+        
+        meses_economizados = meses_sufixo_base - meses_sufixo
+        economia_juros = para_reais(juros_sufixo_base - juros_sufixo)
         
         return (meses_economizados, economia_juros)
+    
+    def _com_parcela(self, parcela_mensal: Decimal) -> 'CalculadoraAmortizacao':
+        """Cópia desta calculadora com outra parcela fixa"""
+        copia = copy.copy(self)
+        copia.parcela_fixa = Decimal(parcela_mensal)
+        return copia
+    
+    def parcela_para_quitar_em(self, meses: int) -> Decimal:
+        """
+        Menor parcela fixa que quita o financiamento em até `meses` parcelas
+        
+        O palpite vem da fórmula fechada da tabela Price; o motor exato só
+        confirma (e corrige em alguns centavos) o arredondamento mensal.
+        
+        Raises:
+            ValueError: se meses < 1
+        """
+        if meses < 1:
+            raise ValueError("O prazo deve ser de ao menos uma parcela")
+        num, den = taxa_racional(self.taxa_da_parcela(1))
+        saldo = Fraction(self.saldo_devedor) * 100
+        palpite = parcela_price_centavos(saldo, max(num, 0), den, meses)
+        
+        def quita(parcela_c: int) -> bool:
+            try:
+                return self._com_parcela(para_reais(parcela_c)).resumir().parcelas <= meses
+            except FinanciamentoNaoAmortizavel:
+                return False
+        
+        return para_reais(_menor_inteiro(quita, palpite, 1))
+    
+    def aporte_para_quitar_em(self, numero_parcela: int, meses: int) -> Decimal:
+        """
+        Menor aporte na parcela `numero_parcela` que quita o financiamento em
+        até `meses` parcelas (0 se o plano atual já quita nesse prazo)
+        
+        O palpite vem da forma fechada (saldo após a parcela menos o valor
+        presente das parcelas restantes) e é refinado primeiro pela
+        estimativa O(1) (estimar_resumo) e depois confirmado pelo motor exato,
+        em poucas avaliações.
+        
+        Raises:
+            ValueError: se não houver aporte possível (numero_parcela > meses)
+        """
+        base = self.resumir()
+        if base.parcelas <= meses:
+            return para_reais(0)
+        if not 1 <= numero_parcela <= meses:
+            raise ValueError(
+                f"Impossível quitar em {meses} parcelas com aporte na parcela {numero_parcela}"
+            )
+        
+        # Pagar todo o saldo da parcela quita o financiamento nela mesma
+        saldo_anterior = ceil(
+            self.gerar_plano_completo().parcelas[numero_parcela - 1].saldo_anterior * 100
+        )
+        taxa = float(self.taxa_da_parcela(numero_parcela))
+        parcela_c = float(self.parcela_fixa) * 100
+        restantes = meses - numero_parcela
+        saldo_depois = saldo_anterior * (1 + taxa) - parcela_c
+        if taxa == 0:
+            valor_presente = parcela_c * restantes
+        else:
+            valor_presente = parcela_c * (1 - (1 + taxa) ** -restantes) / taxa
+        palpite = round(saldo_depois - valor_presente)
+        
+        def quita_estimado(aporte_c: int) -> bool:
+            return self.estimar_resumo({numero_parcela: para_reais(aporte_c)}).parcelas <= meses
+        
+        def quita(aporte_c: int) -> bool:
+            return self.resumir({numero_parcela: para_reais(aporte_c)}).parcelas <= meses
+        
+        palpite = _menor_inteiro(quita_estimado, palpite, 1, saldo_anterior)
+        return para_reais(_menor_inteiro(quita, palpite or saldo_anterior, 1, saldo_anterior))
+    
+    def sensibilidades(self, aportes: Optional[Dict[int, float]] = None) -> Sensibilidades:
+        """
+        Derivadas do plano em um único passe (ver src.sensibilidade):
+        d(total_juros)/d(taxa), d(prazo)/d(aporte) e juros economizados por
+        real de aporte em cada parcela
+        
+        Args:
+            aportes: Aportes já planejados (o plano derivado é o plano com eles)
+        """
+        plano = self.gerar_plano_completo(aportes)
+        saldos = np.asarray(plano.colunas['saldo_anterior'], dtype=float)
+        parcela = float(self.parcela_fixa) * 100
+        if not plano.em_centavos:
+            saldos = saldos * 100
+        taxas = [float(self.taxa_da_parcela(n)) for n in range(1, len(saldos) + 1)]
+        return calcular_sensibilidades(saldos, taxas, parcela)
+    
+    def simular_grade(self, valores: Sequence[float], parcelas: Sequence[int]) -> 'GradeSimulacao':
+        """
+        Simula de uma vez todos os pares (valor do aporte, parcela)
+        
+        Equivale a chamar simular_aporte(valor, parcela) para cada célula, mas
+        o plano base é calculado uma única vez (cache) e todas as células
+        avançam juntas em um único passe vetorizado.
+        
+        Returns:
+            GradeSimulacao com as matrizes [valor, parcela] de meses e juros economizados
+        """
+        # Import local: motor_vetorizado depende deste módulo
+        from src.motor_vetorizado import GradeSimulacao, resumir_sufixos_em_lote
+        
+        valores, parcelas = list(valores), list(parcelas)
+        try:
+            if self.backend != BACKEND_CENTAVOS:
+                raise ValueError("Grade vetorizada exige o backend em centavos")
+            base = self.gerar_colunas()
+            _, num, den, parcela_fixa = self._parametros_inteiros()
+            aportes_c = np.array([para_centavos(v) for v in valores], dtype=np.int64)
+        except ValueError:
+            # Fração de centavo: célula a célula pelo caminho tradicional
+            simulacoes = [[self.simular_aporte(v, p) for p in parcelas] for v in valores]
+            return GradeSimulacao(
+                valores=valores,
+                parcelas=parcelas,
+                meses_economizados=np.array([[m for m, _ in linha] for linha in simulacoes], dtype=np.int64),
+                economia_juros_centavos=np.array(
+                    [[para_centavos(e) for _, e in linha] for linha in simulacoes], dtype=np.int64
+                ),
+            )
+        
+        meses_base = len(base['juros'])
+        juros_base = np.asarray(base['juros']) if meses_base else np.zeros(0, dtype=np.int64)
+        # Juros do plano base da parcela k até o fim (índice k-1), com 0 após a quitação
+        juros_sufixo_base = np.concatenate([np.cumsum(juros_base[::-1])[::-1], [0]])
+        
+        numeros = np.array(parcelas, dtype=np.int64)
+        validas = (numeros >= 1) & (numeros <= meses_base)
+        meses_econ = np.zeros((len(valores), len(parcelas)), dtype=np.int64)
+        juros_econ = np.zeros((len(valores), len(parcelas)), dtype=np.int64)
+        
+        if validas.any() and valores:
+            # Uma célula por par (valor, parcela válida), todas partindo do checkpoint
+            k = numeros[validas]
+            saldos = np.asarray(base['saldo_anterior'])[k - 1]
+            celulas_k = np.tile(k, len(valores))
+            meses, juros = resumir_sufixos_em_lote(
+                saldos=np.tile(saldos, len(valores)).tolist(),
+                numeros=celulas_k,
+                aportes=np.repeat(aportes_c, len(k)).tolist(),
+                num=num, den=den, parcela=parcela_fixa,
+            )
+            meses_sufixo_base = meses_base - (celulas_k - 1)
+            forma = (len(valores), len(k))
+            meses_econ[:, validas] = (meses_sufixo_base - meses).reshape(forma)
+            juros_econ[:, validas] = (juros_sufixo_base[celulas_k - 1] - juros).astype(np.int64).reshape(forma)
+        
+        return GradeSimulacao(
+            valores=valores,
+            parcelas=parcelas,
+            meses_economizados=meses_econ,
+            economia_juros_centavos=juros_econ,
+        )
 
 
 def exemplo_uso():
@@ -215,18 +1149,17 @@ def exemplo_uso():
     # Plano SEM aportes
     print("\n1. PLANO ORIGINAL (SEM APORTES EXTRAS)")
     print("-" * 80)
-    plano_original = calc.gerar_plano_completo()
-    
-    for parcela in plano_original.parcelas[:12]:  # Primeiras 12 parcelas
+    for parcela in islice(calc.iter_parcelas(), 12):  # Só as 12 primeiras são calculadas
         print(f"  {parcela}")
     
-    if len(plano_original.parcelas) > 12:
-        print(f"  ... ({len(plano_original.parcelas) - 12} parcelas omitidas) ...")
-        print(f"  {plano_original.parcelas[-1]}")
+    resumo_original = calc.resumir()
+    if resumo_original.parcelas > 12:
+        print(f"  ... ({resumo_original.parcelas - 12} parcelas omitidas) ...")
     
     print(f"\n  RESUMO:")
-    print(f"  Total de parcelas: {len(plano_original.parcelas)}")
-    print(f"  Total de juros: R$ {plano_original.total_juros_pago:,.2f}")
+    print(f"  Total de parcelas: {resumo_original.parcelas}")
+    print(f"  Total de juros: R$ {resumo_original.total_juros:,.2f}")
+    print(f"  Quitação: {resumo_original.data_quitacao.strftime('%d/%m/%Y')}")
     
     # Plano COM aportes
     print("\n2. PLANO COM APORTES (3º parcela: +R$500, 7º parcela: +R$1.000)")
@@ -250,8 +1183,8 @@ def exemplo_uso():
     # Comparação
     print("\n3. IMPACTO DOS APORTES")
     print("-" * 80)
-    meses_economizados = len(plano_original.parcelas) - len(plano_acelerado.parcelas)
-    economia_juros = plano_original.total_juros_pago - plano_acelerado.total_juros_pago
+    meses_economizados = resumo_original.parcelas - len(plano_acelerado.parcelas)
+    economia_juros = resumo_original.total_juros - plano_acelerado.total_juros_pago
     
     print(f"  Meses economizados: {meses_economizados}")
     print(f"  Economia em juros: R$ {economia_juros:,.2f}")
@@ -0,0 +1,120 @@
+"""
+Calendário de Vencimentos
+
+As parcelas vencem no mesmo dia de cada mês (não a cada 30 dias): 31/01,
+28/02, 31/03... Opcionalmente, o vencimento que cair em fim de semana ou
+feriado é adiado para o próximo dia útil, usando os feriados nacionais
+(fixos e móveis, calculados a partir da Páscoa) e uma tabela de feriados
+locais.
+
+As tabelas de datas são geradas uma vez por (data de início, quantidade) e
+ficam em cache como tuplas imutáveis, compartilhadas por todos os planos.
+"""
+
+import calendar
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from functools import lru_cache
+from typing import FrozenSet, Tuple
+
+
+TAMANHO_CACHE_DATAS = 256
+
+FERIADOS_FIXOS = (
+    (1, 1),    # Confraternização Universal
+    (4, 21),   # Tiradentes
+    (5, 1),    # Dia do Trabalho
+    (9, 7),    # Independência
+    (10, 12),  # Nossa Senhora Aparecida
+    (11, 2),   # Finados
+    (11, 15),  # Proclamação da República
+    (12, 25),  # Natal
+)
+
+
+def pascoa(ano: int) -> date:
+    """Domingo de Páscoa (algoritmo de Meeus/Jones/Butcher, calendário gregoriano)"""
+    a = ano % 19
+    b, c = divmod(ano, 100)
+    d, e = divmod(b, 4)
+    f = (b + 8) // 25
+    g = (b - f + 1) // 3
+    h = (19 * a + b - d - g + 15) % 30
+    i, k = divmod(c, 4)
+    l = (32 + 2 * e + 2 * i - h - k) % 7
+    m = (a + 11 * h + 22 * l) // 451
+    mes, dia = divmod(h + l - 7 * m + 114, 31)
+    return date(ano, mes, dia + 1)
+
+
+@lru_cache(maxsize=64)
+def feriados_nacionais(ano: int) -> FrozenSet[date]:
+    """Feriados nacionais do ano, incluindo os móveis (Carnaval, Sexta-feira Santa, Corpus Christi)"""
+    domingo_pascoa = pascoa(ano)
+    feriados = {date(ano, mes, dia) for mes, dia in FERIADOS_FIXOS}
+    if ano >= 2024:
+        feriados.add(date(ano, 11, 20))  # Consciência Negra (Lei 14.759/2023)
+    for dias in (-48, -47, -2, 60):  # Carnaval (seg/ter), Sexta-feira Santa, Corpus Christi
+        feriados.add(domingo_pascoa + timedelta(days=dias))
+    return frozenset(feriados)
+
+
+def somar_meses(data: datetime, meses: int) -> datetime:
+    """Mesmo dia `meses` meses depois (limitado ao último dia do mês)"""
+    indice = data.month - 1 + meses
+    ano, mes = data.year + indice // 12, indice % 12 + 1
+    return data.replace(year=ano, month=mes, day=min(data.day, calendar.monthrange(ano, mes)[1]))
+
+
+@dataclass(frozen=True)
+class Calendario:
+    """
+    Regras de vencimento das parcelas
+
+    Args:
+        dia_util: Adia vencimentos em fim de semana/feriado para o próximo dia útil
+        feriados_locais: Feriados estaduais/municipais considerados além dos nacionais
+    """
+    dia_util: bool = False
+    feriados_locais: FrozenSet[date] = frozenset()
+
+    def eh_dia_util(self, dia: date) -> bool:
+        return (dia.weekday() < 5 and dia not in feriados_nacionais(dia.year)
+                and dia not in self.feriados_locais)
+
+    def ajustar(self, vencimento: datetime) -> datetime:
+        """Aplica o adiamento para o próximo dia útil, se configurado"""
+        if self.dia_util:
+            while not self.eh_dia_util(vencimento.date() if isinstance(vencimento, datetime) else vencimento):
+                vencimento += timedelta(days=1)
+        return vencimento
+
+    def data_parcela(self, data_inicio: datetime, indice: int) -> datetime:
+        """Vencimento da parcela de índice `indice` (base 0)"""
+        return self.ajustar(somar_meses(data_inicio, indice))
+
+    def indice_do_vencimento(self, data_inicio: datetime, momento: datetime) -> int:
+        """
+        Índice (base 0) do primeiro vencimento na data `momento` ou depois dela
+
+        O palpite vem da diferença em meses; o adiamento para dia útil desloca
+        o vencimento em poucos dias, então bastam um ou dois ajustes.
+        """
+        indice = max((momento.year - data_inicio.year) * 12 + momento.month - data_inicio.month, 0)
+        while indice > 0 and self.data_parcela(data_inicio, indice - 1) >= momento:
+            indice -= 1
+        while self.data_parcela(data_inicio, indice) < momento:
+            indice += 1
+        return indice
+
+    def datas(self, data_inicio: datetime, quantidade: int) -> Tuple[datetime, ...]:
+        """Tabela imutável com os `quantidade` primeiros vencimentos (em cache)"""
+        return _tabela_datas(self, data_inicio, quantidade)
+
+
+CALENDARIO_PADRAO = Calendario()
+
+
+@lru_cache(maxsize=TAMANHO_CACHE_DATAS)
+def _tabela_datas(calendario: Calendario, data_inicio: datetime, quantidade: int) -> Tuple[datetime, ...]:
+    return tuple(calendario.data_parcela(data_inicio, indice) for indice in range(quantidade))
@@ -0,0 +1,203 @@
+"""
+Otimizador de Carteira (vários financiamentos)
+
+Simula a quitação de todos os financiamentos ativos ao mesmo tempo, com um
+valor extra mensal para distribuir entre eles. Cada estratégia define a
+ordem de prioridade do dinheiro extra:
+
+- avalanche: maior taxa primeiro
+- bola_de_neve: menor saldo primeiro
+- juros_mensal: maior juro absoluto do mês primeiro
+- fluxo_caixa: menor saldo/parcela primeiro (libera parcela mais cedo)
+- melhor: alocação marginal; a cada mês, o extra vai primeiro para onde um
+  real evita mais juros até a carteira quitar (ver _economia_marginal)
+
+Quando um financiamento é quitado, a parcela dele passa a reforçar o extra
+dos demais. Todas as estratégias avançam juntas, como uma matriz
+[estratégia x financiamento] em centavos, um passo vetorizado por mês.
+
+Como o dinheiro liberado volta para a carteira, um real devido custa a taxa
+do financiamento em cada mês até a carteira inteira quitar. A alocação
+marginal compara, então, o fator acumulado da curva de cada financiamento
+nesse horizonte. Com taxas fixas a ordem é a mesma da avalanche; com taxas
+variáveis, ela antecipa as mudanças de taxa que a avalanche (que só olha a
+taxa do mês) ignora.
+
+O mês de cada financiamento segue as mesmas regras do motor original
+(arredondamento ROUND_HALF_UP, saldo limitado a zero), com a taxa daquele mês:
+financiamentos de taxa variável (CalculadoraTaxaVariavel) avançam pela curva.
+Financiamentos cuja parcela não cobre os juros são recusados antes da
+simulação: com taxa fixa, quem amortiza no primeiro mês amortiza até quitar.
+Com taxa variável, um mês de taxa maior em que a parcela não cobre os juros
+(e não recebe extra) interrompe a simulação com FinanciamentoNaoAmortizavel.
+"""
+
+from dataclasses import dataclass
+from decimal import Decimal
+from typing import Dict, List, Sequence, Union
+
+import numpy as np
+
+from src.amortizacao import CalculadoraAmortizacao
+from src.centavos import para_centavos, para_reais
+from src.motor_vetorizado import _tipo_seguro, _verificar_amortizacao
+
+
+ESTRATEGIA_MELHOR = 'melhor'  # Alocação marginal (ver _economia_marginal)
+ESTRATEGIAS = ('avalanche', 'bola_de_neve', 'juros_mensal', 'fluxo_caixa', ESTRATEGIA_MELHOR)
+
+
+@dataclass
+class ResultadoCarteira:
+    """Resultado de uma estratégia para a carteira inteira"""
+    estrategia: str
+    meses: int                      # Meses até quitar todos os financiamentos
+    quitacao: List[int]             # Mês de quitação de cada financiamento
+    total_juros: Decimal
+    aportes: List[Dict[int, Decimal]]  # Extra aplicado em cada financiamento, por mês
+
+
+def _prioridades(estrategia: str, saldo: np.ndarray, juros: np.ndarray,
+                 taxa: np.ndarray, parcela: np.ndarray) -> np.ndarray:
+    """Chave de ordenação da estratégia (menor = recebe o extra primeiro)"""
+    if estrategia == 'avalanche':
+        return -taxa
+    if estrategia == 'bola_de_neve':
+        return saldo.astype(float)
+    if estrategia == 'juros_mensal':
+        return -juros.astype(float)
+    if estrategia == 'fluxo_caixa':
+        return saldo.astype(float) / parcela.astype(float)
+    raise ValueError(f"Estratégia desconhecida: {estrategia}")
+
+
+def _horizonte(saldo: np.ndarray, ativos: np.ndarray, parcela: np.ndarray, extra: int) -> int:
+    """Meses até quitar a carteira pagando todas as parcelas + extra (sem contar juros)"""
+    devido = int(np.where(ativos, saldo, 0).sum())
+    return max(-(-devido // max(int(parcela.sum()) + extra, 1)), 1)
+
+
+def _economia_marginal(log_acumulado: np.ndarray, mes: int, horizonte: int) -> np.ndarray:
+    """
+    Juros evitados por real aportado no mês `mes`, em cada financiamento,
+    nas `horizonte` parcelas seguintes, com a taxa de cada mês da curva
+
+    log_acumulado[k] é a soma de log(1 + taxa) das parcelas 1..k; além da
+    última linha, vale a taxa da última parcela da curva.
+    """
+    meses_curva = len(log_acumulado) - 1
+    ultima = log_acumulado[-1] - log_acumulado[-2]
+
+    def acumulado(k: int) -> np.ndarray:
+        return log_acumulado[min(k, meses_curva)] + max(k - meses_curva, 0) * ultima
+
+    return np.expm1(acumulado(mes + horizonte) - acumulado(mes))
+
+
+def simular_carteira(calculadoras: Sequence[CalculadoraAmortizacao],
+                     extra_mensal: Union[float, Sequence[float]],
+                     estrategias: Sequence[str] = ESTRATEGIAS) -> Dict[str, ResultadoCarteira]:
+    """
+    Simula as estratégias de distribuição do extra mensal sobre a carteira
+
+    Args:
+        calculadoras: Um financiamento por calculadora
+        extra_mensal: Valor extra por mês (fixo, ou lista com um valor por mês
+            a partir da parcela 1; meses além da lista não têm extra)
+        estrategias: Estratégias simuladas (ver ESTRATEGIAS)
+
+    Returns:
+        {estrategia: ResultadoCarteira}
+
+    Raises:
+        ValueError: se algum valor não for representável em centavos
+        FinanciamentoNaoAmortizavel: se a parcela de algum financiamento não
+            cobrir os juros do primeiro mês (ou, com taxa variável, de um mês
+            sem extra)
+    """
+    estrategias = list(estrategias)
+    parametros = [calc._parametros_curva() for calc in calculadoras]
+    for calc in calculadoras:
+        calc.verificar_amortizacao()
+    if isinstance(extra_mensal, (int, float, Decimal)):
+        extra_fixo, extras = para_centavos(extra_mensal), []
+    else:
+        extra_fixo, extras = 0, [para_centavos(v) for v in extra_mensal]
+
+    qtd_estrategias, qtd = len(estrategias), len(parametros)
+    tipo = np.int64
+    for saldo_i, fracoes_i, _ in parametros:
+        if _tipo_seguro(saldo_i, max(n for n, _ in fracoes_i), max(d for _, d in fracoes_i)) is object:
+            tipo = object
+            break
+
+    # Taxa de cada mês [mês x financiamento]; a última linha vale até quitar
+    meses_curva = max(len(p[1]) for p in parametros) if parametros else 1
+    fracoes_mes = [
+        [fracoes[min(k, len(fracoes) - 1)] for _, fracoes, _ in parametros]
+        for k in range(meses_curva)
+    ]
+    nums = np.array([[n for n, _ in linha] for linha in fracoes_mes], dtype=tipo).reshape(meses_curva, qtd)
+    dens = np.array([[d for _, d in linha] for linha in fracoes_mes], dtype=tipo).reshape(meses_curva, qtd)
+    taxas = np.array([[n / d for n, d in linha] for linha in fracoes_mes]).reshape(meses_curva, qtd)
+    log_acumulado = np.vstack([np.zeros(qtd), np.cumsum(np.log1p(taxas), axis=0)])
+    parcela = np.array([p[2] for p in parametros], dtype=tipo)
+    saldo = np.tile(np.array([p[0] for p in parametros], dtype=tipo), (qtd_estrategias, 1))
+
+    linhas = np.arange(qtd_estrategias)[:, None]
+    total_juros = np.zeros(qtd_estrategias, dtype=tipo)
+    quitacao = np.zeros((qtd_estrategias, qtd), dtype=np.int64)
+    aportes: List[List[Dict[int, int]]] = [[{} for _ in range(qtd)] for _ in estrategias]
+
+    ativos = saldo > 1
+    mes = 0
+    while ativos.any():
+        mes += 1
+        linha_taxa = min(mes, meses_curva) - 1
+        num, den, taxa = nums[linha_taxa], dens[linha_taxa], taxas[linha_taxa]
+        juros = (2 * saldo * num + den) // (2 * den)
+        principal = parcela - juros
+
+        # Parcelas dos financiamentos já quitados reforçam o extra do mês
+        liberado = np.where(ativos, 0, parcela).sum(axis=1)
+        extra_mes = extras[mes - 1] if mes <= len(extras) else extra_fixo
+        disponivel = extra_mes + liberado
+        capacidade = np.where(ativos, np.maximum(saldo - principal, 0), 0)
+
+        # Distribui o extra na ordem de prioridade de cada estratégia
+        chaves = np.stack([
+            -_economia_marginal(log_acumulado, mes, _horizonte(saldo[k], ativos[k], parcela, extra_mes))
+            if nome == ESTRATEGIA_MELHOR else _prioridades(nome, saldo[k], juros[k], taxa, parcela)
+            for k, nome in enumerate(estrategias)
+        ])
+        chaves = np.where(ativos, chaves, np.inf)
+        ordem = np.argsort(chaves, axis=1, kind='stable')
+        capacidade_ordenada = capacidade[linhas, ordem]
+        antes = np.cumsum(capacidade_ordenada, axis=1) - capacidade_ordenada
+        extra = np.zeros_like(saldo)
+        extra[linhas, ordem] = np.clip(disponivel[:, None] - antes, 0, capacidade_ordenada)
+        # Só acontece com taxa variável (com taxa fixa, verificado antes do laço)
+        _verificar_amortizacao((ativos & (extra == 0) & (principal <= 0)).ravel(), mes,
+                               saldo.ravel(), juros.ravel(),
+                               np.broadcast_to(parcela, saldo.shape).ravel())
+
+        novo_saldo = np.maximum(saldo - principal - extra, 0)
+
+        total_juros += np.where(ativos, juros, 0).sum(axis=1)
+        for k, i in zip(*np.nonzero(extra)):
+            aportes[k][i][mes] = extra[k, i]
+        saldo = np.where(ativos, novo_saldo, saldo)
+        quitou = ativos & (saldo <= 1)
+        quitacao[quitou] = mes
+        ativos = saldo > 1
+
+    return {
+        nome: ResultadoCarteira(
+            estrategia=nome,
+            meses=int(quitacao[k].max(initial=0)),
+            quitacao=quitacao[k].tolist(),
+            total_juros=para_reais(total_juros[k]),
+            aportes=[{m: para_reais(v) for m, v in ap.items()} for ap in aportes[k]],
+        )
+        for k, nome in enumerate(estrategias)
+    }
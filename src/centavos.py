@@ -0,0 +1,77 @@
+"""
+Aritmética Monetária em Centavos
+
+Backend de dinheiro do motor de amortização: todos os cálculos internos são
+feitos com inteiros em centavos e a taxa mensal vira uma fração exata
+(numerador/denominador). A conversão para Decimal acontece apenas na borda da
+API (Parcela, PlanoAmortizacao), preservando o ROUND_HALF_UP do motor Decimal.
+"""
+
+from decimal import Decimal
+from fractions import Fraction
+from math import floor
+from typing import Tuple, Union
+
+
+Valor = Union[Decimal, float, int, str]
+
+_UM_CENTAVO = Decimal('0.01')
+
+
+def para_centavos(valor: Valor) -> int:
+    """
+    Converte um valor em reais para centavos inteiros
+
+    Raises:
+        ValueError: se o valor tiver frações de centavo (ex: 10.005)
+    """
+    if not isinstance(valor, Decimal):
+        valor = Decimal(str(valor))
+    centavos = valor.scaleb(2)
+    if centavos != centavos.to_integral_value():
+        raise ValueError(f"Valor {valor} não é representável em centavos")
+    return int(centavos)
+
+
+def para_reais(centavos: int) -> Decimal:
+    """Converte centavos inteiros em Decimal com 2 casas"""
+    return _UM_CENTAVO * int(centavos)
+
+
+def taxa_racional(taxa: Valor) -> Tuple[int, int]:
+    """Representa a taxa como fração exata (numerador, denominador > 0)"""
+    if not isinstance(taxa, Decimal):
+        taxa = Decimal(str(taxa))
+    return taxa.as_integer_ratio()
+
+
+def juros_centavos(saldo: int, num: int, den: int) -> int:
+    """
+    Juros do mês em centavos: saldo * num/den arredondado ROUND_HALF_UP
+
+    Equivale a (saldo * taxa).quantize(Decimal('0.01'), ROUND_HALF_UP)
+    quando saldo está em centavos.
+    """
+    produto = saldo * num
+    if produto >= 0:
+        return (2 * produto + den) // (2 * den)
+    return -((-2 * produto + den) // (2 * den))
+
+
+def parcela_price_centavos(saldo: Union[int, Fraction], num: int, den: int, meses: int) -> int:
+    """
+    Parcela da tabela Price, em centavos (ROUND_HALF_UP), que quita `saldo`
+    (centavos) em `meses` parcelas à taxa num/den:
+
+        PMT = S * r / (1 - (1 + r)^-n)
+
+    Calculada com frações exatas, dá o mesmo resultado nos dois backends.
+    """
+    if meses <= 0:
+        return floor(Fraction(saldo) + Fraction(1, 2))
+    if num == 0:
+        valor = Fraction(saldo) / meses
+    else:
+        fator = (den + num) ** meses
+        valor = Fraction(saldo) * num * fator / (den * (fator - den ** meses))
+    return floor(valor + Fraction(1, 2))
@@ -0,0 +1,306 @@
+"""
+Taxas Variáveis e Indexadas
+
+Muitos contratos têm taxa atrelada a um índice (TR, IPCA, CDI) mais um
+spread, ou mudam de taxa ao longo do prazo. CurvaTaxas guarda a taxa de cada
+parcela até a última mudança (depois dela a taxa é constante, sem limite de
+prazo) e pré-calcula, uma única vez por curva:
+
+- as frações exatas (num, den) de cada mês, consumidas em sequência pelo
+  motor em centavos (sem conversões nem buscas por mês dentro do laço);
+- o fator acumulado F_k = (1 + r_1)...(1 + r_k) e a soma dos descontos
+  G_k = 1/F_1 + ... + 1/F_k, usados na estimativa analítica:
+
+    S_k = F_k * (S - P * G_k)
+
+  e, no trecho final de taxa constante, a fórmula fechada da tabela Price
+  (src.estimativa).
+
+CalculadoraTaxaVariavel tem o mesmo contrato de CalculadoraAmortizacao
+(plano, resumo, simulação de aportes, continuação de planos), mas usa a curva.
+"""
+
+from decimal import Decimal, ROUND_HALF_UP
+from datetime import datetime
+from functools import lru_cache
+from itertools import chain, islice, repeat
+from typing import Dict, Iterator, Optional, Sequence, Tuple
+
+import numpy as np
+
+from src.amortizacao import (
+    BACKEND_CENTAVOS, COLUNAS, CalculadoraAmortizacao, FinanciamentoNaoAmortizavel,
+    ResumoPlano, _colunas_de_passos,
+)
+from src.calendario import CALENDARIO_PADRAO, Calendario
+from src.centavos import juros_centavos, para_centavos, para_reais, taxa_racional
+from src.estimativa import estimar_totais
+
+
+class CurvaTaxas:
+    """Taxa mensal de cada parcela; a última taxa informada vale até o fim"""
+
+    def __init__(self, taxas: Sequence[float]):
+        if not taxas:
+            raise ValueError("A curva precisa de ao menos uma taxa")
+        informadas = [t if isinstance(t, Decimal) else Decimal(str(t)) for t in taxas]
+        # Repetições da última taxa não mudam a curva: guarda só até a última mudança
+        while len(informadas) > 1 and informadas[-1] == informadas[-2]:
+            informadas.pop()
+
+        conversoes = {}
+        fracoes = [conversoes.setdefault(t, taxa_racional(t)) for t in informadas]
+        self.taxas: Tuple[Decimal, ...] = tuple(informadas)
+        self.fracoes: Tuple[Tuple[int, int], ...] = tuple(fracoes)
+        self.negativa = any(num < 0 for num, _ in conversoes.values())
+
+        self.taxas_float = np.array([float(t) for t in informadas])
+        self.fator_acumulado = np.cumprod(1 + self.taxas_float)
+        self.desconto_acumulado = np.cumsum(1 / self.fator_acumulado)
+        self._hash = hash(self.fracoes)
+
+    @classmethod
+    def de_alteracoes(cls, alteracoes: Dict[int, float]) -> 'CurvaTaxas':
+        """
+        Curva a partir das mudanças de taxa: {parcela_inicial: taxa}
+
+        Exemplo: {1: 0.012, 13: 0.010} -> 1,2% nas parcelas 1 a 12 e 1,0% depois
+        """
+        if 1 not in alteracoes:
+            raise ValueError("Informe a taxa da parcela 1")
+        inicios = sorted(n for n in alteracoes if n >= 1)
+        taxas = []
+        for inicio, fim in zip(inicios, inicios[1:] + [inicios[-1] + 1]):
+            taxas += [Decimal(str(alteracoes[inicio]))] * (fim - inicio)
+        return cls(taxas)
+
+    @classmethod
+    def indexada(cls, indice: Sequence[float], spread: float) -> 'CurvaTaxas':
+        """
+        Curva de índice + spread: (1 + índice) * (1 + spread) - 1 a cada mês
+
+        Args:
+            indice: Variação mensal do índice (TR, IPCA, CDI...) por parcela
+            spread: Taxa mensal adicional do contrato
+        """
+        spread = Decimal(str(spread))
+        return cls([(1 + Decimal(str(i))) * (1 + spread) - 1 for i in indice])
+
+    def taxa(self, numero_parcela: int) -> Decimal:
+        """Taxa da parcela (base 1)"""
+        return self.taxas[min(numero_parcela, len(self.taxas)) - 1]
+
+    def __len__(self) -> int:
+        """Parcelas com taxa própria (depois delas, vale a última taxa)"""
+        return len(self.taxas)
+
+    def __hash__(self) -> int:
+        return self._hash
+
+    def __eq__(self, outra) -> bool:
+        if not isinstance(outra, CurvaTaxas):
+            return NotImplemented
+        return self is outra or (self._hash == outra._hash and self.fracoes == outra.fracoes)
+
+
+def _gerar_passos_curva(saldo_atual: int, fracoes: Sequence[Tuple[int, int]], parcela_fixa: int,
+                        aportes: Dict[int, int], numero_inicial: int = 1) -> Iterator[Tuple[int, ...]]:
+    """
+    Mesmo algoritmo de amortizacao._gerar_passos, com a taxa de cada mês
+    vindo das frações pré-calculadas da curva (a última se repete até quitar)
+    """
+    numero_parcela = numero_inicial
+    for num, den in chain(islice(fracoes, numero_inicial - 1, None), repeat(fracoes[-1])):
+        if saldo_atual <= 1:
+            break
+        juros = (2 * saldo_atual * num + den) // (2 * den)
+        aporte_extra = aportes.get(numero_parcela, 0)
+        principal = parcela_fixa - juros
+
+        if aporte_extra == 0 and principal <= 0:
+            raise FinanciamentoNaoAmortizavel.em_centavos(numero_parcela, saldo_atual,
+                                                          juros, parcela_fixa)
+        saldo_posterior = saldo_atual - principal - aporte_extra
+
+        if saldo_posterior < 0:
+            principal = saldo_atual - aporte_extra
+            saldo_posterior = 0
+
+        yield (saldo_atual, juros, principal, aporte_extra,
+               saldo_posterior, parcela_fixa + aporte_extra)
+        saldo_atual = saldo_posterior
+        numero_parcela += 1
+
+
+@lru_cache(maxsize=256)
+def _colunas_base_curva(saldo: int, curva: CurvaTaxas, parcela: int) -> Tuple[memoryview, ...]:
+    """Colunas do plano sem aportes com a curva, somente leitura"""
+    colunas = _colunas_de_passos(_gerar_passos_curva(saldo, curva.fracoes, parcela, {}))
+    return tuple(memoryview(colunas[nome]).toreadonly() for nome in COLUNAS)
+
+
+def estimar_totais_curva(saldo: int, curva: CurvaTaxas, parcela: int,
+                         aportes: Optional[Dict[int, int]] = None) -> Optional[Tuple[int, int, int]]:
+    """
+    Estima (parcelas, juros, aportes) em centavos pelos fatores acumulados
+
+    Equivale a estimativa.estimar_totais para taxa variável: cada trecho sem
+    aportes é resolvido em bloco pelos arrays pré-calculados da curva e só os
+    meses de aporte e os últimos meses passam pelo passo exato. Depois da
+    última mudança de taxa, o restante do prazo vai para estimar_totais.
+
+    Returns:
+        Totais estimados, ou None se algum mês não amortiza (juros >= parcela)
+    """
+    fator = curva.fator_acumulado
+    desconto = curva.desconto_acumulado
+    taxas = curva.taxas_float
+    variaveis = len(curva)
+    meses_feitos = 0
+    juros = 0.0
+    total_extra = 0
+
+    def saldos_trecho(saldo_inicio: float, inicio: int, fim: int) -> np.ndarray:
+        """Saldos ao fim das parcelas inicio+1..fim, sem aportes nem arredondamento"""
+        f0 = fator[inicio - 1] if inicio else 1.0
+        g0 = desconto[inicio - 1] if inicio else 0.0
+        return fator[inicio:fim] / f0 * (saldo_inicio - parcela * (desconto[inicio:fim] - g0) * f0)
+
+    def avancar(saldo_inicio: float, fim: int) -> Optional[float]:
+        """Pula até a parcela `fim` (ou até perto da quitação) pela fórmula fechada"""
+        nonlocal juros, meses_feitos
+        saldos = saldos_trecho(saldo_inicio, meses_feitos, fim)
+        anteriores = np.concatenate(([saldo_inicio], saldos[:-1]))
+        if np.any(anteriores * taxas[meses_feitos:fim] >= parcela):
+            return None
+        quitou = np.flatnonzero(saldos <= 1)
+        meses = len(saldos) if not len(quitou) else max(int(quitou[0]) - 1, 0)
+        novo_saldo = saldos[meses - 1] if meses else saldo_inicio
+        juros += meses * parcela - (saldo_inicio - novo_saldo)
+        meses_feitos += meses
+        return novo_saldo
+
+    def passo_exato(saldo_atual: float, extra: int) -> Optional[int]:
+        nonlocal juros, meses_feitos, total_extra
+        saldo_atual = round(saldo_atual)
+        num, den = curva.fracoes[meses_feitos]
+        juros_mes = juros_centavos(saldo_atual, num, den)
+        principal = parcela - juros_mes
+        if extra == 0 and principal <= 0:
+            return None
+        juros += juros_mes
+        total_extra += extra
+        meses_feitos += 1
+        return max(saldo_atual - principal - extra, 0)
+
+    saldo_atual: float = saldo
+    aportes_cauda = {}  # Aportes depois da curva, numerados a partir do fim dela
+    for numero, extra in sorted((aportes or {}).items()):
+        if numero <= meses_feitos or extra == 0:
+            continue
+        if saldo_atual <= 1:
+            break
+        if numero > variaveis:
+            aportes_cauda[numero - variaveis] = extra
+            continue
+        saldo_atual = avancar(saldo_atual, numero - 1)
+        if saldo_atual is None:
+            return None
+        if meses_feitos < numero - 1:
+            break  # Quita antes deste aporte
+        saldo_atual = passo_exato(saldo_atual, extra)
+        if saldo_atual is None:
+            return None
+
+    if saldo_atual > 1:
+        saldo_atual = avancar(saldo_atual, variaveis)
+        if saldo_atual is None:
+            return None
+    while saldo_atual > 1 and meses_feitos < variaveis:
+        saldo_atual = passo_exato(saldo_atual, 0)
+        if saldo_atual is None:
+            return None
+
+    if saldo_atual > 1:
+        # Taxa constante até quitar: fórmula fechada da tabela Price
+        cauda = estimar_totais(round(saldo_atual), *curva.fracoes[-1], parcela, aportes_cauda)
+        if cauda is None:
+            return None
+        meses_feitos += cauda[0]
+        juros += cauda[1]
+        total_extra += cauda[2]
+
+    return meses_feitos, round(juros), total_extra
+
+
+class CalculadoraTaxaVariavel(CalculadoraAmortizacao):
+    """
+    Calculadora com taxa variável por parcela (CurvaTaxas)
+
+    taxa_mensal guarda a taxa da primeira parcela, apenas para exibição.
+    Recursos que dependem de uma taxa única (grade vetorizada, motor NumPy)
+    usam o caminho parcela a parcela ou não se aplicam; a carteira usa a
+    taxa de cada mês (_parametros_curva).
+    """
+
+    def __init__(self, saldo_devedor: float, curva: CurvaTaxas,
+                 parcela_mensal: float, data_inicio: datetime = None,
+                 backend: str = BACKEND_CENTAVOS,
+                 calendario: Calendario = CALENDARIO_PADRAO):
+        super().__init__(saldo_devedor, curva.taxas[0], parcela_mensal, data_inicio,
+                         backend, calendario)
+        self.curva = curva
+
+    def taxa_da_parcela(self, numero_parcela: int) -> Decimal:
+        """Taxa mensal aplicada na parcela, segundo a curva"""
+        return self.curva.taxa(numero_parcela)
+
+    def calcular_juros(self, saldo: Decimal, numero_parcela: int = 1) -> Decimal:
+        """Calcula juros do mês com a taxa da parcela"""
+        return (saldo * self.curva.taxa(numero_parcela)).quantize(
+            Decimal('0.01'), rounding=ROUND_HALF_UP
+        )
+
+    def _parametros_inteiros(self) -> Tuple[int, int, int, int]:
+        raise ValueError("Taxa variável: não há uma taxa única num/den")
+
+    def _parametros_curva(self) -> Tuple[int, Tuple[Tuple[int, int], ...], int]:
+        return para_centavos(self.saldo_devedor), self.curva.fracoes, self._parcela_centavos()
+
+    def _parcela_centavos(self) -> int:
+        """Parcela em centavos (ValueError se a curva ou a parcela não couberem no backend)"""
+        if self.curva.negativa:
+            raise ValueError("Taxa negativa: usa o laço em Decimal")
+        return para_centavos(self.parcela_fixa)
+
+    def _passos_desde(self, saldo: int, aportes_c: Dict[int, int],
+                      numero_inicial: int = 1) -> Iterator[Tuple[int, ...]]:
+        return _gerar_passos_curva(saldo, self.curva.fracoes, self._parcela_centavos(),
+                                   aportes_c, numero_inicial)
+
+    def _colunas_sem_aportes(self) -> Tuple[Sequence[int], ...]:
+        return _colunas_base_curva(para_centavos(self.saldo_devedor), self.curva,
+                                   self._parcela_centavos())
+
+    def _totais_sem_aportes(self) -> Tuple[int, int, int]:
+        colunas = self._colunas_sem_aportes()
+        return len(colunas[0]), sum(colunas[1]), 0
+
+    def estimar_resumo(self, aportes: Optional[Dict[int, float]] = None) -> ResumoPlano:
+        """Resumo estimado pelos fatores acumulados da curva (ver estimar_totais_curva)"""
+        try:
+            aportes_c = {numero: para_centavos(valor) for numero, valor in (aportes or {}).items()}
+            totais = estimar_totais_curva(para_centavos(self.saldo_devedor), self.curva,
+                                          self._parcela_centavos(), aportes_c)
+        except ValueError:
+            totais = None
+        if totais is None:
+            return self.resumir(aportes)
+
+        parcelas, total_juros, total_extra = totais
+        return ResumoPlano(
+            parcelas=parcelas,
+            total_juros=para_reais(total_juros),
+            total_amortizacao_extra=para_reais(total_extra),
+            data_quitacao=self.data_parcela(parcelas - 1) if parcelas else None
+        )
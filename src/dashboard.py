@@ -199,6 +199,48 @@ if pagina == "📊 Dashboard":
         
         st.markdown("---")
         
+        # ====== ROW 3: REDUÇÃO DE PRAZO x REDUÇÃO DE PARCELA ======
+        st.subheader("⚖️ Reduzir Prazo ou Reduzir Parcela?")
+        
+        modos = sistema.comparar_modos_aporte(fin_id)
+        col_modo1, col_modo2 = st.columns(2)
+        
+        with col_modo1:
+            st.markdown("**Redução de Prazo** (parcela fixa)")
+            st.metric("Prazo", f"{modos.reducao_prazo.parcelas} meses")
+            st.metric("Total de Juros", f"R$ {modos.reducao_prazo.total_juros:,.2f}")
+        
+        with col_modo2:
+            st.markdown("**Redução de Parcela** (prazo original)")
+            st.metric("Parcela Final", f"R$ {modos.parcela_final:,.2f}")
+            st.metric(
+                "Total de Juros",
+                f"R$ {modos.reducao_parcela.total_juros:,.2f}",
+                f"R$ {modos.reducao_parcela.total_juros - modos.reducao_prazo.total_juros:,.2f} vs prazo",
+                delta_color="inverse"
+            )
+        
+        st.markdown("---")
+        
+        # ====== RESUMO POR ANO ======
+        st.subheader("📅 Resumo por Ano")
+        
+        _, plano_atual = sistema.simular_plano_com_aportes(fin_id)
+        df_anos = pd.DataFrame([
+            {
+                'Ano': r.ano,
+                'Parcelas': r.parcelas,
+                'Juros': f"R$ {r.juros:,.2f}",
+                'Principal': f"R$ {r.principal:,.2f}",
+                'Aportes': f"R$ {r.amortizacao_extra:,.2f}",
+                'Saldo no Fim do Ano': f"R$ {r.saldo_final:,.2f}",
+            }
+            for r in plano_atual.resumo_anual()
+        ])
+        st.dataframe(df_anos, use_container_width=True, hide_index=True)
+        
+        st.markdown("---")
+        
         # ====== WIDGET: ECONOMÍMETRO ======
         st.subheader("💰 ECONOMÍMETRO")
         
@@ -524,14 +566,14 @@ elif pagina == "📈 Simulador":
             st.subheader("📊 Comparar Múltiplos Cenários")
             
             valores_teste = [100, 200, 300, 500, 1000]
+            grade = sistema.simular_grade_venda(fin_id, valores_teste, [parcela_simulada])
             resultados_sim = []
             
-            for valor in valores_teste:
-                m, e = sistema.simular_aporte_venda(fin_id, valor, parcela_simulada)
+            for i, valor in enumerate(valores_teste):
                 resultados_sim.append({
                     'Valor de Venda': f"R$ {valor:.0f}",
-                    'Meses Economizados': m,
-                    'Juros Poupados': f"R$ {e:.2f}"
+                    'Meses Economizados': int(grade.meses_economizados[i, 0]),
+                    'Juros Poupados': f"R$ {grade.economia_juros(i, 0):.2f}"
                 })
             
             df_comparacao = pd.DataFrame(resultados_sim)
@@ -546,6 +588,102 @@ elif pagina == "📈 Simulador":
             )
             st.plotly_chart(fig_sim, use_container_width=True)
             
+            st.markdown("---")
+            
+            # Mapa de calor: todos os valores x todas as parcelas em uma chamada
+            st.subheader("🗺️ Mapa de Economia (Valor x Parcela)")
+            
+            valores_mapa = list(range(50, 2001, 50))
+            parcelas_mapa = list(range(1, 61))
+            grade_mapa = sistema.simular_grade_venda(fin_id, valores_mapa, parcelas_mapa)
+            
+            fig_mapa = px.imshow(
+                grade_mapa.economia_juros_centavos / 100,
+                x=parcelas_mapa,
+                y=valores_mapa,
+                origin='lower',
+                aspect='auto',
+                color_continuous_scale='Greens',
+                labels={'x': 'Parcela', 'y': 'Valor de Venda (R$)', 'color': 'Juros Poupados (R$)'},
+                title="Juros Poupados por Valor e Momento do Aporte"
+            )
+            st.plotly_chart(fig_mapa, use_container_width=True)
+            
+            st.markdown("---")
+            
+            # Valor marginal: derivadas do plano, sem re-simular cada cenário
+            st.subheader("📐 Valor de Cada Real Aportado")
+            
+            sens = sistema.sensibilidades_financiamento(fin_id)
+            proxima = min(sistema.proxima_parcela(fin_id), len(sens.economia_por_real))
+            col_sens1, col_sens2 = st.columns(2)
+            
+            with col_sens1:
+                st.metric(
+                    "Juros Poupados por R$ 1",
+                    f"R$ {sens.economia_por_real[proxima - 1]:.2f}" if proxima else "-",
+                    f"Aportando na próxima parcela ({proxima})" if proxima else None
+                )
+            
+            with col_sens2:
+                st.metric(
+                    "Taxa +0,1 p.p. ao mês",
+                    f"R$ {sens.juros_por_ponto_percentual() / 10:,.2f}",
+                    "Juros a mais (efeito marginal)",
+                    delta_color="inverse"
+                )
+            
+            parcelas_sens = list(range(1, len(sens.economia_por_real) + 1))
+            fig_sens = px.line(
+                x=parcelas_sens,
+                y=sens.economia_por_real,
+                labels={'x': 'Parcela do Aporte', 'y': 'Juros Poupados por R$ 1'},
+                title="Quanto Antes, Melhor: Economia Marginal por Parcela"
+            )
+            st.plotly_chart(fig_sens, use_container_width=True)
+            
+            st.markdown("---")
+            
+            # Metas: quanto é preciso para quitar em N meses
+            st.subheader("🏁 Quitar em N Meses")
+            
+            col_meta1, col_meta2 = st.columns(2)
+            
+            with col_meta1:
+                meses_meta = st.number_input(
+                    "Quitar em (meses)",
+                    min_value=1,
+                    value=24,
+                    step=1
+                )
+            
+            with col_meta2:
+                parcela_meta = st.number_input(
+                    "Aporte na Parcela",
+                    min_value=1,
+                    max_value=int(meses_meta),
+                    value=min(parcela_simulada, int(meses_meta)),
+                    step=1
+                )
+            
+            col_res_meta1, col_res_meta2 = st.columns(2)
+            
+            with col_res_meta1:
+                parcela_necessaria = sistema.parcela_para_quitar_em(fin_id, int(meses_meta))
+                st.metric(
+                    "Parcela Necessária",
+                    f"R$ {parcela_necessaria:,.2f}",
+                    f"Para quitar em {int(meses_meta)} meses"
+                )
+            
+            with col_res_meta2:
+                aporte_necessario = sistema.aporte_para_quitar_em(fin_id, int(parcela_meta), int(meses_meta))
+                st.metric(
+                    "Aporte Necessário",
+                    f"R$ {aporte_necessario:,.2f}",
+                    f"Único, na parcela {int(parcela_meta)}"
+                )
+            
         except Exception as e:
             st.error(f"❌ Erro na simulação: {e}")
 
@@ -6,112 +6,152 @@ Gerenciador SQLite para:
 - Histórico de parcelas pagas
 - Aportes extras (amortização acelerada)
 - Entradas extras (lucros de revenda)
+
+As conexões são reutilizadas, uma por thread, com WAL e busy_timeout; as
+operações são refeitas se o banco estiver ocupado (ver src.pool_conexoes).
+O esquema é versionado por migrações (ver src.migracoes). Operações que
+precisam ser atômicas rodam juntas em `with bd.transacao():`.
 """
 
 import sqlite3
+import threading
+from contextlib import contextmanager
 from pathlib import Path
 from datetime import datetime
-from typing import List, Dict, Optional, Tuple
+from typing import Dict, Iterable, Iterator, List, Mapping, Optional, Tuple
 from dataclasses import asdict
 from decimal import Decimal
 
 from src.amortizacao import PlanoAmortizacao, Parcela
+from src.migracoes import aplicar_migracoes
+from src.pool_conexoes import (
+    PERFIL_CONCORRENTE, EstatisticasPool, PerfilDurabilidade, PoolConexoes, repetir_se_ocupado,
+)
 
 
 DB_PATH = Path(__file__).parent.parent / "data" / "financiamentos.db"
 
+# Entradas mantidas em planos_cache por financiamento (as mais recentes).
+# Normalmente só duas valem ao mesmo tempo: o plano sem e o com aportes.
+PLANOS_CACHE_POR_FINANCIAMENTO = 4
+
 
 class GerenciadorBancoDados:
     """Gerencia o banco de dados SQLite de financiamentos"""
     
-    def __init__(self, db_path: Path = DB_PATH):
-        """Inicializa conexão com banco de dados"""
+    def __init__(self, db_path: Path = DB_PATH,
+                 perfil: PerfilDurabilidade = PERFIL_CONCORRENTE):
+        """
+        Inicializa conexão com banco de dados
+        
+        Args:
+            db_path: Arquivo SQLite
+            perfil: PRAGMAs das conexões (WAL, synchronous, mmap, cache,
+                    busy_timeout) e novas tentativas com o banco ocupado
+        """
         self.db_path = db_path
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
-        self._criar_tabelas()
+        self.pool = PoolConexoes(self.db_path, perfil)
+        self._unidade = threading.local()  # Transação aberta por transacao(), por thread
+        self._migrar()
     
     def _conexao(self) -> sqlite3.Connection:
-        """Cria conexão com banco de dados"""
-        conn = sqlite3.connect(str(self.db_path))
-        conn.row_factory = sqlite3.Row  # Permite acessar colunas por nome
-        return conn
+        """
+        Conexão da thread atual, reutilizada entre as chamadas (ver src.pool_conexoes)
+        
+        Dentro de transacao(), é a conexão da transação, que fica aberta.
+        """
+        conn = getattr(self._unidade, 'conexao', None)
+        return conn if conn is not None else self.pool.obter()
     
-    def _criar_tabelas(self):
-        """Cria tabelas se não existirem"""
-        conn = self._conexao()
-        cursor = conn.cursor()
+    def _desfazer_falha(self):
+        """
+        Desfaz na hora o que uma operação que falhou deixou pendente
         
-        # Tabela de financiamentos
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS financiamentos (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                nome TEXT NOT NULL,
-                descricao TEXT,
-                saldo_inicial REAL NOT NULL,
-                saldo_atual REAL NOT NULL,
-                taxa_mensal REAL NOT NULL,
-                parcela_fixa REAL NOT NULL,
-                data_inicio DATE NOT NULL,
-                data_quitacao_estimada DATE,
-                ativo BOOLEAN DEFAULT 1,
-                criado_em TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                atualizado_em TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        """)
+        Chamado por repetir_se_ocupado. Dentro de transacao(), não faz nada:
+        quem desfaz é o bloco (se a exceção sair dele).
+        """
+        if getattr(self._unidade, 'conexao', None) is None:
+            self.pool.desfazer()
+    
+    def _confirmar(self, conn: sqlite3.Connection):
+        """Commit da operação; dentro de transacao(), fica para o fim do bloco"""
+        if getattr(self._unidade, 'conexao', None) is None:
+            conn.commit()
+    
+    @contextmanager
+    def transacao(self) -> Iterator[sqlite3.Connection]:
+        """
+        Unidade de trabalho: as operações do bloco compartilham uma conexão
+        e um único commit
         
-        # Tabela de parcelas pagas
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS parcelas_pagas (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                financiamento_id INTEGER NOT NULL,
-                numero_parcela INTEGER NOT NULL,
-                data_pagamento DATE NOT NULL,
-                valor_parcela REAL NOT NULL,
-                juros REAL NOT NULL,
-                principal REAL NOT NULL,
-                saldo_anterior REAL NOT NULL,
-                saldo_posterior REAL NOT NULL,
-                FOREIGN KEY(financiamento_id) REFERENCES financiamentos(id)
-            )
-        """)
+            with bd.transacao():
+                entrada_id = bd.registrar_entrada_extra(fin_id, 500)
+                aporte_id = bd.registrar_aporte(fin_id, 3, 500)
+                bd.alocar_entrada_para_aporte(entrada_id, aporte_id)
         
-        # Tabela de aportes extras
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS aportes_extras (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                financiamento_id INTEGER NOT NULL,
-                numero_parcela INTEGER NOT NULL,
-                data_aporte DATE NOT NULL,
-                valor_aporte REAL NOT NULL,
-                origem TEXT,  -- 'revenda', 'salario', 'bonus', etc
-                descricao TEXT,
-                criado_em TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY(financiamento_id) REFERENCES financiamentos(id)
-            )
-        """)
+        O bloco começa com a trava de escrita (BEGIN IMMEDIATE, refeito se o
+        banco estiver ocupado), então as escritas dele não esperam por outros
+        escritores. Uma exceção desfaz tudo o que o bloco gravou. Um
+        transacao() dentro de outro faz parte do externo (sem savepoint).
         
-        # Tabela de entradas extras (receitas de revenda)
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS entradas_extras (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                financiamento_id INTEGER NOT NULL,
-                data_entrada DATE NOT NULL,
-                valor REAL NOT NULL,
-                descricao TEXT,
-                produto_vendido TEXT,
-                alocado_para_aporte BOOLEAN DEFAULT 0,
-                aporte_id INTEGER,
-                criado_em TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY(financiamento_id) REFERENCES financiamentos(id),
-                FOREIGN KEY(aporte_id) REFERENCES aportes_extras(id)
-            )
-        """)
+        Yields:
+            Conexão da transação
+        """
+        conn = getattr(self._unidade, 'conexao', None)
+        if conn is not None:
+            yield conn
+            return
+        
+        conn = self._iniciar_escrita()
+        self._unidade.conexao = conn
+        try:
+            yield conn
+            conn.commit()
+        except BaseException:
+            conn.rollback()
+            raise
+        finally:
+            self._unidade.conexao = None
+    
+    def estatisticas_pool(self) -> EstatisticasPool:
+        """Conexões abertas, criadas, reutilizadas e descartadas pelo pool"""
+        return self.pool.estatisticas()
+    
+    def fechar(self):
+        """Fecha as conexões do pool (uma nova é aberta se o gerenciador for usado de novo)"""
+        self.pool.fechar()
+    
+    @repetir_se_ocupado
+    def _migrar(self):
+        """Leva o esquema à versão atual (ver src.migracoes)"""
+        aplicar_migracoes(self._conexao())
+    
+    @repetir_se_ocupado
+    def _iniciar_escrita(self) -> sqlite3.Connection:
+        """Abre uma transação já com a trava de escrita (BEGIN IMMEDIATE)"""
+        conn = self._conexao()
+        conn.execute("BEGIN IMMEDIATE")
+        return conn
+    
+    def _inserir_em_lote(self, sql: str, linhas: Iterable[Tuple]) -> int:
+        """
+        Executa o INSERT para cada linha numa única transação (um commit)
         
-        conn.commit()
-        conn.close()
+        As linhas são consumidas sob demanda pelo executemany. Só o BEGIN
+        IMMEDIATE é refeito com o banco ocupado: depois dele a trava de
+        escrita é nossa, e um iterador já consumido não poderia ser repetido.
+        Uma falha desfaz o lote inteiro (ou a transacao() em que ele está).
+        
+        Returns:
+            Quantidade de linhas inseridas
+        """
+        with self.transacao() as conn:
+            return conn.executemany(sql, linhas).rowcount
     
     # ============= FINANCIAMENTOS =============
     
+    @repetir_se_ocupado
     def criar_financiamento(self, nome: str, saldo_inicial: float, 
                            taxa_mensal: float, parcela_fixa: float,
                            descricao: Optional[str] = None) -> int:
@@ -132,12 +172,12 @@ class GerenciadorBancoDados:
         """, (nome, descricao, saldo_inicial, saldo_inicial, 
               taxa_mensal, parcela_fixa, datetime.now().date()))
         
-        conn.commit()
+        self._confirmar(conn)
         financiamento_id = cursor.lastrowid
-        conn.close()
         
         return financiamento_id
     
+    @repetir_se_ocupado
     def obter_financiamento(self, financiamento_id: int) -> Optional[Dict]:
         """Obtém um financiamento específico"""
         conn = self._conexao()
@@ -146,10 +186,10 @@ class GerenciadorBancoDados:
         cursor.execute("SELECT * FROM financiamentos WHERE id = ?", 
                       (financiamento_id,))
         resultado = cursor.fetchone()
-        conn.close()
         
         return dict(resultado) if resultado else None
     
+    @repetir_se_ocupado
     def listar_financiamentos(self, apenas_ativos: bool = True) -> List[Dict]:
         """Lista todos os financiamentos"""
         conn = self._conexao()
@@ -161,10 +201,10 @@ class GerenciadorBancoDados:
             cursor.execute("SELECT * FROM financiamentos")
         
         resultados = cursor.fetchall()
-        conn.close()
         
         return [dict(r) for r in resultados]
     
+    @repetir_se_ocupado
     def atualizar_saldo_financiamento(self, financiamento_id: int, 
                                      novo_saldo: float):
         """Atualiza o saldo atual de um financiamento"""
@@ -177,11 +217,11 @@ class GerenciadorBancoDados:
             WHERE id = ?
         """, (novo_saldo, financiamento_id))
         
-        conn.commit()
-        conn.close()
+        self._confirmar(conn)
     
     # ============= PARCELAS PAGAS =============
     
+    @repetir_se_ocupado
     def registrar_parcela_paga(self, financiamento_id: int, 
                               numero_parcela: int, valor_parcela: float,
                               juros: float, principal: float,
@@ -201,9 +241,35 @@ class GerenciadorBancoDados:
         """, (financiamento_id, numero_parcela, data_pagamento, valor_parcela,
               juros, principal, saldo_anterior, saldo_posterior))
         
-        conn.commit()
-        conn.close()
+        self._confirmar(conn)
     
+    def registrar_parcelas_em_lote(self, financiamento_id: int,
+                                   parcelas: Iterable[Mapping]) -> int:
+        """
+        Registra várias parcelas pagas numa única transação
+        
+        Args:
+            financiamento_id: ID do financiamento
+            parcelas: Dicionários com os argumentos de registrar_parcela_paga
+                      (data_pagamento opcional, default: hoje); pode ser um gerador
+        
+        Returns:
+            Quantidade de parcelas registradas
+        """
+        hoje = datetime.now().date()
+        return self._inserir_em_lote("""
+            INSERT INTO parcelas_pagas
+            (financiamento_id, numero_parcela, data_pagamento, valor_parcela,
+             juros, principal, saldo_anterior, saldo_posterior)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        """, (
+            (financiamento_id, p['numero_parcela'], p.get('data_pagamento') or hoje,
+             p['valor_parcela'], p['juros'], p['principal'],
+             p['saldo_anterior'], p['saldo_posterior'])
+            for p in parcelas
+        ))
+    
+    @repetir_se_ocupado
     def obter_parcelas_pagas(self, financiamento_id: int) -> List[Dict]:
         """Obtém todas as parcelas pagas de um financiamento"""
         conn = self._conexao()
@@ -216,10 +282,10 @@ class GerenciadorBancoDados:
         """, (financiamento_id,))
         
         resultados = cursor.fetchall()
-        conn.close()
         
         return [dict(r) for r in resultados]
     
+    @repetir_se_ocupado
     def total_juros_pago(self, financiamento_id: int) -> float:
         """Calcula total de juros pagos"""
         conn = self._conexao()
@@ -232,12 +298,12 @@ class GerenciadorBancoDados:
         """, (financiamento_id,))
         
         resultado = cursor.fetchone()
-        conn.close()
         
         return resultado['total'] if resultado else 0
     
     # ============= APORTES EXTRAS =============
     
+    @repetir_se_ocupado
     def registrar_aporte(self, financiamento_id: int, numero_parcela: int,
                         valor_aporte: float, origem: str = "manual",
                         descricao: Optional[str] = None, data_aporte: Optional[datetime] = None) -> int:
@@ -254,6 +320,8 @@ class GerenciadorBancoDados:
         
         Returns:
             ID do aporte criado
+        
+        O cache de planos do financiamento é descartado (gatilho do banco).
         """
         conn = self._conexao()
         cursor = conn.cursor()
@@ -268,12 +336,39 @@ class GerenciadorBancoDados:
         """, (financiamento_id, numero_parcela, data_aporte, valor_aporte,
               origem, descricao))
         
-        conn.commit()
+        self._confirmar(conn)
         aporte_id = cursor.lastrowid
-        conn.close()
         
         return aporte_id
     
+    def registrar_aportes_em_lote(self, financiamento_id: int,
+                                  aportes: Iterable[Mapping]) -> int:
+        """
+        Registra vários aportes numa única transação
+        
+        Args:
+            financiamento_id: ID do financiamento
+            aportes: Dicionários com os argumentos de registrar_aporte
+                     (numero_parcela e valor_aporte obrigatórios); pode ser um gerador
+        
+        Returns:
+            Quantidade de aportes registrados
+        
+        O cache de planos do financiamento é descartado (gatilho do banco).
+        """
+        hoje = datetime.now().date()
+        return self._inserir_em_lote("""
+            INSERT INTO aportes_extras
+            (financiamento_id, numero_parcela, data_aporte, valor_aporte,
+             origem, descricao)
+            VALUES (?, ?, ?, ?, ?, ?)
+        """, (
+            (financiamento_id, a['numero_parcela'], a.get('data_aporte') or hoje,
+             a['valor_aporte'], a.get('origem', "manual"), a.get('descricao'))
+            for a in aportes
+        ))
+    
+    @repetir_se_ocupado
     def obter_aportes(self, financiamento_id: int) -> List[Dict]:
         """Obtém todos os aportes de um financiamento"""
         conn = self._conexao()
@@ -286,10 +381,10 @@ class GerenciadorBancoDados:
         """, (financiamento_id,))
         
         resultados = cursor.fetchall()
-        conn.close()
         
         return [dict(r) for r in resultados]
     
+    @repetir_se_ocupado
     def total_aportes(self, financiamento_id: int) -> float:
         """Calcula total de aportes realizados"""
         conn = self._conexao()
@@ -302,7 +397,6 @@ class GerenciadorBancoDados:
         """, (financiamento_id,))
         
         resultado = cursor.fetchone()
-        conn.close()
         
         return resultado['total'] if resultado else 0
     
@@ -313,6 +407,7 @@ class GerenciadorBancoDados:
     
     # ============= ENTRADAS EXTRAS =============
     
+    @repetir_se_ocupado
     def registrar_entrada_extra(self, financiamento_id: int, valor: float,
                                descricao: Optional[str] = None, produto_vendido: str = None,
                                data_entrada: datetime = None) -> int:
@@ -340,12 +435,36 @@ class GerenciadorBancoDados:
             VALUES (?, ?, ?, ?, ?)
         """, (financiamento_id, data_entrada, valor, descricao, produto_vendido))
         
-        conn.commit()
+        self._confirmar(conn)
         entrada_id = cursor.lastrowid
-        conn.close()
         
         return entrada_id
     
+    def registrar_entradas_em_lote(self, financiamento_id: int,
+                                   entradas: Iterable[Mapping]) -> int:
+        """
+        Registra várias entradas extras numa única transação
+        
+        Args:
+            financiamento_id: ID do financiamento
+            entradas: Dicionários com os argumentos de registrar_entrada_extra
+                      (valor obrigatório); pode ser um gerador
+        
+        Returns:
+            Quantidade de entradas registradas
+        """
+        hoje = datetime.now().date()
+        return self._inserir_em_lote("""
+            INSERT INTO entradas_extras
+            (financiamento_id, data_entrada, valor, descricao, produto_vendido)
+            VALUES (?, ?, ?, ?, ?)
+        """, (
+            (financiamento_id, e.get('data_entrada') or hoje, e['valor'],
+             e.get('descricao'), e.get('produto_vendido'))
+            for e in entradas
+        ))
+    
+    @repetir_se_ocupado
     def obter_entradas_extras(self, financiamento_id: int) -> List[Dict]:
         """Obtém todas as entradas extras de um financiamento"""
         conn = self._conexao()
@@ -358,10 +477,10 @@ class GerenciadorBancoDados:
         """, (financiamento_id,))
         
         resultados = cursor.fetchall()
-        conn.close()
         
         return [dict(r) for r in resultados]
     
+    @repetir_se_ocupado
     def total_entradas_extras(self, financiamento_id: int) -> float:
         """Calcula total de entradas extras"""
         conn = self._conexao()
@@ -374,10 +493,10 @@ class GerenciadorBancoDados:
         """, (financiamento_id,))
         
         resultado = cursor.fetchone()
-        conn.close()
         
         return resultado['total'] if resultado else 0
     
+    @repetir_se_ocupado
     def alocar_entrada_para_aporte(self, entrada_id: int, aporte_id: int):
         """Aloca uma entrada extra para um aporte específico"""
         conn = self._conexao()
@@ -389,8 +508,135 @@ class GerenciadorBancoDados:
             WHERE id = ?
         """, (aporte_id, entrada_id))
         
-        conn.commit()
-        conn.close()
+        self._confirmar(conn)
+    
+    # ============= TAXAS VARIÁVEIS =============
+    
+    @repetir_se_ocupado
+    def registrar_taxa_variavel(self, financiamento_id: int, parcela_inicial: int,
+                                taxa_mensal: float, indice: Optional[str] = None) -> int:
+        """
+        Registra a taxa que passa a valer a partir de uma parcela
+        
+        Args:
+            financiamento_id: ID do financiamento
+            parcela_inicial: Primeira parcela com a nova taxa
+            taxa_mensal: Taxa efetiva do mês (índice + spread já somados)
+            indice: Índice de referência ('TR', 'IPCA', 'CDI'), se houver
+        
+        Returns:
+            ID do registro (substitui uma taxa já registrada para a mesma parcela)
+        """
+        conn = self._conexao()
+        cursor = conn.cursor()
+        
+        cursor.execute("""
+            INSERT OR REPLACE INTO taxas_variaveis
+            (financiamento_id, parcela_inicial, taxa_mensal, indice)
+            VALUES (?, ?, ?, ?)
+        """, (financiamento_id, parcela_inicial, taxa_mensal, indice))
+        
+        self._confirmar(conn)
+        taxa_id = cursor.lastrowid
+        
+        return taxa_id
+    
+    @repetir_se_ocupado
+    def obter_taxas_variaveis(self, financiamento_id: int) -> Dict[int, float]:
+        """Retorna as mudanças de taxa no formato {parcela_inicial: taxa_mensal}"""
+        conn = self._conexao()
+        cursor = conn.cursor()
+        
+        cursor.execute("""
+            SELECT parcela_inicial, taxa_mensal FROM taxas_variaveis
+            WHERE financiamento_id = ?
+            ORDER BY parcela_inicial ASC
+        """, (financiamento_id,))
+        
+        resultados = cursor.fetchall()
+        
+        return {r['parcela_inicial']: r['taxa_mensal'] for r in resultados}
+    
+    # ============= CACHE DE PLANOS =============
+    
+    @repetir_se_ocupado
+    def salvar_plano_cache(self, financiamento_id: int, impressao: str, parcelas: int,
+                           total_juros: Decimal, total_amortizacao_extra: Decimal,
+                           data_quitacao: Optional[datetime] = None,
+                           colunas: Optional[bytes] = None):
+        """
+        Guarda o resumo (e opcionalmente o plano binário) de um plano calculado
+        
+        Entradas mais antigas do financiamento, além das
+        PLANOS_CACHE_POR_FINANCIAMENTO mais recentes, são apagadas: impressões
+        que não voltam a ser consultadas não se acumulam.
+        
+        Args:
+            financiamento_id: ID do financiamento
+            impressao: Impressão digital dos parâmetros e aportes do plano
+            parcelas, total_juros, total_amortizacao_extra, data_quitacao: Resumo do plano
+            colunas: Plano completo no formato binário (ver src.plano_binario)
+        """
+        conn = self._conexao()
+        cursor = conn.cursor()
+        
+        cursor.execute("""
+            INSERT OR REPLACE INTO planos_cache
+            (impressao, financiamento_id, parcelas, total_juros,
+             total_amortizacao_extra, data_quitacao, colunas)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+        """, (impressao, financiamento_id, parcelas, str(total_juros),
+              str(total_amortizacao_extra),
+              data_quitacao.isoformat() if data_quitacao else None, colunas))
+        # O REPLACE reinsere a linha: rowid maior = gravada mais recentemente
+        cursor.execute("""
+            DELETE FROM planos_cache
+            WHERE financiamento_id = ? AND rowid NOT IN (
+                SELECT rowid FROM planos_cache WHERE financiamento_id = ?
+                ORDER BY rowid DESC LIMIT ?
+            )
+        """, (financiamento_id, financiamento_id, PLANOS_CACHE_POR_FINANCIAMENTO))
+        
+        self._confirmar(conn)
+    
+    @repetir_se_ocupado
+    def obter_planos_cache(self, impressoes: List[str]) -> Dict[str, Dict]:
+        """
+        Busca várias entradas do cache em uma única consulta pela chave primária
+        
+        Returns:
+            {impressao: registro} das impressões encontradas (totais como Decimal)
+        """
+        if not impressoes:
+            return {}
+        conn = self._conexao()
+        cursor = conn.cursor()
+        
+        marcadores = ", ".join("?" * len(impressoes))
+        cursor.execute(f"""
+            SELECT * FROM planos_cache WHERE impressao IN ({marcadores})
+        """, list(impressoes))
+        
+        resultados = cursor.fetchall()
+        
+        registros = {}
+        for r in resultados:
+            registro = dict(r)
+            registro['total_juros'] = Decimal(registro['total_juros'])
+            registro['total_amortizacao_extra'] = Decimal(registro['total_amortizacao_extra'])
+            registros[registro['impressao']] = registro
+        return registros
+    
+    @repetir_se_ocupado
+    def invalidar_planos_cache(self, financiamento_id: int):
+        """Descarta os planos em cache de um financiamento"""
+        conn = self._conexao()
+        cursor = conn.cursor()
+        
+        cursor.execute("DELETE FROM planos_cache WHERE financiamento_id = ?",
+                       (financiamento_id,))
+        
+        self._confirmar(conn)
     
     # ============= RELATÓRIOS =============
     
@@ -413,18 +659,20 @@ class GerenciadorBancoDados:
             'progresso_percentual': (fin['saldo_inicial'] - fin['saldo_atual']) / fin['saldo_inicial'] * 100 if fin['saldo_inicial'] > 0 else 0
         }
     
+    @repetir_se_ocupado
     def limpar_banco(self):
         """Limpa completamente o banco (para testes)"""
         conn = self._conexao()
         cursor = conn.cursor()
         
+        cursor.execute("DELETE FROM planos_cache")
+        cursor.execute("DELETE FROM taxas_variaveis")
         cursor.execute("DELETE FROM entradas_extras")
         cursor.execute("DELETE FROM aportes_extras")
         cursor.execute("DELETE FROM parcelas_pagas")
         cursor.execute("DELETE FROM financiamentos")
         
-        conn.commit()
-        conn.close()
+        self._confirmar(conn)
 
 
 # Exemplo de uso
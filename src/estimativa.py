@@ -0,0 +1,118 @@
+"""
+Estimativa Analítica de Quitação
+
+Para um financiamento com taxa e parcela fixas (tabela Price), o saldo depois
+de k meses sem aportes tem forma fechada:
+
+    S_k = (S - P/r) * (1 + r)^k + P/r
+
+e o número de meses até quitar sai por logaritmo. Assim prazo e juros totais
+são obtidos em O(1) sem aportes e em O(quantidade de aportes) com aportes,
+trecho a trecho. Apenas os últimos meses (e o mês de cada aporte) passam
+pelo laço exato em centavos, que corrige o arredondamento final.
+
+O resultado é uma estimativa. O motor exato arredonda os juros mês a mês, e
+a fórmula fechada ignora esses arredondamentos. Eles se acumulam e rendem
+juros até a quitação, então a diferença no total de juros cresce com o prazo
+e quando a parcela fica perto dos juros do mês. Em sorteios de 3000
+financiamentos, ficou abaixo de R$ 0,50 na grande maioria e passou de R$ 10
+em prazos de 600 meses com a parcela quase igual aos juros. O prazo
+estimado normalmente coincide com o exato.
+"""
+
+from math import ceil, log, log1p
+from typing import Dict, Optional, Tuple
+
+from src.centavos import juros_centavos
+
+
+def meses_para_quitar(saldo: float, taxa: float, parcela: int) -> Optional[int]:
+    """
+    Meses até o saldo (centavos) chegar a 1 centavo ou menos, sem aportes
+
+    Returns:
+        Quantidade de meses, ou None se a parcela não amortiza o saldo
+    """
+    if saldo <= 1:
+        return 0
+    if taxa == 0:
+        return ceil((saldo - 1) / parcela) if parcela > 0 else None
+    limite_saldo = parcela / taxa  # Saldo em que a parcela só cobre os juros
+    if limite_saldo <= saldo:
+        return None
+    return max(1, ceil(log((limite_saldo - 1) / (limite_saldo - saldo)) / log1p(taxa)))
+
+
+def saldo_apos(saldo: float, taxa: float, parcela: int, meses: int) -> float:
+    """Saldo (centavos, sem arredondamento mensal) após `meses` parcelas sem aportes"""
+    if taxa == 0:
+        return saldo - meses * parcela
+    limite_saldo = parcela / taxa
+    return (saldo - limite_saldo) * (1 + taxa) ** meses + limite_saldo
+
+
+def estimar_totais(saldo: int, num: int, den: int, parcela: int,
+                   aportes: Optional[Dict[int, int]] = None) -> Optional[Tuple[int, int, int]]:
+    """
+    Estima os totais do plano: (parcelas, juros, aportes) em centavos
+
+    Args:
+        saldo: Saldo devedor inicial em centavos
+        num, den: Taxa mensal como fração num/den (não negativa)
+        parcela: Parcela fixa em centavos
+        aportes: {numero_parcela: aporte_em_centavos}
+
+    Returns:
+        Totais estimados, ou None se algum trecho não amortiza (o motor
+        exato informa o mês com FinanciamentoNaoAmortizavel)
+    """
+    taxa = num / den
+    meses_feitos = 0
+    juros = 0.0
+    total_extra = 0
+
+    def avancar(meses: int):
+        """Pula `meses` parcelas sem aportes pela fórmula fechada"""
+        nonlocal saldo, juros, meses_feitos
+        novo_saldo = saldo_apos(saldo, taxa, parcela, meses)
+        juros += meses * parcela - (saldo - novo_saldo)
+        saldo = novo_saldo
+        meses_feitos += meses
+
+    def passo_exato(extra: int) -> bool:
+        """Um mês pelo laço exato em centavos (False se o mês não amortiza)"""
+        nonlocal saldo, juros, meses_feitos, total_extra
+        saldo = round(saldo)
+        juros_mes = juros_centavos(saldo, num, den)
+        principal = parcela - juros_mes
+        if extra == 0 and principal <= 0:
+            return False
+        saldo = max(saldo - principal - extra, 0)
+        juros += juros_mes
+        total_extra += extra
+        meses_feitos += 1
+        return True
+
+    for numero, extra in sorted((aportes or {}).items()):
+        if numero <= meses_feitos or extra == 0:
+            continue
+        if saldo <= 1:
+            break
+        meses = meses_para_quitar(saldo, taxa, parcela)
+        if meses is None:
+            return None
+        if meses <= numero - 1 - meses_feitos:
+            break  # Quita antes deste aporte
+        avancar(numero - 1 - meses_feitos)
+        passo_exato(extra)
+
+    # Último trecho: fórmula até perto da quitação, laço exato no final
+    meses = meses_para_quitar(saldo, taxa, parcela)
+    if meses is None:
+        return None
+    avancar(max(meses - 2, 0))
+    while saldo > 1:
+        if not passo_exato(0):
+            return None
+
+    return meses_feitos, round(juros), total_extra
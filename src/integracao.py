@@ -5,13 +5,23 @@ Este módulo conecta o motor de cálculo (Fase 1) com o banco de dados (Fase 2),
 permitindo calcular e salvar planos de amortização completos.
 """
 
-from datetime import datetime
-from typing import Optional, Tuple
+import hashlib
+from datetime import date, datetime
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple, Union
 from decimal import Decimal
 from pathlib import Path
 
-from src.amortizacao import CalculadoraAmortizacao, PlanoAmortizacao
+from src.amortizacao import (
+    MODO_PRAZO, CalculadoraAmortizacao, ComparacaoModos, Parcela, PlanoAmortizacao, ResumoPlano,
+)
+from src.carteira import ResultadoCarteira, simular_carteira
+from src.curva_taxas import CalculadoraTaxaVariavel, CurvaTaxas
 from src.database import GerenciadorBancoDados
+from src.monte_carlo import ResultadoMonteCarlo, ajustar_modelo, simular as simular_monte_carlo
+from src.motor_vetorizado import GradeSimulacao
+from src.otimizador import AlocacaoOtima, otimizar_aportes, parcela_disponivel
+from src.plano_binario import plano_de_buffer, plano_para_bytes, salvar_plano
+from src.sensibilidade import Sensibilidades
 
 
 class SistemaFinanciamento:
@@ -22,6 +32,33 @@ class SistemaFinanciamento:
         if db_path is None:
             db_path = Path(__file__).parent.parent / "data" / "financiamentos.db"
         self.bd = GerenciadorBancoDados(db_path)
+        # Último plano com aportes por financiamento: {id: (parâmetros, aportes, plano)}
+        self._ultimos_planos: Dict[int, Tuple[tuple, Dict[int, float], PlanoAmortizacao]] = {}
+    
+    def _calculadora(self, fin: dict) -> CalculadoraAmortizacao:
+        """
+        Cria a calculadora a partir de um registro de financiamento
+        
+        Com taxas variáveis registradas, a taxa do financiamento vale até a
+        primeira mudança e a calculadora usa a curva de taxas. As datas das
+        parcelas partem da data de início gravada (não de hoje), então o
+        plano e a impressão digital do cache não mudam de um dia para o outro.
+        """
+        data_inicio = datetime.fromisoformat(str(fin['data_inicio']))
+        alteracoes = self.bd.obter_taxas_variaveis(fin['id'])
+        if alteracoes:
+            return CalculadoraTaxaVariavel(
+                saldo_devedor=fin['saldo_inicial'],
+                curva=CurvaTaxas.de_alteracoes({1: fin['taxa_mensal'], **alteracoes}),
+                parcela_mensal=fin['parcela_fixa'],
+                data_inicio=data_inicio
+            )
+        return CalculadoraAmortizacao(
+            saldo_devedor=fin['saldo_inicial'],
+            taxa_mensal=fin['taxa_mensal'],
+            parcela_mensal=fin['parcela_fixa'],
+            data_inicio=data_inicio
+        )
     
     def criar_financiamento_completo(self, nome: str, saldo_inicial: float,
                                      taxa_mensal: float, parcela_fixa: float,
@@ -31,7 +68,12 @@ class SistemaFinanciamento:
         
         Returns:
             ID do financiamento
+        
+        Raises:
+            FinanciamentoNaoAmortizavel: se a parcela não cobrir os juros do
+                primeiro mês (conferido em O(1), antes de gravar)
         """
+        CalculadoraAmortizacao(saldo_inicial, taxa_mensal, parcela_fixa).verificar_amortizacao()
         return self.bd.criar_financiamento(
             nome=nome,
             saldo_inicial=saldo_inicial,
@@ -60,44 +102,191 @@ class SistemaFinanciamento:
             (plano_sem_aportes, plano_com_aportes)
         """
         fin = self.bd.obter_financiamento(financiamento_id)
+        calc = self._calculadora(fin)
+        aportes = self.bd.obter_aportes_dict(financiamento_id)
         
-        calc = CalculadoraAmortizacao(
-            saldo_devedor=fin['saldo_inicial'],
-            taxa_mensal=fin['taxa_mensal'],
-            parcela_mensal=fin['parcela_fixa']
-        )
+        # Os dois planos vêm do cache em uma única leitura pela chave primária
+        impressao_original = self._impressao(calc, {})
+        impressao_aportes = self._impressao(calc, aportes)
+        cache = self.bd.obter_planos_cache([impressao_original, impressao_aportes])
         
         # Plano original (sem aportes)
-        plano_original = calc.gerar_plano_completo()
+        curva = getattr(calc, 'curva', None)
+        plano_original = self._plano_do_cache(cache.get(impressao_original), curva)
+        if plano_original is None:
+            plano_original = calc.gerar_plano_completo()
+            self._guardar_plano(financiamento_id, impressao_original, plano_original, {}, curva)
         
         # Plano com aportes registrados
-        aportes = self.bd.obter_aportes_dict(financiamento_id)
-        plano_acelerado = calc.gerar_plano_completo(aportes) if aportes else plano_original
+        if not aportes:
+            return plano_original, plano_original
         
+        parametros = (fin['saldo_inicial'], fin['taxa_mensal'], fin['parcela_fixa'], curva)
+        plano_acelerado = self._plano_do_cache(cache.get(impressao_aportes), curva)
+        if plano_acelerado is None:
+            plano_acelerado = self._continuar_ultimo_plano(financiamento_id, calc, parametros,
+                                                           plano_original, aportes)
+            self._guardar_plano(financiamento_id, impressao_aportes, plano_acelerado, aportes, curva)
+        
+        self._ultimos_planos[financiamento_id] = (parametros, dict(aportes), plano_acelerado)
         return plano_original, plano_acelerado
     
+    def _continuar_ultimo_plano(self, financiamento_id: int, calc: CalculadoraAmortizacao,
+                                parametros: tuple, plano_original: PlanoAmortizacao,
+                                aportes: Dict[int, float]) -> PlanoAmortizacao:
+        """Plano com aportes a partir do último plano calculado neste processo"""
+        # Reaproveita o último plano calculado (ou o original) até a primeira
+        # parcela cujo aporte mudou e recalcula só dali em diante
+        plano_base, aportes_base = plano_original, {}
+        anterior = self._ultimos_planos.get(financiamento_id)
+        if anterior is not None and anterior[0] == parametros:
+            _, aportes_base, plano_base = anterior
+        
+        alterados = [n for n in aportes.keys() | aportes_base.keys()
+                     if aportes.get(n) != aportes_base.get(n)]
+        primeira_alterada = min(alterados, default=len(plano_base.parcelas) + 1)
+        return calc.continuar_plano(plano_base, primeira_alterada, aportes)
+    
+    @staticmethod
+    def _impressao(calc: CalculadoraAmortizacao, aportes: Dict[int, float]) -> str:
+        """Impressão digital do plano: parâmetros, curva, datas e aportes"""
+        curva = getattr(calc, 'curva', None)
+        partes = (
+            str(calc.saldo_devedor), str(calc.taxa_mensal), str(calc.parcela_fixa),
+            repr(curva.fracoes if curva is not None else None),
+            calc.data_inicio.isoformat(),
+            repr((calc.calendario.dia_util, sorted(calc.calendario.feriados_locais))),
+            repr(sorted((int(n), str(Decimal(str(v)))) for n, v in aportes.items())),
+        )
+        return hashlib.sha256("|".join(partes).encode()).hexdigest()
+    
+    @staticmethod
+    def _plano_do_cache(registro: Optional[dict],
+                        curva: Optional[CurvaTaxas] = None) -> Optional[PlanoAmortizacao]:
+        """Plano guardado no cache (None se ausente ou só com o resumo)"""
+        if registro is None or registro['colunas'] is None:
+            return None
+        try:
+            return plano_de_buffer(registro['colunas'], modo=MODO_PRAZO, curva=curva)
+        except ValueError:
+            return None  # Formato antigo ou corrompido: recalcula
+    
+    def _guardar_plano(self, financiamento_id: int, impressao: str,
+                       plano: PlanoAmortizacao, aportes: Dict[int, float],
+                       curva: Optional[CurvaTaxas] = None):
+        """Guarda resumo e colunas do plano no cache do banco"""
+        try:
+            colunas = plano_para_bytes(plano, aportes, curva=curva)
+        except ValueError:
+            colunas = None  # Fração de centavo: guarda só o resumo
+        self.bd.salvar_plano_cache(
+            financiamento_id, impressao,
+            parcelas=plano.quantidade_parcelas,
+            total_juros=plano.total_juros_pago,
+            total_amortizacao_extra=plano.total_amortizacao_extra,
+            data_quitacao=plano.datas[-1] if plano.quantidade_parcelas else None,
+            colunas=colunas
+        )
+    
+    def _resumos_com_cache(self, financiamento_id: int) -> Tuple[ResumoPlano, ResumoPlano]:
+        """Resumos sem e com aportes, lidos do cache quando disponíveis"""
+        fin = self.bd.obter_financiamento(financiamento_id)
+        calc = self._calculadora(fin)
+        aportes = self.bd.obter_aportes_dict(financiamento_id)
+        impressoes = [self._impressao(calc, {}), self._impressao(calc, aportes)]
+        cache = self.bd.obter_planos_cache(impressoes)
+        
+        resumos, novos = [], []
+        for impressao, aportes_plano in zip(impressoes, ({}, aportes)):
+            registro = cache.get(impressao)
+            if registro is None:
+                resumo = calc.resumir(aportes_plano)
+                novos.append((impressao, resumo))
+                cache[impressao] = {'resumo': resumo}  # Sem aportes: as duas impressões coincidem
+            elif 'resumo' in registro:
+                resumo = registro['resumo']
+            else:
+                resumo = ResumoPlano(
+                    parcelas=registro['parcelas'],
+                    total_juros=registro['total_juros'],
+                    total_amortizacao_extra=registro['total_amortizacao_extra'],
+                    data_quitacao=(datetime.fromisoformat(registro['data_quitacao'])
+                                   if registro['data_quitacao'] else None)
+                )
+            resumos.append(resumo)
+        
+        if novos:
+            with self.bd.transacao():  # Um commit para os dois resumos
+                for impressao, resumo in novos:
+                    self.bd.salvar_plano_cache(
+                        financiamento_id, impressao, resumo.parcelas, resumo.total_juros,
+                        resumo.total_amortizacao_extra, resumo.data_quitacao
+                    )
+        return resumos[0], resumos[1]
+    
+    def exportar_plano_binario(self, financiamento_id: int,
+                               caminho: Optional[Path] = None) -> Union[bytes, Path]:
+        """
+        Exporta o plano com os aportes registrados no formato binário
+        (ver src.plano_binario), para outro processo abrir sem recalcular
+        
+        Args:
+            financiamento_id: ID do financiamento
+            caminho: Arquivo de destino (None: devolve os bytes)
+        
+        Returns:
+            Os bytes do plano, ou o caminho do arquivo gravado
+        """
+        _, plano = self.simular_plano_com_aportes(financiamento_id)
+        aportes = self.bd.obter_aportes_dict(financiamento_id)
+        curva = getattr(self._calculadora(self.bd.obter_financiamento(financiamento_id)), 'curva', None)
+        if caminho is None:
+            return plano_para_bytes(plano, aportes, curva=curva)
+        return salvar_plano(plano, caminho, aportes, curva=curva)
+    
     def salvar_parcelas_do_plano(self, financiamento_id: int, 
-                                plano: PlanoAmortizacao, 
-                                marcar_como_pagas: bool = False):
+                                plano: Union[PlanoAmortizacao, Iterable[Parcela]], 
+                                marcar_como_pagas: bool = False) -> int:
         """
-        Salva as parcelas do plano no banco de dados
+        Salva as parcelas do plano no banco de dados, numa única transação
+        
+        As parcelas são lidas uma a uma enquanto são gravadas, sem montar
+        uma lista.
         
         Args:
             financiamento_id: ID do financiamento
-            plano: Plano de amortização a salvar
+            plano: Plano de amortização a salvar, ou as parcelas
+                   (ex: calc.iter_parcelas(aportes), sem gerar o plano inteiro)
             marcar_como_pagas: Se True, marca as parcelas como já pagas
+        
+        Returns:
+            Quantidade de parcelas salvas
         """
-        for parcela in plano.parcelas:
-            self.bd.registrar_parcela_paga(
-                financiamento_id=financiamento_id,
-                numero_parcela=parcela.numero,
-                valor_parcela=float(parcela.valor_parcela),
-                juros=float(parcela.juros),
-                principal=float(parcela.principal),
-                saldo_anterior=float(parcela.saldo_anterior),
-                saldo_posterior=float(parcela.saldo_posterior),
-                data_pagamento=parcela.data if marcar_como_pagas else None
-            )
+        parcelas = plano.parcelas if isinstance(plano, PlanoAmortizacao) else plano
+        return self.bd.registrar_parcelas_em_lote(financiamento_id, (
+            {
+                'numero_parcela': parcela.numero,
+                'valor_parcela': float(parcela.valor_parcela),
+                'juros': float(parcela.juros),
+                'principal': float(parcela.principal),
+                'saldo_anterior': float(parcela.saldo_anterior),
+                'saldo_posterior': float(parcela.saldo_posterior),
+                'data_pagamento': parcela.data if marcar_como_pagas else None,
+            }
+            for parcela in parcelas
+        ))
+    
+    def comparar_modos_aporte(self, financiamento_id: int) -> ComparacaoModos:
+        """
+        Compara redução de prazo e redução de parcela com os aportes registrados
+        
+        Returns:
+            ComparacaoModos com o resumo de cada modo e a parcela reduzida
+        """
+        fin = self.bd.obter_financiamento(financiamento_id)
+        calc = self._calculadora(fin)
+        
+        return calc.comparar_modos(self.bd.obter_aportes_dict(financiamento_id))
     
     def simular_aporte_venda(self, financiamento_id: int, 
                            valor_venda: float, numero_parcela: int) -> Tuple[int, float]:
@@ -113,70 +302,189 @@ class SistemaFinanciamento:
             (meses_economizados, economia_em_juros)
         """
         fin = self.bd.obter_financiamento(financiamento_id)
-        
-        calc = CalculadoraAmortizacao(
-            saldo_devedor=fin['saldo_inicial'],
-            taxa_mensal=fin['taxa_mensal'],
-            parcela_mensal=fin['parcela_fixa']
-        )
+        calc = self._calculadora(fin)
         
         meses, economia = calc.simular_aporte(valor_venda, numero_parcela)
         
         return meses, economia
     
+    def parcela_para_quitar_em(self, financiamento_id: int, meses: int) -> Decimal:
+        """
+        Parcela fixa necessária para quitar o financiamento em `meses` parcelas
+        
+        Returns:
+            Menor parcela que quita no prazo (ver CalculadoraAmortizacao.parcela_para_quitar_em)
+        """
+        fin = self.bd.obter_financiamento(financiamento_id)
+        calc = self._calculadora(fin)
+        
+        return calc.parcela_para_quitar_em(meses)
+    
+    def aporte_para_quitar_em(self, financiamento_id: int, numero_parcela: int,
+                              meses: int) -> Decimal:
+        """
+        Aporte necessário na parcela `numero_parcela` para quitar em `meses` parcelas
+        
+        Returns:
+            Menor aporte que quita no prazo (0 se o plano atual já quita)
+        """
+        fin = self.bd.obter_financiamento(financiamento_id)
+        calc = self._calculadora(fin)
+        
+        return calc.aporte_para_quitar_em(numero_parcela, meses)
+    
+    def sensibilidades_financiamento(self, financiamento_id: int) -> Sensibilidades:
+        """
+        Efeitos marginais do plano com os aportes registrados (sem re-simular)
+        
+        Returns:
+            Sensibilidades (ver CalculadoraAmortizacao.sensibilidades)
+        """
+        fin = self.bd.obter_financiamento(financiamento_id)
+        calc = self._calculadora(fin)
+        
+        return calc.sensibilidades(self.bd.obter_aportes_dict(financiamento_id))
+    
+    def proxima_parcela(self, financiamento_id: int) -> int:
+        """Primeira parcela (base 1) com vencimento hoje ou depois"""
+        fin = self.bd.obter_financiamento(financiamento_id)
+        return parcela_disponivel(self._calculadora(fin), date.today())
+    
+    def simular_grade_venda(self, financiamento_id: int, valores: Sequence[float],
+                            parcelas: Sequence[int]) -> GradeSimulacao:
+        """
+        Simula vários valores de venda em várias parcelas de uma só vez
+        
+        O financiamento é carregado uma única vez e todos os cenários são
+        calculados em um passe vetorizado (ver CalculadoraAmortizacao.simular_grade).
+        
+        Returns:
+            GradeSimulacao com meses e juros economizados por [valor, parcela]
+        """
+        fin = self.bd.obter_financiamento(financiamento_id)
+        calc = self._calculadora(fin)
+        
+        return calc.simular_grade(valores, parcelas)
+    
+    def otimizar_aportes_entradas(self, financiamento_id: int,
+                                  orcamento: Optional[float] = None,
+                                  passo: float = 50) -> AlocacaoOtima:
+        """
+        Sugere em quais parcelas aplicar as entradas extras ainda não alocadas
+        
+        Cada entrada fica disponível a partir da primeira parcela que vence
+        depois da data da venda.
+        
+        Args:
+            financiamento_id: ID do financiamento
+            orcamento: Total a aplicar (default: todas as entradas livres)
+            passo: Granularidade dos aportes em reais
+        
+        Returns:
+            AlocacaoOtima com os aportes sugeridos e a economia
+        """
+        fin = self.bd.obter_financiamento(financiamento_id)
+        calc = self._calculadora(fin)
+        
+        disponibilidades = [
+            (datetime.fromisoformat(str(entrada['data_entrada'])), entrada['valor'])
+            for entrada in self.bd.obter_entradas_extras(financiamento_id)
+            if not entrada['alocado_para_aporte']
+        ]
+        return otimizar_aportes(calc, disponibilidades, orcamento, passo)
+    
+    def simular_renda_incerta(self, financiamento_id: int, simulacoes: int = 2000,
+                              semente: Optional[int] = None,
+                              processos: Optional[int] = None) -> ResultadoMonteCarlo:
+        """
+        Monte Carlo da renda de revenda a partir das entradas extras registradas
+        
+        O modelo de renda é ajustado ao histórico do financiamento, desde a
+        data de início até hoje.
+        
+        Returns:
+            ResultadoMonteCarlo com percentis de prazo, quitação e economia
+        """
+        fin = self.bd.obter_financiamento(financiamento_id)
+        calc = self._calculadora(fin)
+        
+        modelo = ajustar_modelo(
+            self.bd.obter_entradas_extras(financiamento_id),
+            inicio=datetime.fromisoformat(str(fin['data_inicio'])).date(),
+            fim=datetime.now().date()
+        )
+        return simular_monte_carlo(calc, modelo, simulacoes, semente, processos)
+    
+    def comparar_estrategias_carteira(self, extra_mensal: Union[float, Sequence[float]]
+                                      ) -> Tuple[List[int], Dict[str, ResultadoCarteira]]:
+        """
+        Compara avalanche, bola de neve e demais estratégias em todos os
+        financiamentos ativos, distribuindo um extra mensal entre eles
+        
+        Returns:
+            (ids dos financiamentos na ordem usada, {estrategia: ResultadoCarteira})
+        """
+        financiamentos = self.bd.listar_financiamentos(apenas_ativos=True)
+        calculadoras = [self._calculadora(fin) for fin in financiamentos]
+        
+        return [fin['id'] for fin in financiamentos], simular_carteira(calculadoras, extra_mensal)
+    
     def registrar_venda_e_aporte(self, financiamento_id: int,
                                 valor_venda: float, numero_parcela: int,
                                 descricao: str, produto_vendido: Optional[str] = None) -> Tuple[int, int]:
         """
         Registra uma venda (entrada extra) e a converte em aporte automaticamente
         
+        As três escritas formam uma única transação: ou ficam todas gravadas,
+        ou nenhuma.
+        
         Returns:
             (entrada_id, aporte_id)
         """
-        # Registra a venda como entrada extra
-        entrada_id = self.bd.registrar_entrada_extra(
-            financiamento_id=financiamento_id,
-            valor=valor_venda,
-            descricao=descricao,
-            produto_vendido=produto_vendido
-        )
-        
-        # Registra o aporte correspondente
-        aporte_id = self.bd.registrar_aporte(
-            financiamento_id=financiamento_id,
-            numero_parcela=numero_parcela,
-            valor_aporte=valor_venda,
-            origem="revenda",
-            descricao=f"Aporte de venda: {produto_vendido or descricao}"
-        )
-        
-        # Aloca a entrada para o aporte
-        self.bd.alocar_entrada_para_aporte(entrada_id, aporte_id)
+        with self.bd.transacao():
+            # Registra a venda como entrada extra
+            entrada_id = self.bd.registrar_entrada_extra(
+                financiamento_id=financiamento_id,
+                valor=valor_venda,
+                descricao=descricao,
+                produto_vendido=produto_vendido
+            )
+            
+            # Registra o aporte correspondente
+            aporte_id = self.bd.registrar_aporte(
+                financiamento_id=financiamento_id,
+                numero_parcela=numero_parcela,
+                valor_aporte=valor_venda,
+                origem="revenda",
+                descricao=f"Aporte de venda: {produto_vendido or descricao}"
+            )
+            
+            # Aloca a entrada para o aporte
+            self.bd.alocar_entrada_para_aporte(entrada_id, aporte_id)
         
         return entrada_id, aporte_id
     
     def obter_dashboard_dados(self, financiamento_id: int) -> dict:
         """Obtém todos os dados necessários para o dashboard"""
         
-        plano_original, plano_com_aportes = self.simular_plano_com_aportes(
-            financiamento_id
-        )
+        # O dashboard só usa contagens e totais: resumos (do cache), sem montar os planos
+        resumo_original, resumo_acelerado = self._resumos_com_cache(financiamento_id)
         
         resumo = self.bd.gerar_resumo_financiamento(financiamento_id)
         
         return {
             'financiamento': resumo['financiamento'],
             'plano_original': {
-                'parcelas': len(plano_original.parcelas),
-                'total_juros': float(plano_original.total_juros_pago),
+                'parcelas': resumo_original.parcelas,
+                'total_juros': float(resumo_original.total_juros),
             },
             'plano_acelerado': {
-                'parcelas': len(plano_com_aportes.parcelas),
-                'total_juros': float(plano_com_aportes.total_juros_pago),
+                'parcelas': resumo_acelerado.parcelas,
+                'total_juros': float(resumo_acelerado.total_juros),
             },
             'economia': {
-                'meses': len(plano_original.parcelas) - len(plano_com_aportes.parcelas),
-                'juros': float(plano_original.total_juros_pago - plano_com_aportes.total_juros_pago),
+                'meses': resumo_original.parcelas - resumo_acelerado.parcelas,
+                'juros': float(resumo_original.total_juros - resumo_acelerado.total_juros),
             },
             'historico': {
                 'parcelas_pagas': resumo['parcelas_pagas'],
@@ -0,0 +1,210 @@
+"""
+Migrações do Esquema SQLite
+
+O esquema evolui por migrações numeradas. A versão aplicada fica no
+cabeçalho do próprio arquivo (PRAGMA user_version), então abrir um banco
+atualizado custa uma única leitura, sem os CREATE TABLE IF NOT EXISTS de
+cada instanciação do gerenciador.
+
+Para mudar o esquema, acrescente uma Migracao ao fim de MIGRACOES (nunca
+edite uma já publicada): ela roda uma vez em cada banco, na mesma transação
+que avança o user_version.
+"""
+
+import sqlite3
+from dataclasses import dataclass
+from typing import Tuple
+
+
+@dataclass(frozen=True)
+class Migracao:
+    """Comandos que levam o esquema da versão anterior para `versao`"""
+    versao: int
+    descricao: str
+    comandos: Tuple[str, ...]
+
+
+# (tabela, evento, linha, coluna com o id do financiamento) que invalidam planos_cache
+GATILHOS_CACHE = (
+    ('aportes_extras', 'INSERT', 'NEW', 'financiamento_id'),
+    ('aportes_extras', 'UPDATE', 'OLD', 'financiamento_id'),
+    ('aportes_extras', 'DELETE', 'OLD', 'financiamento_id'),
+    ('taxas_variaveis', 'INSERT', 'NEW', 'financiamento_id'),
+    ('taxas_variaveis', 'UPDATE', 'OLD', 'financiamento_id'),
+    ('taxas_variaveis', 'DELETE', 'OLD', 'financiamento_id'),
+    ('financiamentos', 'UPDATE OF saldo_inicial, taxa_mensal, parcela_fixa, data_inicio', 'OLD', 'id'),
+    ('financiamentos', 'DELETE', 'OLD', 'id'),
+)
+
+# Esquema anterior ao versionamento. Mantém o IF NOT EXISTS: bancos criados
+# antes das migrações estão na versão 0 e já têm parte (ou todas) as tabelas.
+_ESQUEMA_BASE = (
+    """
+    CREATE TABLE IF NOT EXISTS financiamentos (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        nome TEXT NOT NULL,
+        descricao TEXT,
+        saldo_inicial REAL NOT NULL,
+        saldo_atual REAL NOT NULL,
+        taxa_mensal REAL NOT NULL,
+        parcela_fixa REAL NOT NULL,
+        data_inicio DATE NOT NULL,
+        data_quitacao_estimada DATE,
+        ativo BOOLEAN DEFAULT 1,
+        criado_em TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        atualizado_em TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS parcelas_pagas (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        financiamento_id INTEGER NOT NULL,
+        numero_parcela INTEGER NOT NULL,
+        data_pagamento DATE NOT NULL,
+        valor_parcela REAL NOT NULL,
+        juros REAL NOT NULL,
+        principal REAL NOT NULL,
+        saldo_anterior REAL NOT NULL,
+        saldo_posterior REAL NOT NULL,
+        FOREIGN KEY(financiamento_id) REFERENCES financiamentos(id)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS aportes_extras (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        financiamento_id INTEGER NOT NULL,
+        numero_parcela INTEGER NOT NULL,
+        data_aporte DATE NOT NULL,
+        valor_aporte REAL NOT NULL,
+        origem TEXT,  -- 'revenda', 'salario', 'bonus', etc
+        descricao TEXT,
+        criado_em TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        FOREIGN KEY(financiamento_id) REFERENCES financiamentos(id)
+    )
+    """,
+    # Entradas extras (receitas de revenda)
+    """
+    CREATE TABLE IF NOT EXISTS entradas_extras (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        financiamento_id INTEGER NOT NULL,
+        data_entrada DATE NOT NULL,
+        valor REAL NOT NULL,
+        descricao TEXT,
+        produto_vendido TEXT,
+        alocado_para_aporte BOOLEAN DEFAULT 0,
+        aporte_id INTEGER,
+        criado_em TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        FOREIGN KEY(financiamento_id) REFERENCES financiamentos(id),
+        FOREIGN KEY(aporte_id) REFERENCES aportes_extras(id)
+    )
+    """,
+    # Taxas variáveis (mudanças de taxa a partir de uma parcela)
+    """
+    CREATE TABLE IF NOT EXISTS taxas_variaveis (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        financiamento_id INTEGER NOT NULL,
+        parcela_inicial INTEGER NOT NULL,
+        taxa_mensal REAL NOT NULL,
+        indice TEXT,  -- 'TR', 'IPCA', 'CDI' ou NULL (taxa prefixada)
+        criado_em TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        FOREIGN KEY(financiamento_id) REFERENCES financiamentos(id),
+        UNIQUE(financiamento_id, parcela_inicial)
+    )
+    """,
+    # Cache de planos calculados, pela impressão digital dos parâmetros e aportes
+    """
+    CREATE TABLE IF NOT EXISTS planos_cache (
+        impressao TEXT PRIMARY KEY,
+        financiamento_id INTEGER NOT NULL,
+        parcelas INTEGER NOT NULL,
+        total_juros TEXT NOT NULL,  -- Decimal exato, como texto
+        total_amortizacao_extra TEXT NOT NULL,
+        data_quitacao TIMESTAMP,
+        colunas BLOB,  -- Plano completo no formato binário (opcional)
+        criado_em TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        FOREIGN KEY(financiamento_id) REFERENCES financiamentos(id)
+    )
+    """,
+    """
+    CREATE INDEX IF NOT EXISTS idx_planos_cache_financiamento
+    ON planos_cache(financiamento_id)
+    """,
+) + tuple(
+    # Qualquer escrita que muda o plano descarta o cache do financiamento
+    f"""
+    CREATE TRIGGER IF NOT EXISTS invalida_cache_{tabela}_{evento.split()[0].lower()}
+    AFTER {evento} ON {tabela}
+    BEGIN
+        DELETE FROM planos_cache WHERE financiamento_id = {linha}.{chave};
+    END
+    """
+    for tabela, evento, linha, chave in GATILHOS_CACHE
+)
+
+# Todas as consultas do histórico filtram por financiamento_id. Os índices
+# seguem a ordenação de cada listagem e terminam na coluna somada pelos
+# totais, que assim são respondidos só pelo índice (sem ler a tabela).
+_INDICES_FINANCIAMENTO = (
+    """
+    CREATE INDEX idx_parcelas_pagas_financiamento
+    ON parcelas_pagas(financiamento_id, numero_parcela, juros)
+    """,
+    """
+    CREATE INDEX idx_aportes_extras_financiamento
+    ON aportes_extras(financiamento_id, data_aporte, valor_aporte)
+    """,
+    """
+    CREATE INDEX idx_entradas_extras_financiamento
+    ON entradas_extras(financiamento_id, data_entrada, valor)
+    """,
+)
+
+MIGRACOES = (
+    Migracao(1, "Esquema base", _ESQUEMA_BASE),
+    Migracao(2, "Índices por financiamento_id", _INDICES_FINANCIAMENTO),
+)
+VERSAO_ATUAL = MIGRACOES[-1].versao
+
+
+def versao_esquema(conn: sqlite3.Connection) -> int:
+    """Versão do esquema gravada no banco (0 = banco novo ou anterior às migrações)"""
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def aplicar_migracoes(conn: sqlite3.Connection) -> int:
+    """
+    Aplica as migrações pendentes, cada uma uma única vez
+
+    Com o banco já na versão atual, custa só a leitura do user_version.
+    Senão, trava o banco para escrita (BEGIN IMMEDIATE), relê a versão (outro
+    processo pode ter migrado enquanto esperávamos) e aplica as migrações
+    pendentes e o novo user_version numa única transação: uma falha não
+    deixa o esquema pela metade.
+
+    Returns:
+        Quantidade de migrações aplicadas
+
+    Raises:
+        ValueError: Banco criado por uma versão mais nova do sistema
+    """
+    if versao_esquema(conn) == VERSAO_ATUAL:
+        return 0
+
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        versao = versao_esquema(conn)
+        if versao > VERSAO_ATUAL:
+            raise ValueError(
+                f"Esquema do banco na versão {versao}, mais nova que a suportada "
+                f"({VERSAO_ATUAL})"
+            )
+        pendentes = [m for m in MIGRACOES if m.versao > versao]
+        for migracao in pendentes:
+            for comando in migracao.comandos:
+                conn.execute(comando)
+        conn.execute(f"PRAGMA user_version = {VERSAO_ATUAL}")
+        conn.commit()
+    except BaseException:
+        conn.rollback()
+        raise
+    return len(pendentes)
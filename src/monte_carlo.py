@@ -0,0 +1,169 @@
+"""
+Simulação Monte Carlo da Renda de Revenda
+
+As entradas extras (revendas) são irregulares: em alguns meses há venda, em
+outros não, e o valor varia. Este módulo ajusta um modelo simples ao
+histórico de entradas_extras de um financiamento (probabilidade de venda no
+mês + valor mensal lognormal), sorteia milhares de sequências de renda,
+transforma cada uma em aportes e reporta percentis de prazo, data de
+quitação e juros economizados. Cada cenário é resumido pelo motor exato em
+centavos (resumir), o mesmo do plano base, então a economia não carrega erro
+de estimativa. Até a primeira venda o cenário é o plano base: resumir parte
+das colunas dele em cache e só simula o restante.
+
+As simulações são divididas em lotes e distribuídas em um
+ProcessPoolExecutor. Cada lote recebe sua própria SeedSequence derivada da
+semente, então o resultado é reproduzível e independe da quantidade de
+processos.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from src.amortizacao import CalculadoraAmortizacao
+from src.centavos import para_centavos, para_reais
+
+
+PERCENTIS_PADRAO = (10, 50, 90)
+
+
+@dataclass(frozen=True)
+class ModeloRenda:
+    """Modelo da renda mensal de revenda"""
+    probabilidade_mensal: float  # Chance de haver venda em um mês
+    media_log: float             # Média do log do valor mensal
+    desvio_log: float            # Desvio padrão do log do valor mensal
+
+
+@dataclass
+class ResultadoMonteCarlo:
+    """Percentis das simulações (chave: percentil)"""
+    simulacoes: int
+    meses: Dict[int, int]
+    data_quitacao: Dict[int, datetime]
+    economia_juros: Dict[int, Decimal]
+
+
+def _como_data(valor) -> date:
+    if isinstance(valor, datetime):
+        return valor.date()
+    if isinstance(valor, date):
+        return valor
+    return date.fromisoformat(str(valor)[:10])
+
+
+def ajustar_modelo(entradas: Iterable[Dict], inicio: Optional[date] = None,
+                   fim: Optional[date] = None) -> ModeloRenda:
+    """
+    Ajusta o modelo ao histórico de entradas extras
+
+    Args:
+        entradas: Registros com 'data_entrada' e 'valor' (ex: obter_entradas_extras)
+        inicio, fim: Período observado (default: da primeira à última entrada)
+
+    Returns:
+        ModeloRenda ajustado (Bernoulli mensal + lognormal dos totais do mês).
+        Sem nenhuma venda no histórico, a probabilidade mensal é 0: todos os
+        cenários ficam iguais ao plano sem aportes.
+    """
+    totais: Dict[Tuple[int, int], float] = {}
+    for entrada in entradas:
+        data = _como_data(entrada['data_entrada'])
+        chave = (data.year, data.month)
+        totais[chave] = totais.get(chave, 0) + float(entrada['valor'])
+
+    totais = {mes: valor for mes, valor in totais.items() if valor > 0}
+    if not totais:
+        return ModeloRenda(probabilidade_mensal=0.0, media_log=0.0, desvio_log=0.0)
+
+    primeiro = (inicio.year, inicio.month) if inicio else min(totais)
+    ultimo = (fim.year, fim.month) if fim else max(totais)
+    meses_observados = max((ultimo[0] - primeiro[0]) * 12 + ultimo[1] - primeiro[1] + 1, len(totais))
+
+    logs = np.log(list(totais.values()))
+    return ModeloRenda(
+        probabilidade_mensal=len(totais) / meses_observados,
+        media_log=float(logs.mean()),
+        desvio_log=float(logs.std()),
+    )
+
+
+def sortear_aportes(modelo: ModeloRenda, quantidade: int, horizonte: int,
+                    rng: np.random.Generator) -> List[Dict[int, Decimal]]:
+    """Sorteia `quantidade` sequências de renda como dicionários de aportes"""
+    vendeu = rng.random((quantidade, horizonte)) < modelo.probabilidade_mensal
+    valores = rng.lognormal(modelo.media_log, modelo.desvio_log, (quantidade, horizonte))
+    centavos = np.where(vendeu, np.rint(valores * 100), 0).astype(np.int64)
+    return [
+        {int(mes) + 1: para_reais(linha[mes]) for mes in np.flatnonzero(linha)}
+        for linha in centavos
+    ]
+
+
+def _simular_lote(calc: CalculadoraAmortizacao, modelo: ModeloRenda, quantidade: int,
+                  horizonte: int, semente: np.random.SeedSequence) -> Tuple[np.ndarray, np.ndarray]:
+    """Executa um lote: (parcelas, juros em centavos) de cada simulação"""
+    rng = np.random.default_rng(semente)
+    parcelas = np.empty(quantidade, dtype=np.int64)
+    juros = np.empty(quantidade, dtype=np.int64)
+    for i, aportes in enumerate(sortear_aportes(modelo, quantidade, horizonte, rng)):
+        resumo = calc.resumir(aportes)
+        parcelas[i] = resumo.parcelas
+        juros[i] = para_centavos(resumo.total_juros)
+    return parcelas, juros
+
+
+def simular(calc: CalculadoraAmortizacao, modelo: ModeloRenda,
+            simulacoes: int = 2000, semente: Optional[int] = None,
+            processos: Optional[int] = None, tamanho_lote: int = 250,
+            percentis: Sequence[int] = PERCENTIS_PADRAO) -> ResultadoMonteCarlo:
+    """
+    Roda o Monte Carlo e resume os resultados em percentis
+
+    Args:
+        calc: Calculadora do financiamento
+        modelo: Modelo de renda (ver ajustar_modelo)
+        simulacoes: Quantidade de cenários sorteados
+        semente: Semente do gerador (None: aleatória)
+        processos: Processos do pool (default: CPUs; 1 roda no próprio processo)
+        tamanho_lote: Simulações por tarefa enviada ao pool
+        percentis: Percentis reportados
+
+    Returns:
+        ResultadoMonteCarlo com prazo, data de quitação e economia por percentil
+    """
+    if simulacoes < 1:
+        raise ValueError("É preciso ao menos uma simulação")
+    base = calc.resumir()
+    horizonte = max(base.parcelas, 1)
+
+    lotes = [tamanho_lote] * (simulacoes // tamanho_lote)
+    if simulacoes % tamanho_lote:
+        lotes.append(simulacoes % tamanho_lote)
+    sementes = np.random.SeedSequence(semente).spawn(len(lotes))
+    argumentos = [(calc, modelo, qtd, horizonte, s) for qtd, s in zip(lotes, sementes)]
+
+    processos = processos or os.cpu_count() or 1
+    if processos == 1 or len(lotes) <= 1:
+        resultados = [_simular_lote(*args) for args in argumentos]
+    else:
+        with ProcessPoolExecutor(max_workers=processos) as pool:
+            resultados = list(pool.map(_simular_lote, *zip(*argumentos)))
+
+    parcelas = np.concatenate([p for p, _ in resultados])
+    juros = np.concatenate([j for _, j in resultados])
+
+    economia = para_centavos(base.total_juros) - juros
+    meses = {p: int(np.percentile(parcelas, p, method='nearest')) for p in percentis}
+    return ResultadoMonteCarlo(
+        simulacoes=len(parcelas),
+        meses=meses,
+        data_quitacao={p: calc.data_parcela(m - 1) for p, m in meses.items() if m > 0},
+        economia_juros={p: para_reais(int(np.percentile(economia, p, method='nearest'))) for p in percentis},
+    )
@@ -0,0 +1,347 @@
+"""
+Motor Vetorizado de Amortização (NumPy)
+
+Alternativa ao laço em Decimal de CalculadoraAmortizacao.gerar_plano_completo.
+Os valores monetários são tratados como inteiros em centavos e as colunas do
+plano (saldo, juros, principal...) são montadas como arrays NumPy.
+
+Para um único financiamento, a recorrência do saldo continua sendo um laço
+Python mês a mês (em inteiros); só a derivação das colunas é vetorizada.
+Para recalcular muitos financiamentos de uma vez, gerar_planos_em_lote avança
+todos os saldos juntos (um passo vetorizado por mês), aplicando o mesmo
+arredondamento ROUND_HALF_UP do motor original, centavo a centavo. Um
+financiamento do lote que não amortiza é retirado do lote e informado à
+parte; os demais seguem até quitar.
+"""
+
+from dataclasses import dataclass
+from decimal import Decimal
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from src.amortizacao import (
+    MODO_PRAZO, CalculadoraAmortizacao, FinanciamentoNaoAmortizavel, PlanoAmortizacao,
+)
+from src.centavos import para_centavos, para_reais
+
+
+def _tipo_seguro(saldo_max: int, num: int, den: int):
+    """Usa int64 quando 2*saldo*num + den cabe sem overflow; senão, inteiros Python"""
+    if 2 * saldo_max * num + den < 2 ** 62:
+        return np.int64
+    return object
+
+
+def calcular_colunas(saldo: int, num: int, den: int, parcela: int,
+                     aportes: Optional[Dict[int, int]] = None) -> Dict[str, np.ndarray]:
+    """
+    Calcula as colunas do plano de um único financiamento
+
+    A recorrência do saldo é um laço Python por mês (aritmética inteira
+    pura); só juros, principal e demais colunas são derivados em bloco pelo
+    NumPy. Para vetorizar de fato, use calcular_colunas_em_lote com vários
+    financiamentos.
+
+    Args:
+        saldo: Saldo devedor inicial em centavos
+        num, den: Taxa mensal como fração num/den
+        parcela: Parcela fixa em centavos
+        aportes: {numero_parcela: aporte_em_centavos}
+
+    Returns:
+        Dicionário {nome_coluna: array de centavos}
+
+    Raises:
+        FinanciamentoNaoAmortizavel: se em algum mês sem aporte juros >= parcela
+    """
+    aportes = aportes or {}
+    saldos = []
+    extras = []
+    dobro_den = 2 * den
+    numero = 1
+
+    while saldo > 1:
+        juros = (2 * saldo * num + den) // dobro_den
+        extra = aportes.get(numero, 0)
+        principal = parcela - juros
+        if extra == 0 and principal <= 0:
+            raise FinanciamentoNaoAmortizavel.em_centavos(numero, saldo, juros, parcela)
+        saldos.append(saldo)
+        extras.append(extra)
+        saldo = max(saldo - principal - extra, 0)
+        numero += 1
+
+    tipo = _tipo_seguro(max(saldos, default=0), num, den)
+    saldo_anterior = np.array(saldos, dtype=tipo)
+    amortizacao_extra = np.array(extras, dtype=tipo)
+    return _derivar_colunas(saldo_anterior, amortizacao_extra, num, den, parcela)
+
+
+def _derivar_colunas(saldo_anterior: np.ndarray, amortizacao_extra: np.ndarray,
+                     num: int, den: int, parcela: int) -> Dict[str, np.ndarray]:
+    """Deriva juros, principal e saldos a partir do saldo anterior de cada mês"""
+    juros = (2 * saldo_anterior * num + den) // (2 * den)
+    principal = parcela - juros
+    saldo_posterior = saldo_anterior - principal - amortizacao_extra
+
+    # Última parcela: quita o saldo restante (principal registrado sem o aporte)
+    quitou = saldo_posterior < 0
+    principal = np.where(quitou, saldo_anterior - amortizacao_extra, principal)
+    saldo_posterior = np.where(quitou, 0, saldo_posterior)
+
+    return {
+        'saldo_anterior': saldo_anterior,
+        'juros': juros,
+        'principal': principal,
+        'amortizacao_extra': amortizacao_extra,
+        'saldo_posterior': saldo_posterior,
+        'valor_parcela': parcela + amortizacao_extra,
+    }
+
+
+def _verificar_amortizacao(nao_amortiza: np.ndarray, numero, saldo: np.ndarray,
+                           juros: np.ndarray, parcela) -> None:
+    """Levanta FinanciamentoNaoAmortizavel para a primeira posição marcada do lote"""
+    if nao_amortiza.any():
+        i = int(np.argmax(nao_amortiza))
+        raise FinanciamentoNaoAmortizavel.em_centavos(
+            int(np.broadcast_to(numero, saldo.shape)[i]), int(saldo[i]), int(juros[i]),
+            int(np.broadcast_to(parcela, saldo.shape)[i]),
+        )
+
+
+def calcular_colunas_em_lote(saldos: Sequence[int], taxas: Sequence[Tuple[int, int]],
+                             parcelas: Sequence[int],
+                             aportes: Optional[Sequence[Optional[Dict[int, int]]]] = None
+                             ) -> Tuple[List[Optional[Dict[str, np.ndarray]]],
+                                        Dict[int, FinanciamentoNaoAmortizavel]]:
+    """
+    Calcula as colunas de vários financiamentos em paralelo
+
+    Todos os saldos avançam juntos: cada mês é um único passo vetorizado sobre
+    o lote, em vez de um laço Python por financiamento. O financiamento em
+    que a parcela não cobre os juros de um mês sem aporte sai do lote nesse
+    mês; os demais continuam.
+
+    Returns:
+        (colunas, falhas): dicionários de colunas na mesma ordem da entrada
+        (None para os que não amortizam) e {índice: FinanciamentoNaoAmortizavel}
+    """
+    qtd = len(saldos)
+    aportes = aportes or [None] * qtd
+    if qtd == 0:
+        return [], {}
+
+    nums = [n for n, _ in taxas]
+    dens = [d for _, d in taxas]
+    tipo = np.int64
+    for s, n, d in zip(saldos, nums, dens):
+        if _tipo_seguro(s, n, d) is object:
+            tipo = object
+            break
+
+    num = np.array(nums, dtype=tipo)
+    den = np.array(dens, dtype=tipo)
+    parcela = np.array(parcelas, dtype=tipo)
+    saldo = np.array(saldos, dtype=tipo)
+
+    # Matriz densa de aportes (lote x meses com aporte)
+    ultimo_mes = max((max(a) for a in aportes if a), default=0)
+    matriz_aportes = np.zeros((qtd, ultimo_mes + 1), dtype=tipo)
+    for i, ap in enumerate(aportes):
+        for numero, valor in (ap or {}).items():
+            if 1 <= numero <= ultimo_mes:
+                matriz_aportes[i, numero] = valor
+    zeros = np.zeros(qtd, dtype=tipo)
+
+    historico_saldo = []
+    historico_extra = []
+    falhas: Dict[int, FinanciamentoNaoAmortizavel] = {}
+    descartados = np.zeros(qtd, dtype=bool)  # Não amortizam: saem do lote
+    ativos = saldo > 1
+    numero = 1
+    while ativos.any():
+        extra = matriz_aportes[:, numero] if numero <= ultimo_mes else zeros
+        juros = (2 * saldo * num + den) // (2 * den)
+        principal = parcela - juros
+        nao_amortiza = ativos & (extra == 0) & (principal <= 0)
+        if nao_amortiza.any():
+            for i in np.flatnonzero(nao_amortiza):
+                falhas[int(i)] = FinanciamentoNaoAmortizavel.em_centavos(
+                    numero, int(saldo[i]), int(juros[i]), int(parcela[i]))
+            descartados |= nao_amortiza
+            ativos &= ~nao_amortiza
+        novo_saldo = np.maximum(saldo - principal - extra, 0)
+
+        historico_saldo.append(saldo)
+        historico_extra.append(extra)
+        saldo = np.where(ativos, novo_saldo, saldo)
+        ativos = (saldo > 1) & ~descartados
+        numero += 1
+
+    meses = len(historico_saldo)
+    if meses:
+        saldos_mes = np.stack(historico_saldo, axis=1)
+        extras_mes = np.stack(historico_extra, axis=1)
+    else:
+        saldos_mes = np.zeros((qtd, 0), dtype=tipo)
+        extras_mes = np.zeros((qtd, 0), dtype=tipo)
+
+    # Cada financiamento vai até o primeiro mês que começou sem saldo a pagar
+    em_aberto = saldos_mes > 1
+    tamanhos = np.where(em_aberto.all(axis=1), meses, em_aberto.argmin(axis=1))
+
+    resultado = []
+    for i in range(qtd):
+        if i in falhas:
+            resultado.append(None)
+            continue
+        n = int(tamanhos[i])
+        resultado.append(_derivar_colunas(
+            saldos_mes[i, :n], extras_mes[i, :n],
+            nums[i], dens[i], parcelas[i]
+        ))
+    return resultado, falhas
+
+
+def resumir_sufixos_em_lote(saldos: Sequence[int], numeros: Sequence[int],
+                            aportes: Sequence[int], num: int, den: int,
+                            parcela: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Totais de vários sufixos de um mesmo financiamento, em paralelo
+
+    Cada posição i parte do saldo no início da parcela numeros[i] (checkpoint
+    do plano base), aplica aportes[i] nessa parcela e segue sem aportes até
+    quitar. Só os totais são acumulados; nenhuma coluna é guardada.
+
+    Returns:
+        (meses, juros): arrays com a quantidade de parcelas do sufixo e o
+        total de juros do sufixo (centavos) de cada posição
+    """
+    tipo = _tipo_seguro(max(saldos, default=0), num, den)
+    saldo = np.array(saldos, dtype=tipo)
+    extra = np.array(aportes, dtype=tipo)
+    sem_aporte = np.zeros(len(saldo), dtype=tipo)
+    numero = np.asarray(numeros, dtype=np.int64)
+
+    meses = np.zeros(len(saldo), dtype=np.int64)
+    juros_total = np.zeros(len(saldo), dtype=tipo)
+    ativos = saldo > 1
+    while ativos.any():
+        juros = (2 * saldo * num + den) // (2 * den)
+        principal = parcela - juros
+        _verificar_amortizacao(ativos & (extra == 0) & (principal <= 0), numero + meses,
+                               saldo, juros, parcela)
+        novo_saldo = np.maximum(saldo - principal - extra, 0)
+
+        juros_total += np.where(ativos, juros, 0)
+        meses += ativos
+        saldo = np.where(ativos, novo_saldo, saldo)
+        extra = sem_aporte
+        ativos = saldo > 1
+
+    return meses, juros_total
+
+
+@dataclass
+class GradeSimulacao:
+    """Matriz de cenários (valor do aporte x parcela) de simular_grade"""
+    valores: List[float]
+    parcelas: List[int]
+    meses_economizados: np.ndarray       # [len(valores), len(parcelas)]
+    economia_juros_centavos: np.ndarray  # [len(valores), len(parcelas)]
+
+    def economia_juros(self, i: int, j: int) -> Decimal:
+        """Economia de juros (R$) do valor i aplicado na parcela j"""
+        return para_reais(self.economia_juros_centavos[i, j])
+
+    def registros(self) -> List[Dict]:
+        """Linhas {valor, parcela, meses, juros} (ex: para um DataFrame)"""
+        return [
+            {
+                'valor': valor,
+                'parcela': parcela,
+                'meses_economizados': int(self.meses_economizados[i, j]),
+                'economia_juros': float(self.economia_juros(i, j)),
+            }
+            for i, valor in enumerate(self.valores)
+            for j, parcela in enumerate(self.parcelas)
+        ]
+
+
+class CalculadoraAmortizacaoVetorizada(CalculadoraAmortizacao):
+    """
+    Calculadora com o mesmo contrato de CalculadoraAmortizacao, mas que gera
+    as colunas do plano com o motor em centavos/NumPy.
+
+    Se algum valor não for representável em centavos (ex: R$ 10,005), usa o
+    motor Decimal original para manter o resultado idêntico.
+    """
+
+    def _parametros_centavos(self, aportes: Dict[int, float]):
+        """Converte os parâmetros para centavos (ValueError se não for exato)"""
+        saldo, num, den, parcela = self._parametros_inteiros()
+        aportes_c = {
+            numero: para_centavos(valor)
+            for numero, valor in aportes.items()
+        }
+        return saldo, num, den, parcela, aportes_c
+
+    def gerar_colunas(self, aportes: Optional[Dict[int, float]] = None,
+                      modo: str = MODO_PRAZO) -> Dict[str, np.ndarray]:
+        """Gera apenas as colunas do plano, em centavos"""
+        if modo != MODO_PRAZO:
+            # Redução de parcela: a parcela muda a cada aporte (laço em centavos)
+            return super().gerar_colunas(aportes, modo)
+        saldo, num, den, parcela, aportes_c = self._parametros_centavos(aportes or {})
+        return calcular_colunas(saldo, num, den, parcela, aportes_c)
+
+
+def gerar_planos_em_lote(calculadoras: Sequence[CalculadoraAmortizacaoVetorizada],
+                         aportes: Optional[Sequence[Optional[Dict[int, float]]]] = None
+                         ) -> Tuple[List[Optional[PlanoAmortizacao]],
+                                    Dict[int, FinanciamentoNaoAmortizavel]]:
+    """
+    Gera os planos de vários financiamentos em um único passe vetorizado
+
+    Um financiamento cuja parcela não amortiza não interrompe o lote: fica
+    sem plano e o erro é informado em `falhas`.
+
+    Args:
+        calculadoras: Calculadoras (uma por financiamento)
+        aportes: Aportes de cada financiamento (mesma ordem), opcional
+
+    Returns:
+        (planos, falhas): PlanoAmortizacao na mesma ordem das calculadoras
+        (None para os que não amortizam) e {índice: FinanciamentoNaoAmortizavel}
+    """
+    aportes = aportes or [None] * len(calculadoras)
+    indices_lote = []
+    parametros = []
+    planos: List[Optional[PlanoAmortizacao]] = [None] * len(calculadoras)
+    falhas: Dict[int, FinanciamentoNaoAmortizavel] = {}
+
+    for i, (calc, ap) in enumerate(zip(calculadoras, aportes)):
+        try:
+            parametros.append(calc._parametros_centavos(ap or {}))
+            indices_lote.append(i)
+        except ValueError:
+            try:
+                planos[i] = calc._gerar_plano_decimal(ap or {})
+            except FinanciamentoNaoAmortizavel as erro:
+                falhas[i] = erro
+
+    colunas, falhas_lote = calcular_colunas_em_lote(
+        saldos=[p[0] for p in parametros],
+        taxas=[(p[1], p[2]) for p in parametros],
+        parcelas=[p[3] for p in parametros],
+        aportes=[p[4] for p in parametros],
+    )
+    for j, erro in falhas_lote.items():
+        falhas[indices_lote[j]] = erro
+    for i, cols in zip(indices_lote, colunas):
+        if cols is not None:
+            planos[i] = calculadoras[i]._montar_plano(cols)
+
+    return planos, dict(sorted(falhas.items()))
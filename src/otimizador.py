@@ -0,0 +1,123 @@
+"""
+Otimizador de Aportes
+
+Responde "tenho R$ X das revendas deste ano, em quais parcelas aplico?":
+dado um orçamento e as datas em que o dinheiro fica disponível, escolhe a
+distribuição dos aportes entre as parcelas que maximiza os juros economizados.
+
+Algoritmo: guloso com heap de ganhos marginais (avaliação preguiçosa). O
+orçamento é dividido em unidades de `passo` reais; a cada rodada a unidade vai
+para a parcela com maior economia de juros por real. Como adiantar um aporte
+nunca reduz a economia, cada disponibilidade só concorre na primeira parcela
+em que o dinheiro já está em mãos. Ganhos antigos no heap são apenas
+recalculados quando chegam ao topo, evitando reavaliar todas as parcelas a
+cada unidade alocada.
+"""
+
+import heapq
+from dataclasses import dataclass
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Dict, Optional, Sequence, Tuple, Union
+
+from src.amortizacao import CalculadoraAmortizacao
+from src.centavos import para_centavos, para_reais
+
+
+Momento = Union[int, date, datetime]  # Número da parcela ou data em que o valor fica disponível
+
+
+@dataclass
+class AlocacaoOtima:
+    """Resultado do otimizador de aportes"""
+    aportes: Dict[int, Decimal]  # {numero_parcela: valor}
+    total_alocado: Decimal
+    economia_juros: Decimal
+    meses_economizados: int
+
+
+def parcela_disponivel(calc: CalculadoraAmortizacao, momento: Momento) -> int:
+    """Primeira parcela (base 1) com vencimento na data ou depois dela"""
+    if isinstance(momento, int):
+        return max(momento, 1)
+    if not isinstance(momento, datetime):
+        momento = datetime(momento.year, momento.month, momento.day)
+    return calc.calendario.indice_do_vencimento(calc.data_inicio, momento) + 1
+
+
+def otimizar_aportes(calc: CalculadoraAmortizacao,
+                     disponibilidades: Sequence[Tuple[Momento, float]],
+                     orcamento: Optional[float] = None,
+                     passo: float = 50) -> AlocacaoOtima:
+    """
+    Distribui o orçamento entre as parcelas maximizando os juros economizados
+
+    Args:
+        calc: Calculadora do financiamento
+        disponibilidades: [(parcela ou data, valor disponível a partir dali)]
+        orcamento: Total a aplicar (default: soma das disponibilidades)
+        passo: Granularidade dos aportes em reais
+
+    Returns:
+        AlocacaoOtima com os aportes escolhidos e a economia obtida
+    """
+    disponivel: Dict[int, int] = {}
+    for momento, valor in disponibilidades:
+        numero = parcela_disponivel(calc, momento)
+        disponivel[numero] = disponivel.get(numero, 0) + para_centavos(valor)
+
+    restante = sum(disponivel.values()) if orcamento is None else para_centavos(orcamento)
+    unidade = para_centavos(passo)
+    if unidade <= 0:
+        raise ValueError("O passo deve ser positivo")
+
+    base = calc.resumir()
+    alocacao: Dict[int, int] = {}
+
+    def juros_com(extra: Dict[int, int]) -> Decimal:
+        return calc.resumir({n: para_reais(v) for n, v in extra.items()}).total_juros
+
+    def avaliar(numero: int) -> Tuple[int, Decimal]:
+        """Próxima unidade da parcela e juros do plano se ela for aplicada"""
+        valor = min(unidade, disponivel[numero], restante)
+        teste = dict(alocacao)
+        teste[numero] = teste.get(numero, 0) + valor
+        return valor, juros_com(teste)
+
+    juros_atual = base.total_juros
+    heap = []
+    for numero in disponivel:
+        if numero <= base.parcelas:  # Depois da quitação não há o que economizar
+            valor, juros = avaliar(numero)
+            heapq.heappush(heap, (-(juros_atual - juros) / valor, numero))
+
+    while heap and restante > 0:
+        _, numero = heapq.heappop(heap)
+        valor = min(unidade, disponivel[numero], restante)
+        if valor <= 0:
+            continue
+
+        # Ganho do topo pode estar desatualizado: recalcula antes de aceitar
+        valor, juros = avaliar(numero)
+        ganho = (juros_atual - juros) / valor
+        if ganho <= 0:
+            continue
+        if heap and ganho < -heap[0][0]:
+            heapq.heappush(heap, (-ganho, numero))
+            continue
+
+        alocacao[numero] = alocacao.get(numero, 0) + valor
+        disponivel[numero] -= valor
+        restante -= valor
+        juros_atual = juros
+        if disponivel[numero] > 0:
+            heapq.heappush(heap, (-ganho, numero))
+
+    aportes = {numero: para_reais(valor) for numero, valor in sorted(alocacao.items())}
+    final = calc.resumir(aportes)
+    return AlocacaoOtima(
+        aportes=aportes,
+        total_alocado=para_reais(sum(alocacao.values())),
+        economia_juros=base.total_juros - final.total_juros,
+        meses_economizados=base.parcelas - final.parcelas
+    )
@@ -0,0 +1,281 @@
+"""
+Formato Binário de Planos de Amortização
+
+Um plano vira um bloco de bytes compacto, lido sem desserialização:
+
+    cabeçalho (struct fixa, 144 bytes)
+    feriados locais do calendário   (int64, ordinal da data)
+    6 colunas do plano (COLUNAS)     (int64 em centavos, n valores cada)
+    3 somas de prefixo (COLUNAS_ACUMULADAS)  (int64, n + 1 valores cada)
+
+Todos os inteiros são little-endian e cada seção começa alinhada em 8
+bytes, então as colunas são memoryviews 'q' diretamente sobre o buffer
+(mmap de um arquivo, bytes vindos do banco...), sem cópia e sem recalcular.
+O cabeçalho guarda os parâmetros do financiamento, o modo (redução de
+prazo ou de parcela), um hash da curva de taxas e um hash dos aportes, para
+conferir se o plano persistido corresponde ao pedido.
+
+Planos com frações de centavo (backend 'decimal') não são representáveis.
+"""
+
+import hashlib
+import mmap
+import os
+import struct
+import sys
+import tempfile
+from array import array
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from pathlib import Path
+from typing import Dict, Optional, Union
+
+from src.amortizacao import COLUNAS, COLUNAS_ACUMULADAS, MODO_PARCELA, MODO_PRAZO, PlanoAmortizacao
+from src.calendario import Calendario
+from src.centavos import para_centavos, para_reais
+from src.curva_taxas import CurvaTaxas
+
+
+MAGICO = b'FPLN'
+VERSAO = 2
+EXTENSAO = '.plano'
+
+# magico, versao, flags, quantidade, saldo, parcela, data_inicio (µs desde a época),
+# feriados locais, taxa da parcela 1 (texto Decimal), hash da curva, hash dos aportes
+_CABECALHO = struct.Struct('<4sHHqqqqq32s32s32s')
+_FLAG_DIA_UTIL = 1
+_FLAG_MODO_PARCELA = 2
+_FLAG_TAXA_VARIAVEL = 4
+_EPOCA = datetime(1970, 1, 1)
+_MICROSSEGUNDO = timedelta(microseconds=1)
+
+
+@dataclass(frozen=True)
+class CabecalhoPlano:
+    """Parâmetros gravados no cabeçalho do plano binário"""
+    quantidade_parcelas: int
+    saldo_inicial: Decimal
+    taxa_mensal: Decimal
+    parcela_fixa: Decimal
+    data_inicio: datetime
+    calendario: Calendario
+    modo: str
+    taxa_variavel: bool   # Curva com mais de uma taxa (taxa_mensal é a da parcela 1)
+    hash_curva: bytes
+    hash_aportes: bytes
+
+
+def hash_aportes(aportes: Optional[Dict[int, float]] = None) -> bytes:
+    """SHA-256 dos aportes em centavos (aportes zerados são ignorados)"""
+    texto = ';'.join(
+        f"{numero}:{centavos}"
+        for numero, centavos in sorted((n, para_centavos(v)) for n, v in (aportes or {}).items())
+        if centavos
+    )
+    return hashlib.sha256(texto.encode()).digest()
+
+
+def hash_curva(curva: CurvaTaxas) -> bytes:
+    """SHA-256 das taxas exatas (num/den) de cada parcela da curva"""
+    return hashlib.sha256(repr(curva.fracoes).encode()).digest()
+
+
+def _curva_do_plano(plano: PlanoAmortizacao, curva: Optional[CurvaTaxas]) -> CurvaTaxas:
+    """Curva informada ou, com taxa fixa, a curva de taxa única do plano"""
+    return curva if curva is not None else CurvaTaxas([plano.taxa_mensal])
+
+
+def _int64(valores) -> bytes:
+    try:
+        dados = array('q', (int(v) for v in valores))
+    except OverflowError as erro:
+        raise ValueError("Valor fora do intervalo int64") from erro
+    if sys.byteorder != 'little':
+        dados.byteswap()
+    return dados.tobytes()
+
+
+def plano_para_bytes(plano: PlanoAmortizacao, aportes: Optional[Dict[int, float]] = None,
+                     modo: str = MODO_PRAZO, curva: Optional[CurvaTaxas] = None) -> bytes:
+    """
+    Serializa o plano no formato binário
+
+    Args:
+        plano: Plano a gravar
+        aportes: Aportes usados para gerar o plano (entram no hash do cabeçalho)
+        modo: Modo usado para gerar o plano (MODO_PRAZO ou MODO_PARCELA)
+        curva: Curva de taxas do plano (None: taxa fixa, plano.taxa_mensal)
+
+    Raises:
+        ValueError: se algum valor tiver fração de centavo ou não couber em int64
+    """
+    if modo not in (MODO_PRAZO, MODO_PARCELA):
+        raise ValueError(f"Modo desconhecido: {modo}")
+    curva = _curva_do_plano(plano, curva)
+    converter = int if plano.em_centavos else para_centavos
+    colunas = {nome: [converter(v) for v in plano.colunas[nome]] for nome in COLUNAS}
+    acumulados = plano.acumulados if plano.em_centavos else {
+        nome: [para_centavos(v) for v in plano.acumulados[nome]] for nome in COLUNAS_ACUMULADAS
+    }
+
+    taxa = str(plano.taxa_mensal).encode('ascii')
+    if len(taxa) > 32:
+        raise ValueError(f"Taxa {plano.taxa_mensal} longa demais para o cabeçalho")
+    calendario = plano.calendario
+    feriados = sorted(dia.toordinal() for dia in calendario.feriados_locais)
+    flags = ((_FLAG_DIA_UTIL if calendario.dia_util else 0)
+             | (_FLAG_MODO_PARCELA if modo == MODO_PARCELA else 0)
+             | (_FLAG_TAXA_VARIAVEL if len(curva) > 1 else 0))
+    try:
+        cabecalho = _CABECALHO.pack(
+            MAGICO, VERSAO, flags,
+            plano.quantidade_parcelas,
+            para_centavos(plano.saldo_inicial),
+            para_centavos(plano.parcela_fixa),
+            (plano.data_inicio - _EPOCA) // _MICROSSEGUNDO,
+            len(feriados),
+            taxa,
+            hash_curva(curva),
+            hash_aportes(aportes),
+        )
+    except struct.error as erro:
+        raise ValueError(f"Plano não representável no formato binário: {erro}") from erro
+
+    partes = [cabecalho, _int64(feriados)]
+    partes += [_int64(colunas[nome]) for nome in COLUNAS]
+    partes += [_int64(acumulados[nome]) for nome in COLUNAS_ACUMULADAS]
+    return b''.join(partes)
+
+
+def ler_cabecalho(buffer) -> CabecalhoPlano:
+    """
+    Lê só o cabeçalho de um plano binário
+
+    Raises:
+        ValueError: se o buffer não for um plano binário desta versão
+    """
+    visao = memoryview(buffer).cast('B')
+    if len(visao) < _CABECALHO.size:
+        raise ValueError("Buffer menor que o cabeçalho do plano")
+    (magico, versao, flags, quantidade, saldo, parcela, data_inicio,
+     qtd_feriados, taxa, hash_cv, hash_ap) = _CABECALHO.unpack_from(visao)
+    if magico != MAGICO:
+        raise ValueError("Não é um plano binário")
+    if versao != VERSAO:
+        raise ValueError(f"Versão do plano binário não suportada: {versao}")
+    tamanho = _CABECALHO.size + 8 * (qtd_feriados + len(COLUNAS) * quantidade
+                                     + len(COLUNAS_ACUMULADAS) * (quantidade + 1))
+    if len(visao) != tamanho:
+        raise ValueError(f"Plano binário truncado ou corrompido ({len(visao)} != {tamanho} bytes)")
+
+    feriados = visao[_CABECALHO.size:_CABECALHO.size + 8 * qtd_feriados].cast('q')
+    return CabecalhoPlano(
+        quantidade_parcelas=quantidade,
+        saldo_inicial=para_reais(saldo),
+        taxa_mensal=Decimal(taxa.rstrip(b'\0').decode('ascii')),
+        parcela_fixa=para_reais(parcela),
+        data_inicio=_EPOCA + data_inicio * _MICROSSEGUNDO,
+        calendario=Calendario(
+            dia_util=bool(flags & _FLAG_DIA_UTIL),
+            feriados_locais=frozenset(date.fromordinal(d) for d in feriados),
+        ),
+        modo=MODO_PARCELA if flags & _FLAG_MODO_PARCELA else MODO_PRAZO,
+        taxa_variavel=bool(flags & _FLAG_TAXA_VARIAVEL),
+        hash_curva=hash_cv,
+        hash_aportes=hash_ap,
+    )
+
+
+def plano_de_buffer(buffer, aportes: Optional[Dict[int, float]] = None,
+                    modo: Optional[str] = None,
+                    curva: Optional[CurvaTaxas] = None) -> PlanoAmortizacao:
+    """
+    Reconstrói o plano sobre o buffer, sem copiar as colunas
+
+    As colunas do plano são memoryviews somente leitura (se o buffer for)
+    sobre o próprio buffer, que fica vivo enquanto o plano existir.
+
+    Args:
+        buffer: bytes, mmap ou qualquer objeto com protocolo de buffer
+        aportes: Se informado, confere com o hash gravado no cabeçalho
+        modo: Se informado, confere com o modo gravado no cabeçalho
+        curva: Se informada, confere com o hash da curva gravado no cabeçalho
+               (para taxa fixa, CurvaTaxas([taxa]))
+
+    Raises:
+        ValueError: se o buffer for inválido ou aportes, modo ou curva não conferirem
+    """
+    if sys.byteorder != 'little':
+        raise ValueError("Leitura sem cópia exige plataforma little-endian")
+    cabecalho = ler_cabecalho(buffer)
+    if aportes is not None and hash_aportes(aportes) != cabecalho.hash_aportes:
+        raise ValueError("Plano gravado com outros aportes")
+    if modo is not None and modo != cabecalho.modo:
+        raise ValueError(f"Plano gravado no modo '{cabecalho.modo}', não '{modo}'")
+    if curva is not None and hash_curva(curva) != cabecalho.hash_curva:
+        raise ValueError("Plano gravado com outra curva de taxas")
+
+    visao = memoryview(buffer).cast('B')
+    n = cabecalho.quantidade_parcelas
+    inicio = _CABECALHO.size + 8 * len(cabecalho.calendario.feriados_locais)
+
+    def fatia(tamanho: int) -> memoryview:
+        nonlocal inicio
+        coluna = visao[inicio:inicio + 8 * tamanho].cast('q')
+        inicio += 8 * tamanho
+        return coluna
+
+    colunas = {nome: fatia(n) for nome in COLUNAS}
+    acumulados = {nome: fatia(n + 1) for nome in COLUNAS_ACUMULADAS}
+    return PlanoAmortizacao(
+        saldo_inicial=cabecalho.saldo_inicial,
+        taxa_mensal=cabecalho.taxa_mensal,
+        parcela_fixa=cabecalho.parcela_fixa,
+        data_inicio=cabecalho.data_inicio,
+        colunas=colunas,
+        em_centavos=True,
+        calendario=cabecalho.calendario,
+        acumulados=acumulados,
+    )
+
+
+def salvar_plano(plano: PlanoAmortizacao, caminho: Union[str, Path],
+                 aportes: Optional[Dict[int, float]] = None, modo: str = MODO_PRAZO,
+                 curva: Optional[CurvaTaxas] = None) -> Path:
+    """
+    Grava o plano em arquivo (escrita atômica: leitores nunca veem arquivo pela metade)
+
+    Returns:
+        Caminho do arquivo gravado
+    """
+    caminho = Path(caminho)
+    dados = plano_para_bytes(plano, aportes, modo, curva)
+    caminho.parent.mkdir(parents=True, exist_ok=True)
+    descritor, temporario = tempfile.mkstemp(dir=caminho.parent, suffix=EXTENSAO + '.tmp')
+    try:
+        with os.fdopen(descritor, 'wb') as arquivo:
+            arquivo.write(dados)
+        os.replace(temporario, caminho)
+    except BaseException:
+        os.unlink(temporario)
+        raise
+    return caminho
+
+
+def carregar_plano(caminho: Union[str, Path],
+                   aportes: Optional[Dict[int, float]] = None, modo: Optional[str] = None,
+                   curva: Optional[CurvaTaxas] = None) -> PlanoAmortizacao:
+    """
+    Abre o plano via mmap (somente leitura), sem cópia nem recálculo
+
+    O mapeamento continua válido depois que o arquivo é fechado e é liberado
+    junto com o plano.
+
+    Raises:
+        ValueError: se o arquivo for inválido ou aportes, modo ou curva não
+            conferirem (ver plano_de_buffer)
+    """
+    with open(caminho, 'rb') as arquivo:
+        mapa = mmap.mmap(arquivo.fileno(), 0, access=mmap.ACCESS_READ)
+    return plano_de_buffer(mapa, aportes, modo, curva)
@@ -0,0 +1,227 @@
+"""
+Pool de Conexões SQLite
+
+Abrir uma conexão SQLite custa bem mais que a maioria das consultas do
+sistema (um resumo de financiamento fazia sete connect/close). O pool mantém
+uma conexão por thread, aberta na primeira chamada e reutilizada depois:
+
+- conexões SQLite não devem ser compartilhadas entre threads, então cada
+  thread (threadpool do FastAPI, threads de script do Streamlit) tem a sua;
+- os PRAGMAs do PerfilDurabilidade rodam uma única vez, ao abrir a conexão;
+- conexões de threads já encerradas (o Streamlit cria uma thread por
+  execução do script) são fechadas pelo pool na próxima abertura (ou
+  consulta às estatísticas), então o número de conexões acompanha o de
+  threads vivas;
+- uma operação que falha desfaz na hora a transação que deixou aberta
+  (repetir_se_ocupado chama o desfazer() do pool), então a trava de escrita
+  não fica presa numa thread ociosa; obter() ainda desfaz qualquer sobra,
+  como rede de segurança para quem usa a conexão diretamente.
+
+Dashboard e API escrevem no mesmo arquivo ao mesmo tempo. O perfil padrão
+usa WAL (leitores não bloqueiam o escritor e vice-versa), synchronous=NORMAL
+(sem fsync a cada commit; em WAL uma queda de energia perde no máximo as
+últimas transações, sem corromper o banco) e busy_timeout. Se ainda assim o
+banco estiver ocupado, repetir_se_ocupado refaz a operação com espera
+exponencial.
+"""
+
+import random
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from functools import wraps
+from pathlib import Path
+from typing import Dict, Tuple
+
+
+@dataclass(frozen=True)
+class PerfilDurabilidade:
+    """
+    PRAGMAs de cada conexão e política de novas tentativas com o banco ocupado
+
+    Args:
+        journal_mode: 'WAL' (concorrência) ou 'DELETE' (journal de rollback padrão)
+        synchronous: 'NORMAL' (fsync só nos checkpoints do WAL) ou 'FULL' (a cada commit)
+        mmap_size: Bytes do arquivo lidos via mmap (0 desliga)
+        cache_size_kib: Cache de páginas por conexão, em KiB
+        busy_timeout_ms: Quanto o SQLite espera por uma trava antes de desistir
+        tentativas: Execuções da operação quando o banco continua ocupado
+        espera_inicial: Primeira espera entre tentativas, em segundos (dobra a cada vez)
+        espera_maxima: Limite de cada espera, em segundos
+    """
+    journal_mode: str = 'WAL'
+    synchronous: str = 'NORMAL'
+    mmap_size: int = 64 * 1024 * 1024
+    cache_size_kib: int = 8000
+    busy_timeout_ms: int = 5000
+    tentativas: int = 5
+    espera_inicial: float = 0.05
+    espera_maxima: float = 1.0
+
+    def __post_init__(self):
+        if self.journal_mode.upper() not in ('WAL', 'DELETE', 'TRUNCATE', 'PERSIST', 'MEMORY'):
+            raise ValueError(f"journal_mode desconhecido: {self.journal_mode}")
+        if self.synchronous.upper() not in ('OFF', 'NORMAL', 'FULL', 'EXTRA'):
+            raise ValueError(f"synchronous desconhecido: {self.synchronous}")
+        if self.tentativas < 1:
+            raise ValueError("É preciso ao menos uma tentativa")
+
+    def pragmas(self) -> Tuple[str, ...]:
+        """PRAGMAs na ordem de execução (busy_timeout antes de trocar o journal)"""
+        return (
+            f"PRAGMA busy_timeout = {int(self.busy_timeout_ms)}",
+            f"PRAGMA journal_mode = {self.journal_mode}",
+            f"PRAGMA synchronous = {self.synchronous}",
+            f"PRAGMA mmap_size = {int(self.mmap_size)}",
+            f"PRAGMA cache_size = {-int(self.cache_size_kib)}",
+            "PRAGMA temp_store = MEMORY",
+        )
+
+    def espera(self, tentativa: int) -> float:
+        """Espera antes da próxima tentativa (exponencial, com variação aleatória)"""
+        base = min(self.espera_inicial * 2 ** tentativa, self.espera_maxima)
+        return base * random.uniform(0.5, 1.0)
+
+
+PERFIL_CONCORRENTE = PerfilDurabilidade()
+# Durabilidade máxima: fsync a cada commit, ao custo de escritas mais lentas
+PERFIL_SEGURO = PerfilDurabilidade(synchronous='FULL')
+
+
+def banco_ocupado(erro: sqlite3.Error) -> bool:
+    """Se o erro é SQLITE_BUSY/SQLITE_LOCKED (vale a pena tentar de novo)"""
+    nome = getattr(erro, 'sqlite_errorname', '')
+    if nome:
+        return nome.startswith(('SQLITE_BUSY', 'SQLITE_LOCKED'))
+    mensagem = str(erro)
+    return 'database is locked' in mensagem or 'database is busy' in mensagem
+
+
+def repetir_se_ocupado(metodo):
+    """
+    Refaz o método quando o banco está ocupado, com espera exponencial
+
+    Para métodos de objetos com atributo `pool` (PoolConexoes) e método
+    `_desfazer_falha()`. Cada método é uma transação completa: se falhar, o
+    que ficou pela metade é desfeito na hora (liberando a trava de escrita),
+    antes de propagar o erro ou de esperar pela nova tentativa.
+    """
+    @wraps(metodo)
+    def envoltorio(self, *args, **kwargs):
+        perfil = self.pool.perfil
+        for tentativa in range(perfil.tentativas):
+            try:
+                return metodo(self, *args, **kwargs)
+            except sqlite3.OperationalError as erro:
+                self._desfazer_falha()
+                if not banco_ocupado(erro) or tentativa == perfil.tentativas - 1:
+                    raise
+                self.pool.registrar_retentativa()
+                time.sleep(perfil.espera(tentativa))
+            except BaseException:
+                self._desfazer_falha()
+                raise
+    return envoltorio
+
+
+@dataclass(frozen=True)
+class EstatisticasPool:
+    """Contadores do pool desde a criação (ou desde o último fechar())"""
+    abertas: int       # Conexões vivas no pool
+    criadas: int       # Conexões abertas (uma por thread)
+    reutilizadas: int  # Pedidos atendidos por uma conexão já aberta
+    descartadas: int   # Conexões de threads encerradas, fechadas pelo pool
+    retentativas: int = 0  # Operações refeitas por banco ocupado
+
+
+class PoolConexoes:
+    """Uma conexão SQLite por thread, reutilizada entre as chamadas"""
+
+    def __init__(self, db_path: Path, perfil: PerfilDurabilidade = PERFIL_CONCORRENTE):
+        self.db_path = db_path
+        self.perfil = perfil
+        self.pragmas = perfil.pragmas()
+        self._local = threading.local()
+        self._trava = threading.Lock()
+        self._conexoes: Dict[int, Tuple[threading.Thread, sqlite3.Connection]] = {}
+        self._geracao = 0  # Muda a cada fechar(): conexões antigas deixam de valer
+        self._criadas = self._reutilizadas = self._descartadas = self._retentativas = 0
+
+    def _abrir(self) -> sqlite3.Connection:
+        # check_same_thread=False só para o pool poder fechar conexões de
+        # threads encerradas; cada conexão é usada apenas pela sua thread
+        conn = sqlite3.connect(str(self.db_path), check_same_thread=False,
+                               timeout=self.perfil.busy_timeout_ms / 1000)
+        conn.row_factory = sqlite3.Row  # Permite acessar colunas por nome
+        try:
+            for pragma in self.pragmas:
+                conn.execute(pragma)
+        except BaseException:
+            conn.close()  # Ex.: banco travado ao ativar o WAL; a nova tentativa abre outra
+            raise
+        return conn
+
+    def obter(self) -> sqlite3.Connection:
+        """Conexão da thread atual (aberta na primeira chamada)"""
+        local = self._local
+        if getattr(local, 'geracao', None) == self._geracao:
+            conn = local.conexao
+            if conn.in_transaction:
+                conn.rollback()  # Sobra de quem usou a conexão direto e não confirmou
+            with self._trava:
+                self._reutilizadas += 1
+            return conn
+
+        conn = self._abrir()
+        thread = threading.current_thread()
+        with self._trava:
+            self._descartar_threads_encerradas()
+            self._conexoes[id(conn)] = (thread, conn)
+            self._criadas += 1
+            local.conexao, local.geracao = conn, self._geracao
+        return conn
+
+    def _descartar_threads_encerradas(self):
+        """Fecha as conexões cujas threads já terminaram (chamado com a trava)"""
+        for chave, (thread, conn) in list(self._conexoes.items()):
+            if not thread.is_alive():
+                conn.close()
+                del self._conexoes[chave]
+                self._descartadas += 1
+
+    def desfazer(self):
+        """Desfaz a transação pendente da conexão desta thread, se houver"""
+        local = self._local
+        if getattr(local, 'geracao', None) == self._geracao and local.conexao.in_transaction:
+            local.conexao.rollback()
+
+    def registrar_retentativa(self):
+        with self._trava:
+            self._retentativas += 1
+
+    def estatisticas(self) -> EstatisticasPool:
+        """Contadores atuais (descarta antes as conexões de threads encerradas)"""
+        with self._trava:
+            self._descartar_threads_encerradas()
+            return EstatisticasPool(
+                abertas=len(self._conexoes),
+                criadas=self._criadas,
+                reutilizadas=self._reutilizadas,
+                descartadas=self._descartadas,
+                retentativas=self._retentativas,
+            )
+
+    def fechar(self):
+        """
+        Fecha todas as conexões e zera as estatísticas
+
+        O pool continua utilizável: a próxima chamada de cada thread abre
+        uma conexão nova.
+        """
+        with self._trava:
+            for _, conn in self._conexoes.values():
+                conn.close()
+            self._conexoes.clear()
+            self._geracao += 1
+            self._criadas = self._reutilizadas = self._descartadas = self._retentativas = 0
@@ -0,0 +1,70 @@
+"""
+Análise de Sensibilidade do Plano
+
+Derivadas do plano calculadas em um único passe sobre o cronograma, sem
+re-simular. Com taxa r_n na parcela n e fator acumulado F_n = Π(1 + r_j):
+
+- Diferenciação direta (forward mode) do saldo em relação à taxa:
+      dS_{n+1} = dS_n (1 + r_n) + S_n   =>   dS_{n+1} = F_n Σ_{j<=n} S_j / F_j
+  e d(juros)/d(taxa) = Σ (S_n + r_n dS_n), com o número de parcelas fixo.
+
+- Um real a menos de saldo após a parcela k vira F_N / F_k reais a menos no
+  fim do plano: a última parcela encolhe nesse valor, então os juros caem
+  F_N / F_k - 1 e o prazo cai (F_N / F_k) / parcela meses.
+
+São derivadas (efeito marginal): para variações grandes, use o motor exato.
+"""
+
+from dataclasses import dataclass
+from decimal import Decimal
+from typing import Sequence
+
+import numpy as np
+
+
+@dataclass
+class Sensibilidades:
+    """Efeitos marginais do plano (índice [k-1] = aporte na parcela k)"""
+    juros_por_taxa: Decimal        # d(total_juros)/d(taxa) em reais por 1,0 de taxa mensal
+    economia_por_real: np.ndarray  # Juros economizados por R$ 1 de aporte na parcela k
+    prazo_por_real: np.ndarray     # d(prazo)/d(aporte) em meses por real (negativo)
+
+    def juros_por_ponto_percentual(self) -> Decimal:
+        """Juros a mais se a taxa mensal subir 0,01 (1 p.p.)"""
+        return (self.juros_por_taxa / 100).quantize(Decimal('0.01'))
+
+    def custo_de_adiar(self) -> np.ndarray:
+        """Economia por real perdida ao adiar o aporte da parcela k para k+1"""
+        return -np.diff(self.economia_por_real, append=0.0)
+
+
+def calcular_sensibilidades(saldos_anteriores: Sequence[float], taxas: Sequence[float],
+                            parcela: float) -> Sensibilidades:
+    """
+    Sensibilidades a partir do cronograma exato
+
+    Args:
+        saldos_anteriores: Saldo no início de cada parcela, em centavos
+        taxas: Taxa mensal de cada parcela (mesmo tamanho)
+        parcela: Parcela fixa em centavos
+
+    Returns:
+        Sensibilidades do plano
+    """
+    saldos = np.asarray(saldos_anteriores, dtype=float)
+    taxas = np.asarray(taxas, dtype=float)
+    if not len(saldos):
+        vazio = np.zeros(0)
+        return Sensibilidades(Decimal('0.00'), vazio, vazio)
+
+    fator = np.cumprod(1 + taxas)  # F_n
+    # dS_n (derivada do saldo no início da parcela n): 0 na primeira parcela
+    derivada_saldo = np.concatenate(([0.0], fator[:-1] * np.cumsum(saldos / fator)[:-1]))
+    juros_por_taxa = float(np.sum(saldos + taxas * derivada_saldo)) / 100
+
+    crescimento = fator[-1] / fator  # F_N / F_k
+    return Sensibilidades(
+        juros_por_taxa=Decimal(str(round(juros_por_taxa, 2))),
+        economia_por_real=crescimento - 1,
+        prazo_por_real=-100 * crescimento / parcela if parcela > 0 else np.zeros_like(crescimento),
+    )
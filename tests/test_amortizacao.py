@@ -6,11 +6,15 @@ import sys
 from pathlib import Path
 from decimal import Decimal
 from datetime import datetime
+from itertools import islice
 
 # Adiciona src ao path
 sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
 
-from src.amortizacao import CalculadoraAmortizacao, PlanoAmortizacao
+from src.amortizacao import (
+    CalculadoraAmortizacao, PlanoAmortizacao, BACKEND_DECIMAL, MODO_PARCELA,
+    FinanciamentoNaoAmortizavel, info_cache_base, limpar_cache_base,
+)
 
 
 def test_calculo_juros():
@@ -66,6 +70,247 @@ def test_simulacao_aporte():
     print(f"✓ Teste simulação aporte: PASSOU (economia de {meses} meses)")
 
 
+def test_backend_centavos_igual_decimal():
+    """Testa se o backend em centavos reproduz o laço em Decimal"""
+    inicio = datetime(2026, 2, 3)
+    cenarios = [
+        (15000, 0.012, 400, {3: 500, 7: 1000}),
+        (250000, 0.0079, 2100, {12: 10000.55}),
+        (5000, 0.012, 400, {2: 10000}),
+        (1000.005, 0.01, 100, None),  # Fração de centavo: cai no laço Decimal
+    ]
+    for saldo, taxa, parcela, aportes in cenarios:
+        plano_c = CalculadoraAmortizacao(saldo, taxa, parcela, inicio).gerar_plano_completo(aportes)
+        plano_d = CalculadoraAmortizacao(
+            saldo, taxa, parcela, inicio, backend=BACKEND_DECIMAL
+        ).gerar_plano_completo(aportes)
+        assert plano_c.parcelas == plano_d.parcelas, f"Planos diferem para {saldo}/{taxa}/{parcela}"
+    print("✓ Teste backend centavos igual Decimal: PASSOU")
+
+
+def test_plano_colunar():
+    """Testa o armazenamento colunar e as parcelas criadas sob demanda"""
+    calc = CalculadoraAmortizacao(15000, 0.012, 400, datetime(2026, 2, 3))
+    plano = calc.gerar_plano_completo({3: 500, 7: 1000})
+    
+    assert all(len(plano.colunas[nome]) == len(plano.parcelas) for nome in plano.colunas)
+    assert not hasattr(plano.parcelas[0], '__dict__'), "Parcela deve usar __slots__"
+    
+    parcelas = list(plano.parcelas)
+    assert plano.parcelas[-1] == parcelas[-1]
+    assert plano.parcelas[2:4] == parcelas[2:4]
+    assert plano.parcelas[2].amortizacao_extra == Decimal('500.00')
+    assert plano.total_juros_pago == sum(p.juros for p in parcelas)
+    assert plano.total_amortizacao_extra == Decimal('1500.00')
+    print("✓ Teste plano colunar: PASSOU")
+
+
+def test_iter_parcelas_e_resumo():
+    """Testa o modo gerador e o resumo sem parcelas"""
+    calc = CalculadoraAmortizacao(15000, 0.012, 400, datetime(2026, 2, 3))
+    aportes = {3: 500, 7: 1000}
+    plano = calc.gerar_plano_completo(aportes)
+    
+    primeiras = list(islice(calc.iter_parcelas(aportes), 12))
+    assert primeiras == plano.parcelas[:12], "iter_parcelas deve seguir o plano completo"
+    
+    resumo = calc.resumir(aportes)
+    assert resumo.parcelas == len(plano.parcelas)
+    assert resumo.total_juros == plano.total_juros_pago
+    assert resumo.total_amortizacao_extra == plano.total_amortizacao_extra
+    assert resumo.data_quitacao == plano.parcelas[-1].data
+    
+    # Fração de centavo: mesmo contrato via laço em Decimal
+    calc_decimal = CalculadoraAmortizacao(1000.005, 0.01, 100, datetime(2026, 2, 3))
+    assert list(calc_decimal.iter_parcelas()) == calc_decimal.gerar_plano_completo().parcelas
+    assert calc_decimal.resumir().parcelas == len(calc_decimal.gerar_plano_completo().parcelas)
+    print("✓ Teste iter_parcelas e resumo: PASSOU")
+
+
+def test_continuar_plano_reaproveita_prefixo():
+    """Testa a re-simulação incremental a partir do checkpoint"""
+    calc = CalculadoraAmortizacao(15000, 0.012, 400, datetime(2026, 2, 3))
+    plano_base = calc.gerar_plano_completo({3: 500})
+    
+    # Usuário edita um aporte tardio: só o sufixo a partir da parcela 7 muda
+    novos_aportes = {3: 500, 7: 1000}
+    plano = calc.continuar_plano(plano_base, 7, novos_aportes)
+    esperado = calc.gerar_plano_completo(novos_aportes)
+    assert plano.parcelas == esperado.parcelas
+    assert plano.total_juros_pago == esperado.total_juros_pago
+    
+    # Aporte depois da quitação não altera o plano
+    assert calc.continuar_plano(plano_base, 500, {3: 500, 500: 100}).parcelas == plano_base.parcelas
+    
+    # simular_aporte com checkpoint == comparação de dois planos completos
+    for valor, parcela in [(500, 3), (300, 5), (20000, 2), (100, 51), (100, 80)]:
+        sem = calc.gerar_plano_completo()
+        com = calc.gerar_plano_completo({parcela: valor})
+        assert calc.simular_aporte(valor, parcela) == (
+            len(sem.parcelas) - len(com.parcelas),
+            sem.total_juros_pago - com.total_juros_pago
+        )
+    
+    # resumir com aportes também parte do plano base em cache
+    for aportes in ({40: 800}, {0: 100, 12: 300}, {12: 300, 500: 100}, {500: 100}, {1: 20000}):
+        plano = calc.gerar_plano_completo(aportes)
+        resumo = calc.resumir(aportes)
+        assert (resumo.parcelas, resumo.total_juros, resumo.total_amortizacao_extra) == (
+            len(plano.parcelas), plano.total_juros_pago, plano.total_amortizacao_extra
+        )
+    print("✓ Teste continuar plano: PASSOU")
+
+
+def test_cache_plano_base():
+    """Testa o cache LRU do plano sem aportes"""
+    limpar_cache_base()
+    calc = CalculadoraAmortizacao(15000, 0.012, 400, datetime(2026, 2, 3))
+    
+    plano_1 = calc.gerar_plano_completo()
+    calc.simular_aporte(500, 3)
+    calc.simular_aporte(300, 5)
+    plano_2 = CalculadoraAmortizacao(15000, 0.012, 400, datetime(2027, 1, 1)).gerar_plano_completo()
+    
+    info = info_cache_base()['planos']
+    assert info['misses'] == 1 and info['hits'] == 3, f"Cache inesperado: {info}"
+    assert plano_1.colunas['juros'] is plano_2.colunas['juros'], "Colunas devem ser compartilhadas"
+    assert plano_2.parcelas[0].data == datetime(2027, 1, 1)
+    
+    calc.resumir()
+    calc.resumir()
+    assert info_cache_base()['resumos']['hits'] == 1
+    
+    # Colunas compartilhadas são somente leitura
+    try:
+        plano_1.colunas['juros'][0] = 0
+        assert False, "Coluna do cache não pode ser alterada"
+    except TypeError:
+        pass
+    print("✓ Teste cache plano base: PASSOU")
+
+
+def test_simular_grade():
+    """Testa se a grade vetorizada reproduz simular_aporte célula a célula"""
+    valores = [0, 100, 300.5, 1000, 20000]
+    parcelas = [0, 1, 5, 30, 2000]  # Inclui parcelas fora do plano
+    for saldo, taxa, parcela in [(15000, 0.012, 400), (15000, 0.011000000000000001, 400), (1000.005, 0.01, 100)]:
+        calc = CalculadoraAmortizacao(saldo, taxa, parcela, datetime(2026, 2, 3))
+        grade = calc.simular_grade(valores, parcelas)
+        
+        assert grade.meses_economizados.shape == (len(valores), len(parcelas))
+        for i, valor in enumerate(valores):
+            for j, numero in enumerate(parcelas):
+                meses, economia = calc.simular_aporte(valor, numero)
+                assert grade.meses_economizados[i, j] == meses, f"Meses diferem em ({valor}, {numero})"
+                assert grade.economia_juros(i, j) == economia, f"Juros diferem em ({valor}, {numero})"
+    print("✓ Teste grade de simulações: PASSOU")
+
+
+def test_reducao_de_parcela():
+    """Testa o modo redução de parcela e a comparação dos dois modos"""
+    inicio = datetime(2026, 2, 3)
+    calc = CalculadoraAmortizacao(15000, 0.012, 400, inicio)
+    aportes = {3: 500, 7: 1000}
+    
+    plano = calc.gerar_plano_completo(aportes, modo=MODO_PARCELA)
+    valores = [p.valor_parcela - p.amortizacao_extra for p in plano.parcelas]
+    
+    assert len(plano.parcelas) == len(calc.gerar_plano_completo().parcelas), "Prazo original mantido"
+    assert valores[0] == valores[2] == Decimal('400.00')
+    assert valores[2] > valores[3] > valores[7], "Parcela cai após cada aporte"
+    
+    decimal = CalculadoraAmortizacao(15000, 0.012, 400, inicio, backend=BACKEND_DECIMAL)
+    assert list(plano.parcelas) == list(decimal.gerar_plano_completo(aportes, modo=MODO_PARCELA).parcelas)
+    
+    comparacao = calc.comparar_modos(aportes)
+    assert comparacao == decimal.comparar_modos(aportes)
+    assert comparacao.reducao_prazo == calc.resumir(aportes)
+    assert comparacao.reducao_parcela == calc.resumir(aportes, modo=MODO_PARCELA)
+    assert comparacao.parcela_final == valores[-1]
+    assert comparacao.reducao_prazo.total_juros < comparacao.reducao_parcela.total_juros
+    print("✓ Teste redução de parcela: PASSOU")
+
+
+def test_metas_de_quitacao():
+    """Testa a parcela e o aporte mínimos para quitar em N meses"""
+    calc = CalculadoraAmortizacao(15000, 0.012, 400, datetime(2026, 2, 3))
+    centavo = Decimal('0.01')
+    
+    parcela = calc.parcela_para_quitar_em(24)
+    assert parcela == Decimal('723.04')
+    assert CalculadoraAmortizacao(15000, 0.012, parcela).resumir().parcelas <= 24
+    assert CalculadoraAmortizacao(15000, 0.012, parcela - centavo).resumir().parcelas > 24
+    
+    aporte = calc.aporte_para_quitar_em(6, 24)
+    assert calc.resumir({6: aporte}).parcelas <= 24
+    assert calc.resumir({6: aporte - centavo}).parcelas > 24
+    assert calc.aporte_para_quitar_em(6, 60) == 0, "Plano atual já quita em 60 meses"
+    
+    try:
+        calc.aporte_para_quitar_em(30, 24)
+        assert False, "Aporte depois do prazo não pode quitar no prazo"
+    except ValueError:
+        pass
+    print("✓ Teste metas de quitação: PASSOU")
+
+
+def test_somas_por_intervalo():
+    """Testa juros entre parcelas, resumo anual e saldo em uma data"""
+    inicio = datetime(2026, 2, 3)
+    aportes = {3: 500, 14: 1000}
+    plano = CalculadoraAmortizacao(15000, 0.012, 400, inicio).gerar_plano_completo(aportes)
+    parcelas = list(plano.parcelas)
+    
+    assert plano.juros_entre(13, 24) == sum(p.juros for p in parcelas[12:24])
+    assert plano.principal_entre(1, len(parcelas)) + plano.total_amortizacao_extra == Decimal('15000.00')
+    assert plano.amortizacao_extra_entre(4, 13) == 0
+    assert plano.juros_entre(1, 1000) == plano.total_juros_pago
+    
+    anos = plano.resumo_anual()
+    assert [a.ano for a in anos] == list(range(2026, 2026 + len(anos)))
+    assert anos[0].parcelas == 11 and sum(a.parcelas for a in anos) == len(parcelas)
+    assert sum(a.juros for a in anos) == plano.total_juros_pago
+    assert anos[0].saldo_final == parcelas[10].saldo_posterior
+    
+    assert plano.saldo_em(datetime(2026, 1, 1)) == Decimal('15000.00')
+    assert plano.saldo_em(datetime(2026, 4, 3).date()) == parcelas[2].saldo_posterior
+    assert plano.saldo_em(datetime(2026, 4, 2)) == parcelas[1].saldo_posterior
+    
+    decimal = CalculadoraAmortizacao(15000, 0.012, 400, inicio, backend=BACKEND_DECIMAL)
+    assert decimal.gerar_plano_completo(aportes).resumo_anual() == anos
+    print("✓ Teste somas por intervalo: PASSOU")
+
+
+def test_prazo_longo_e_parcela_que_nao_amortiza():
+    """Testa planos acima de 1000 parcelas e a recusa de parcelas que não cobrem os juros"""
+    inicio = datetime(2026, 2, 3)
+    calc = CalculadoraAmortizacao(300000, 0.0075, 2300, inicio)
+    parcela_420 = calc.parcela_para_quitar_em(420)  # Financiamento habitacional de 35 anos
+    assert calc._com_parcela(parcela_420).resumir().parcelas == 420
+    
+    longo = CalculadoraAmortizacao(300000, 0.0075, 2251, inicio)
+    plano = longo.gerar_plano_completo({1010: 100})
+    assert len(plano.parcelas) > 1010 and plano.parcelas[1009].amortizacao_extra == 100
+    decimal = CalculadoraAmortizacao(300000, 0.0075, 2251, inicio, backend=BACKEND_DECIMAL)
+    assert decimal.gerar_plano_completo({1010: 100}).parcelas == plano.parcelas
+    
+    sem_amortizar = CalculadoraAmortizacao(300000, 0.0075, 2250, inicio)
+    for backend in (None, BACKEND_DECIMAL):
+        calc = sem_amortizar if backend is None else \
+            CalculadoraAmortizacao(300000, 0.0075, 2250, inicio, backend=backend)
+        for gerar in (calc.verificar_amortizacao, calc.gerar_plano_completo, calc.resumir):
+            try:
+                gerar()
+                assert False, "Deveria recusar a parcela que só cobre os juros"
+            except FinanciamentoNaoAmortizavel as erro:
+                assert (erro.numero_parcela, erro.juros) == (1, Decimal('2250.00'))
+                assert erro.parcela_minima == Decimal('2250.01')
+    
+    # Com o aporte na parcela 1 o saldo cai e a parcela passa a amortizar
+    assert sem_amortizar.resumir({1: 5000}).parcelas > 0
+    print("✓ Teste prazo longo e parcela que não amortiza: PASSOU")
+
+
 if __name__ == "__main__":
     print("Executando testes da Fase 1...\n")
     
@@ -74,5 +319,15 @@ if __name__ == "__main__":
     test_aportes_reduzem_prazo()
     test_aportes_reduzem_juros()
     test_simulacao_aporte()
+    test_backend_centavos_igual_decimal()
+    test_plano_colunar()
+    test_iter_parcelas_e_resumo()
+    test_continuar_plano_reaproveita_prefixo()
+    test_cache_plano_base()
+    test_simular_grade()
+    test_reducao_de_parcela()
+    test_metas_de_quitacao()
+    test_somas_por_intervalo()
+    test_prazo_longo_e_parcela_que_nao_amortiza()
     
     print("\n✅ Todos os testes passaram!")
@@ -0,0 +1,65 @@
+"""
+Testes para o calendário de vencimentos
+"""
+
+import sys
+from pathlib import Path
+from datetime import date, datetime
+
+# Adiciona src ao path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from src.amortizacao import CalculadoraAmortizacao
+from src.calendario import Calendario, feriados_nacionais, pascoa, somar_meses
+
+
+def test_mesmo_dia_de_cada_mes():
+    """Testa vencimentos mensais limitados ao último dia do mês"""
+    inicio = datetime(2026, 1, 31)
+    assert somar_meses(inicio, 1) == datetime(2026, 2, 28)
+    assert somar_meses(inicio, 2) == datetime(2026, 3, 31)
+    assert somar_meses(datetime(2027, 12, 29), 2) == datetime(2028, 2, 29)
+    assert somar_meses(inicio, 12) == datetime(2027, 1, 31)
+    print("✓ Teste mesmo dia de cada mês: PASSOU")
+
+
+def test_adiamento_para_dia_util():
+    """Testa feriados móveis e o adiamento para o próximo dia útil"""
+    assert pascoa(2026) == date(2026, 4, 5)
+    assert date(2026, 4, 3) in feriados_nacionais(2026)   # Sexta-feira Santa
+    assert date(2026, 2, 17) in feriados_nacionais(2026)  # Carnaval
+
+    util = Calendario(dia_util=True)
+    assert util.ajustar(datetime(2026, 4, 3)) == datetime(2026, 4, 6)   # Sexta Santa + fim de semana
+    assert util.ajustar(datetime(2026, 2, 16)) == datetime(2026, 2, 18)  # Carnaval
+    assert Calendario().ajustar(datetime(2026, 4, 3)) == datetime(2026, 4, 3)
+
+    local = Calendario(dia_util=True, feriados_locais=frozenset({date(2026, 1, 20)}))
+    assert local.ajustar(datetime(2026, 1, 20)) == datetime(2026, 1, 21)
+    print("✓ Teste adiamento para dia útil: PASSOU")
+
+
+def test_tabela_de_datas_compartilhada():
+    """Testa que planos com a mesma data de início compartilham a tabela de vencimentos"""
+    inicio = datetime(2026, 1, 31)
+    plano_a = CalculadoraAmortizacao(15000, 0.012, 400, inicio).gerar_plano_completo()
+    plano_b = CalculadoraAmortizacao(15000, 0.012, 400, inicio).gerar_plano_completo()
+    assert plano_a.datas is plano_b.datas
+    assert plano_a.parcelas[1].data == datetime(2026, 2, 28)
+    assert plano_a.parcelas[2].data == datetime(2026, 3, 31)
+
+    calc = CalculadoraAmortizacao(15000, 0.012, 400, inicio, calendario=Calendario(dia_util=True))
+    plano = calc.gerar_plano_completo()
+    assert plano.parcelas[0].data == datetime(2026, 2, 2)  # 31/01/2026 é sábado
+    assert all(calc.calendario.eh_dia_util(p.data.date()) for p in plano.parcelas)
+    print("✓ Teste tabela de datas compartilhada: PASSOU")
+
+
+if __name__ == "__main__":
+    print("Executando testes do calendário...\n")
+
+    test_mesmo_dia_de_cada_mes()
+    test_adiamento_para_dia_util()
+    test_tabela_de_datas_compartilhada()
+
+    print("\n✅ Todos os testes do calendário passaram!")
@@ -0,0 +1,127 @@
+"""
+Testes para o otimizador de carteira (vários financiamentos)
+"""
+
+import sys
+import tempfile
+from pathlib import Path
+from datetime import datetime
+
+# Adiciona src ao path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from src.amortizacao import CalculadoraAmortizacao, FinanciamentoNaoAmortizavel
+from src.carteira import ESTRATEGIAS, simular_carteira
+from src.curva_taxas import CalculadoraTaxaVariavel, CurvaTaxas
+from src.integracao import SistemaFinanciamento
+
+
+def test_um_financiamento_igual_ao_motor():
+    """Com um único financiamento, o extra mensal equivale a aportes todo mês"""
+    for taxa in (0.012, 0.011000000000000001):
+        calc = CalculadoraAmortizacao(15000, taxa, 400, datetime(2026, 1, 1))
+        esperado = calc.resumir({mes: 300 for mes in range(1, 1001)})
+
+        for resultado in simular_carteira([calc], 300).values():
+            assert resultado.meses == esperado.parcelas
+            assert resultado.total_juros == esperado.total_juros
+    print("✓ Teste um financiamento igual ao motor: PASSOU")
+
+
+def test_estrategias_em_carteira():
+    """Testa avalanche x bola de neve, a alocação marginal e o reforço das parcelas quitadas"""
+    inicio = datetime(2026, 1, 1)
+    calcs = [
+        CalculadoraAmortizacao(3000, 0.008, 300, inicio),   # Menor saldo, menor taxa
+        CalculadoraAmortizacao(20000, 0.025, 700, inicio),  # Maior taxa
+    ]
+    resultados = simular_carteira(calcs, 500)
+
+    avalanche, bola_de_neve = resultados['avalanche'], resultados['bola_de_neve']
+    assert avalanche.total_juros < bola_de_neve.total_juros
+    assert bola_de_neve.quitacao[0] < avalanche.quitacao[0]
+    # Taxas fixas: a alocação marginal segue a ordem da avalanche
+    assert resultados['melhor'].aportes == avalanche.aportes
+
+    # Depois de quitar o primeiro, extra + parcela liberada vão para o segundo
+    mes = bola_de_neve.quitacao[0] + 1
+    assert bola_de_neve.aportes[1][mes] == 800
+    print("✓ Teste estratégias em carteira: PASSOU")
+
+
+def test_carteira_do_banco():
+    """Testa a comparação de estratégias com os financiamentos ativos"""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        sistema = SistemaFinanciamento(Path(tmpdir) / "test.db")
+        id_moto = sistema.criar_financiamento_completo("Moto", 15000, 0.012, 400)
+        id_carro = sistema.criar_financiamento_completo("Carro", 40000, 0.015, 1200)
+
+        ids, resultados = sistema.comparar_estrategias_carteira(extra_mensal=500)
+
+        assert sorted(ids) == sorted([id_moto, id_carro])
+        assert set(ESTRATEGIAS) == set(resultados)
+        
+        # Financiamento de taxa variável na carteira
+        sistema.bd.registrar_taxa_variavel(id_carro, 13, 0.02)
+        ids, resultados = sistema.comparar_estrategias_carteira(extra_mensal=500)
+        assert set(ESTRATEGIAS) == set(resultados)
+        assert resultados['avalanche'].total_juros > 0
+    print("✓ Teste carteira do banco: PASSOU")
+
+
+def test_taxa_variavel_igual_ao_motor():
+    """Testa a carteira com a taxa de cada mês da curva, contra o motor da curva"""
+    inicio = datetime(2026, 1, 1)
+    curva = CurvaTaxas.de_alteracoes({1: 0.012, 7: 0.02, 19: 0.009})
+    calc = CalculadoraTaxaVariavel(15000, curva, 400, inicio)
+    esperado = calc.resumir({mes: 300 for mes in range(1, 1001)})
+    for resultado in simular_carteira([calc], 300).values():
+        assert resultado.meses == esperado.parcelas
+        assert resultado.total_juros == esperado.total_juros
+
+    # Misturada com um de taxa fixa, sem extra: a parcela do fixo, depois de
+    # quitado, vira aporte mensal no de taxa variável
+    fixo = CalculadoraAmortizacao(3000, 0.008, 300, inicio)
+    resultado = simular_carteira([calc, fixo], 0)['avalanche']
+    quitacao_fixo = fixo.resumir().parcelas
+    esperado = calc.resumir({mes: 300 for mes in range(quitacao_fixo + 1, 1001)})
+    assert resultado.quitacao == [esperado.parcelas, quitacao_fixo]
+    assert resultado.total_juros == esperado.total_juros + fixo.resumir().total_juros
+
+    # Taxa que sobe a ponto de a parcela não cobrir os juros
+    alta = CalculadoraTaxaVariavel(15000, CurvaTaxas.de_alteracoes({1: 0.012, 4: 0.03}), 400, inicio)
+    try:
+        simular_carteira([alta, fixo], 0)
+        assert False, "Deveria recusar a parcela que não cobre os juros"
+    except FinanciamentoNaoAmortizavel as erro:
+        assert erro.numero_parcela == 4
+    print("✓ Teste taxa variável igual ao motor: PASSOU")
+
+
+def test_alocacao_marginal_antecipa_curva():
+    """Testa a alocação marginal contra a avalanche quando a taxa vai cair"""
+    inicio = datetime(2026, 1, 1)
+    calcs = [
+        # Hoje a mais cara, mas a taxa cai na parcela 3
+        CalculadoraTaxaVariavel(10000, CurvaTaxas.de_alteracoes({1: 0.025, 3: 0.005}), 600, inicio),
+        CalculadoraAmortizacao(10000, 0.015, 600, inicio),
+    ]
+    resultados = simular_carteira(calcs, 500)
+
+    melhor = resultados['melhor']
+    assert melhor.aportes[1][1] == 500, "O extra vai para a taxa que continua alta"
+    assert resultados['avalanche'].aportes[0][1] == 500
+    assert all(melhor.total_juros < resultados[e].total_juros for e in ESTRATEGIAS if e != 'melhor')
+    print("✓ Teste alocação marginal antecipa a curva: PASSOU")
+
+
+if __name__ == "__main__":
+    print("Executando testes do otimizador de carteira...\n")
+
+    test_um_financiamento_igual_ao_motor()
+    test_estrategias_em_carteira()
+    test_carteira_do_banco()
+    test_taxa_variavel_igual_ao_motor()
+    test_alocacao_marginal_antecipa_curva()
+
+    print("\n✅ Todos os testes da carteira passaram!")
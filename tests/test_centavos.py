@@ -0,0 +1,53 @@
+"""
+Testes para a aritmética monetária em centavos
+"""
+
+import sys
+from pathlib import Path
+from decimal import Decimal, ROUND_HALF_UP
+
+# Adiciona src ao path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+import pytest
+
+from src.centavos import para_centavos, para_reais, taxa_racional, juros_centavos
+
+
+def test_conversao_centavos():
+    """Testa conversão entre reais e centavos"""
+    assert para_centavos(15000) == 1500000
+    assert para_centavos(0.1) == 10
+    assert para_centavos(Decimal('177.36')) == 17736
+    assert para_reais(17736) == Decimal('177.36')
+
+    with pytest.raises(ValueError):
+        para_centavos(10.005)
+
+    print("✓ Teste conversão centavos: PASSOU")
+
+
+def test_juros_arredondamento_meio_acima():
+    """Testa se juros em centavos seguem o ROUND_HALF_UP do Decimal"""
+    for taxa in (0.012, 0.0079, 0.011000000000000001, 0.005):
+        num, den = taxa_racional(taxa)
+        for saldo in (1, 50, 12345, 1500000, 1478000, 99999999):
+            esperado = (Decimal(saldo) / 100 * Decimal(str(taxa))).quantize(
+                Decimal('0.01'), rounding=ROUND_HALF_UP
+            )
+            assert para_reais(juros_centavos(saldo, num, den)) == esperado
+
+    # Empate exato (0,5 centavo) arredonda para cima, também em valores negativos
+    assert juros_centavos(50, 1, 100) == 1
+    assert juros_centavos(-50, 1, 100) == -1
+
+    print("✓ Teste juros ROUND_HALF_UP: PASSOU")
+
+
+if __name__ == "__main__":
+    print("Executando testes de centavos...\n")
+
+    test_conversao_centavos()
+    test_juros_arredondamento_meio_acima()
+
+    print("\n✅ Todos os testes de centavos passaram!")
@@ -0,0 +1,87 @@
+"""
+Testes para taxas variáveis e indexadas
+"""
+
+import sys
+import tempfile
+from pathlib import Path
+from datetime import datetime
+from decimal import Decimal
+
+# Adiciona src ao path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from src.amortizacao import BACKEND_DECIMAL, CalculadoraAmortizacao
+from src.curva_taxas import CalculadoraTaxaVariavel, CurvaTaxas
+from src.integracao import SistemaFinanciamento
+
+
+INICIO = datetime(2026, 2, 3)
+
+
+def test_curva_igual_ao_decimal():
+    """Testa se o motor em centavos com curva reproduz o laço em Decimal"""
+    curvas = [
+        CurvaTaxas.de_alteracoes({1: 0.012, 13: 0.009, 25: 0.015}),
+        CurvaTaxas.indexada([0.0010, 0.0025, 0.0041, 0.0033], spread=0.008),  # IPCA + 0,8%
+    ]
+    for curva in curvas:
+        for aportes in (None, {3: 500, 20: 1000}):
+            centavos = CalculadoraTaxaVariavel(15000, curva, 400, INICIO)
+            decimal = CalculadoraTaxaVariavel(15000, curva, 400, INICIO, backend=BACKEND_DECIMAL)
+            assert list(centavos.gerar_plano_completo(aportes).parcelas) == \
+                list(decimal.gerar_plano_completo(aportes).parcelas)
+            assert centavos.simular_aporte(300, 5) == decimal.simular_aporte(300, 5)
+    print("✓ Teste curva igual ao Decimal: PASSOU")
+
+
+def test_curva_constante_igual_taxa_fixa():
+    """Testa se uma curva de taxa única gera o mesmo plano da taxa fixa"""
+    variavel = CalculadoraTaxaVariavel(15000, CurvaTaxas([0.012]), 400, INICIO)
+    fixa = CalculadoraAmortizacao(15000, 0.012, 400, INICIO)
+
+    assert list(variavel.gerar_plano_completo({3: 500}).parcelas) == \
+        list(fixa.gerar_plano_completo({3: 500}).parcelas)
+    assert variavel.resumir() == fixa.resumir()
+    assert CurvaTaxas.indexada([0.004], 0.008).taxa(1) == Decimal('0.012032')
+    print("✓ Teste curva constante igual à taxa fixa: PASSOU")
+
+
+def test_estimativa_com_curva():
+    """Testa a estimativa pelos fatores acumulados da curva"""
+    curva = CurvaTaxas.de_alteracoes({1: 0.0079, 37: 0.0095})
+    calc = CalculadoraTaxaVariavel(250000, curva, 2400, INICIO)
+    for aportes in (None, {12: 10000, 48: 25000}):
+        exato = calc.resumir(aportes)
+        estimado = calc.estimar_resumo(aportes)
+        assert estimado.parcelas == exato.parcelas
+        assert abs(estimado.total_juros - exato.total_juros) <= exato.parcelas * 0.01
+    print("✓ Teste estimativa com curva: PASSOU")
+
+
+def test_taxas_variaveis_no_banco():
+    """Testa se as mudanças de taxa registradas entram na simulação"""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        sistema = SistemaFinanciamento(Path(tmpdir) / "test.db")
+        fin_id = sistema.criar_financiamento_completo("Moto", 15000, 0.012, 400)
+        plano_fixo, _ = sistema.simular_plano_com_aportes(fin_id)
+
+        sistema.bd.registrar_taxa_variavel(fin_id, 13, 0.015, indice="CDI")
+        assert sistema.bd.obter_taxas_variaveis(fin_id) == {13: 0.015}
+
+        plano_variavel, _ = sistema.simular_plano_com_aportes(fin_id)
+        assert plano_variavel.parcelas[11].juros == plano_fixo.parcelas[11].juros
+        assert plano_variavel.parcelas[12].juros > plano_fixo.parcelas[12].juros
+        assert len(plano_variavel.parcelas) > len(plano_fixo.parcelas)
+    print("✓ Teste taxas variáveis no banco: PASSOU")
+
+
+if __name__ == "__main__":
+    print("Executando testes de taxas variáveis...\n")
+
+    test_curva_igual_ao_decimal()
+    test_curva_constante_igual_taxa_fixa()
+    test_estimativa_com_curva()
+    test_taxas_variaveis_no_banco()
+
+    print("\n✅ Todos os testes de taxas variáveis passaram!")
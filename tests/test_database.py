@@ -10,7 +10,9 @@ from datetime import datetime
 # Adiciona src ao path
 sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
 
+from src.amortizacao import CalculadoraAmortizacao
 from src.database import GerenciadorBancoDados
+from src.integracao import SistemaFinanciamento
 
 
 def test_criar_financiamento():
@@ -199,6 +201,84 @@ def test_resumo_financiamento():
         print("✓ Teste resumo financiamento: PASSOU")
 
 
+def test_registros_em_lote():
+    """Testa os registros em lote, o salvamento do plano em fluxo e o lote desfeito"""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        sistema = SistemaFinanciamento(Path(tmpdir) / "test.db")
+        bd = sistema.bd
+        fin_id = bd.criar_financiamento("Test", 10000, 0.01, 300)
+        
+        # Plano em fluxo: as parcelas vêm do gerador, sem montar o plano
+        calc = CalculadoraAmortizacao(10000, 0.01, 300)
+        salvas = sistema.salvar_parcelas_do_plano(fin_id, calc.iter_parcelas({3: 500}))
+        plano = calc.gerar_plano_completo({3: 500})
+        assert salvas == len(plano.parcelas) == len(bd.obter_parcelas_pagas(fin_id))
+        assert abs(bd.total_juros_pago(fin_id) - float(plano.total_juros_pago)) < 0.01
+        
+        assert bd.registrar_aportes_em_lote(fin_id, (
+            {'numero_parcela': n, 'valor_aporte': 100, 'origem': "salario"} for n in (2, 4, 6)
+        )) == 3
+        assert bd.obter_aportes_dict(fin_id) == {2: 100, 4: 100, 6: 100}
+        assert bd.obter_aportes(fin_id)[0]['origem'] == "salario"
+        
+        assert bd.registrar_entradas_em_lote(fin_id, [
+            {'valor': 250, 'produto_vendido': "Bicicleta"}, {'valor': 50},
+        ]) == 2
+        assert bd.total_entradas_extras(fin_id) == 300
+        
+        # Linha inválida no meio do lote: nada do lote é gravado
+        try:
+            bd.registrar_aportes_em_lote(fin_id, [
+                {'numero_parcela': 8, 'valor_aporte': 100}, {'numero_parcela': 9},
+            ])
+            assert False, "Deveria falhar sem valor_aporte"
+        except KeyError:
+            pass
+        assert bd.total_aportes(fin_id) == 300
+        
+        print("✓ Teste registros em lote: PASSOU")
+
+
+def test_transacao_unidade_de_trabalho():
+    """Testa que as operações de um transacao() são gravadas juntas ou desfeitas juntas"""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        sistema = SistemaFinanciamento(Path(tmpdir) / "test.db")
+        bd = sistema.bd
+        fin_id = bd.criar_financiamento("Test", 10000, 0.01, 300)
+        outro = GerenciadorBancoDados(Path(tmpdir) / "test.db")  # Outra conexão
+        
+        with bd.transacao():
+            entrada_id = bd.registrar_entrada_extra(fin_id, 500, "Venda")
+            with bd.transacao():  # Aninhada: faz parte da externa
+                aporte_id = bd.registrar_aporte(fin_id, 3, 500)
+            bd.alocar_entrada_para_aporte(entrada_id, aporte_id)
+            assert bd.total_aportes(fin_id) == 500  # A própria transação vê as escritas
+            assert outro.total_aportes(fin_id) == 0  # Nada confirmado ainda
+        assert outro.obter_entradas_extras(fin_id)[0]['aporte_id'] == aporte_id
+        
+        # Exceção no meio do bloco: entrada, aportes em lote e aporte desfeitos
+        try:
+            with bd.transacao():
+                bd.registrar_entrada_extra(fin_id, 200)
+                bd.registrar_aportes_em_lote(fin_id, [{'numero_parcela': 5, 'valor_aporte': 200}])
+                bd.registrar_aporte(fin_id, 6, 200)
+                raise RuntimeError("falha no meio")
+        except RuntimeError:
+            pass
+        assert bd.total_entradas_extras(fin_id) == 500
+        assert bd.obter_aportes_dict(fin_id) == {3: 500}
+        
+        entrada_id, aporte_id = sistema.registrar_venda_e_aporte(fin_id, 300, 8, "Venda", "Celular")
+        entradas = {e['id']: e for e in bd.obter_entradas_extras(fin_id)}
+        assert entradas[entrada_id]['alocado_para_aporte'] == 1
+        assert entradas[entrada_id]['aporte_id'] == aporte_id
+        assert bd.obter_aportes_dict(fin_id) == {3: 500, 8: 300}
+        
+        outro.fechar()
+        bd.fechar()
+        print("✓ Teste transação (unidade de trabalho): PASSOU")
+
+
 if __name__ == "__main__":
     print("Executando testes do Banco de Dados (Fase 2)...\n")
     
@@ -209,5 +289,7 @@ if __name__ == "__main__":
     test_alocar_entrada_para_aporte()
     test_obter_aportes_dict()
     test_resumo_financiamento()
+    test_registros_em_lote()
+    test_transacao_unidade_de_trabalho()
     
     print("\n✅ Todos os testes do banco de dados passaram!")
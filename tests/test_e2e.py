@@ -4,6 +4,8 @@ Teste de integração completa (E2E) - Fase 1 + Fase 2
 
 import sys
 import os
+from datetime import date, datetime
+from decimal import Decimal
 from pathlib import Path
 import tempfile
 
@@ -14,7 +16,9 @@ os.environ['PYTHONIOENCODING'] = 'utf-8'
 sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
 
 from src.amortizacao import CalculadoraAmortizacao
+from src.database import PLANOS_CACHE_POR_FINANCIAMENTO
 from src.integracao import SistemaFinanciamento
+from src.otimizador import parcela_disponivel
 
 
 def test_fluxo_completo_usuario():
@@ -115,5 +119,108 @@ def test_fluxo_completo_usuario():
         print("=" * 80)
 
 
+def test_simulacao_incremental_apos_novo_aporte():
+    """Plano com aportes recalculado a partir do aporte alterado == plano completo"""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        sistema = SistemaFinanciamento(Path(tmpdir) / "test.db")
+        fin_id = sistema.criar_financiamento_completo("Moto", 15000, 0.012, 400)
+        sistema.adicionar_aporte(fin_id, 3, 500)
+        sistema.simular_plano_com_aportes(fin_id)
+        
+        # Novo aporte tardio: só o sufixo a partir da parcela 20 é recalculado
+        sistema.adicionar_aporte(fin_id, 20, 1000)
+        _, plano_acelerado = sistema.simular_plano_com_aportes(fin_id)
+        
+        calc = CalculadoraAmortizacao(15000, 0.012, 400, plano_acelerado.data_inicio)
+        esperado = calc.gerar_plano_completo({3: 500, 20: 1000})
+        assert plano_acelerado.parcelas == esperado.parcelas
+        assert plano_acelerado.total_juros_pago == esperado.total_juros_pago
+        print("[OK] Simulação incremental igual ao plano completo")
+
+
+def test_cache_de_planos_no_banco():
+    """Planos vêm do cache do banco em outro processo e são invalidados por novos aportes"""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        db_path = Path(tmpdir) / "test.db"
+        sistema = SistemaFinanciamento(db_path)
+        fin_id = sistema.criar_financiamento_completo("Moto", 15000, 0.012, 400)
+        sistema.adicionar_aporte(fin_id, 3, 500)
+        original, acelerado = sistema.simular_plano_com_aportes(fin_id)
+        
+        # Nova instância (como outro processo): nada é recalculado nem regravado
+        outro = SistemaFinanciamento(db_path)
+        gravacoes = []
+        outro.bd.salvar_plano_cache = lambda *args, **kwargs: gravacoes.append(args)
+        original_cache, acelerado_cache = outro.simular_plano_com_aportes(fin_id)
+        assert gravacoes == [], "Planos deveriam vir do cache"
+        assert isinstance(acelerado_cache.colunas['juros'], memoryview)
+        assert list(acelerado_cache.parcelas) == list(acelerado.parcelas)
+        assert original_cache.total_juros_pago == original.total_juros_pago
+        
+        # registrar_aporte descarta o cache do financiamento (gatilho do banco)
+        sistema.adicionar_aporte(fin_id, 10, 1000)
+        calc = sistema._calculadora(sistema.bd.obter_financiamento(fin_id))
+        assert sistema.bd.obter_planos_cache([sistema._impressao(calc, {})]) == {}
+        _, novo = SistemaFinanciamento(db_path).simular_plano_com_aportes(fin_id)
+        assert novo.total_amortizacao_extra == 1500
+        print("[OK] Cache de planos no banco")
+
+
+def test_cache_estavel_e_limitado():
+    """A impressão usa a data de início gravada e o cache guarda poucas entradas por financiamento"""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        sistema = SistemaFinanciamento(Path(tmpdir) / "test.db")
+        fin_id = sistema.criar_financiamento_completo("Moto", 15000, 0.012, 400)
+        conn = sistema.bd._conexao()
+        conn.execute("UPDATE financiamentos SET data_inicio = '2024-01-05' WHERE id = ?", (fin_id,))
+        conn.commit()
+        
+        calc = sistema._calculadora(sistema.bd.obter_financiamento(fin_id))
+        assert calc.data_inicio == datetime(2024, 1, 5)
+        original, _ = sistema.simular_plano_com_aportes(fin_id)
+        assert original.parcelas[0].data.date().isoformat() == '2024-01-05'
+        
+        # Nenhuma impressão nova em outra instância (a data de hoje não entra na chave)
+        outro = SistemaFinanciamento(Path(tmpdir) / "test.db")
+        gravacoes = []
+        outro.bd.salvar_plano_cache = lambda *args, **kwargs: gravacoes.append(args)
+        outro.simular_plano_com_aportes(fin_id)
+        assert gravacoes == []
+        
+        # Só as entradas mais recentes do financiamento ficam no cache
+        impressoes = [f"impressao-{i}" for i in range(PLANOS_CACHE_POR_FINANCIAMENTO + 2)]
+        for impressao in impressoes:
+            sistema.bd.salvar_plano_cache(fin_id, impressao, 10, Decimal('1'), Decimal('0'))
+        restantes = conn.execute(
+            "SELECT impressao FROM planos_cache WHERE financiamento_id = ?", (fin_id,)
+        ).fetchall()
+        assert sorted(r[0] for r in restantes) == impressoes[-PLANOS_CACHE_POR_FINANCIAMENTO:]
+        print("[OK] Cache estável e limitado")
+
+
+def test_proxima_parcela():
+    """A próxima parcela segue a data de início gravada, não a parcela 1"""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        sistema = SistemaFinanciamento(Path(tmpdir) / "test.db")
+        fin_id = sistema.criar_financiamento_completo("Moto", 15000, 0.012, 400)
+        conn = sistema.bd._conexao()
+        
+        conn.execute("UPDATE financiamentos SET data_inicio = '2024-01-05' WHERE id = ?", (fin_id,))
+        conn.commit()
+        calc = sistema._calculadora(sistema.bd.obter_financiamento(fin_id))
+        proxima = sistema.proxima_parcela(fin_id)
+        assert proxima > 1 and proxima == parcela_disponivel(calc, date.today())
+        assert calc.data_parcela(proxima - 1).date() >= date.today() > calc.data_parcela(proxima - 2).date()
+        
+        conn.execute("UPDATE financiamentos SET data_inicio = '2999-01-05' WHERE id = ?", (fin_id,))
+        conn.commit()
+        assert sistema.proxima_parcela(fin_id) == 1
+        print("[OK] Próxima parcela")
+
+
 if __name__ == "__main__":
     test_fluxo_completo_usuario()
+    test_simulacao_incremental_apos_novo_aporte()
+    test_cache_de_planos_no_banco()
+    test_cache_estavel_e_limitado()
+    test_proxima_parcela()
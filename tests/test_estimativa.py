@@ -0,0 +1,63 @@
+"""
+Testes para a estimativa analítica de quitação
+"""
+
+import sys
+from pathlib import Path
+from datetime import datetime
+from decimal import Decimal
+
+# Adiciona src ao path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from src.amortizacao import CalculadoraAmortizacao, FinanciamentoNaoAmortizavel
+from src.estimativa import estimar_totais, meses_para_quitar
+
+
+CENARIOS = [
+    (15000, 0.012, 400, None),
+    (15000, 0.012, 400, {3: 500, 7: 1000}),
+    (250000, 0.0079, 2100, {12: 10000, 24: 10000, 36: 25000}),
+    (15000, 0.011000000000000001, 400, {5: 300}),
+    (12000, 0, 500, {4: 1000}),
+    (5000, 0.012, 400, {2: 10000}),  # Aporte maior que o saldo
+]
+
+
+def test_estimativa_proxima_do_exato():
+    """Testa se o prazo estimado é exato e os juros ficam a centavos do motor"""
+    for saldo, taxa, parcela, aportes in CENARIOS:
+        calc = CalculadoraAmortizacao(saldo, taxa, parcela, datetime(2026, 2, 3))
+        exato = calc.resumir(aportes)
+        estimado = calc.estimar_resumo(aportes)
+
+        assert estimado.parcelas == exato.parcelas, f"Prazo difere: {estimado} != {exato}"
+        assert estimado.data_quitacao == exato.data_quitacao
+        assert estimado.total_amortizacao_extra == exato.total_amortizacao_extra
+        assert abs(estimado.total_juros - exato.total_juros) <= exato.parcelas * 0.01
+    print("✓ Teste estimativa próxima do exato: PASSOU")
+
+
+def test_parcela_que_nao_amortiza():
+    """Testa o fallback para o motor exato quando a parcela não cobre os juros"""
+    assert meses_para_quitar(500000, 0.03, 10000) is None
+    assert estimar_totais(500000, 3, 100, 10000) is None
+
+    calc = CalculadoraAmortizacao(5000, 0.03, 100, datetime(2026, 2, 3))
+    for resumo in (calc.resumir, calc.estimar_resumo):
+        try:
+            resumo()
+            assert False, "Deveria recusar a parcela que não cobre os juros"
+        except FinanciamentoNaoAmortizavel as erro:
+            assert erro.numero_parcela == 1
+            assert erro.parcela_minima == Decimal('150.01')
+    print("✓ Teste parcela que não amortiza: PASSOU")
+
+
+if __name__ == "__main__":
+    print("Executando testes da estimativa analítica...\n")
+
+    test_estimativa_proxima_do_exato()
+    test_parcela_que_nao_amortiza()
+
+    print("\n✅ Todos os testes da estimativa passaram!")
@@ -0,0 +1,80 @@
+"""
+Testes para as migrações do esquema
+"""
+
+import sqlite3
+import sys
+import tempfile
+from pathlib import Path
+
+# Adiciona src ao path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from src.database import GerenciadorBancoDados
+from src.migracoes import MIGRACOES, VERSAO_ATUAL, aplicar_migracoes, versao_esquema
+
+
+def test_banco_novo_e_indices():
+    """Testa que um banco novo chega à versão atual e as consultas usam os índices"""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        bd = GerenciadorBancoDados(Path(tmpdir) / "test.db")
+        conn = bd._conexao()
+        assert versao_esquema(conn) == VERSAO_ATUAL
+        assert aplicar_migracoes(conn) == 0  # Já migrado: só lê o user_version
+
+        plano = " ".join(r[3] for r in conn.execute("""
+            EXPLAIN QUERY PLAN
+            SELECT COALESCE(SUM(valor_aporte), 0) FROM aportes_extras WHERE financiamento_id = ?
+        """, (1,)))
+        assert "COVERING INDEX idx_aportes_extras_financiamento" in plano, plano
+        plano = " ".join(r[3] for r in conn.execute("""
+            EXPLAIN QUERY PLAN
+            SELECT * FROM parcelas_pagas WHERE financiamento_id = ? ORDER BY numero_parcela
+        """, (1,)))
+        assert "idx_parcelas_pagas_financiamento" in plano and "TEMP B-TREE" not in plano, plano
+        bd.fechar()
+        print("✓ Teste banco novo e índices: PASSOU")
+
+
+def test_banco_anterior_as_migracoes():
+    """Testa a atualização de um banco criado antes do versionamento, sem perder dados"""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        caminho = Path(tmpdir) / "test.db"
+        antigo = sqlite3.connect(str(caminho))
+        for comando in MIGRACOES[0].comandos:  # Esquema base, user_version 0
+            antigo.execute(comando)
+        antigo.execute("""
+            INSERT INTO financiamentos (nome, saldo_inicial, saldo_atual, taxa_mensal,
+                                        parcela_fixa, data_inicio)
+            VALUES ('Moto', 15000, 15000, 0.012, 400, '2024-01-01')
+        """)
+        antigo.commit()
+        antigo.close()
+
+        bd = GerenciadorBancoDados(caminho)
+        assert versao_esquema(bd._conexao()) == VERSAO_ATUAL
+        assert bd.listar_financiamentos()[0]['nome'] == "Moto"
+        bd.registrar_aporte(1, 3, 500)
+        assert bd.total_aportes(1) == 500
+        bd.fechar()
+
+        # Banco gravado por uma versão mais nova do sistema
+        conn = sqlite3.connect(str(caminho))
+        conn.execute(f"PRAGMA user_version = {VERSAO_ATUAL + 1}")
+        try:
+            aplicar_migracoes(conn)
+            assert False, "Deveria recusar um esquema mais novo"
+        except ValueError as erro:
+            assert "mais nova" in str(erro)
+        assert not conn.in_transaction
+        conn.close()
+        print("✓ Teste banco anterior às migrações: PASSOU")
+
+
+if __name__ == "__main__":
+    print("Executando testes das migrações...\n")
+
+    test_banco_novo_e_indices()
+    test_banco_anterior_as_migracoes()
+
+    print("\n✅ Todos os testes das migrações passaram!")
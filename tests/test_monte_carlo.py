@@ -0,0 +1,76 @@
+"""
+Testes para a simulação Monte Carlo da renda de revenda
+"""
+
+import sys
+import tempfile
+from pathlib import Path
+from datetime import date, datetime
+
+# Adiciona src ao path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from src.amortizacao import CalculadoraAmortizacao
+from src.integracao import SistemaFinanciamento
+from src.monte_carlo import ModeloRenda, ajustar_modelo, simular
+
+
+def test_ajustar_modelo():
+    """Testa o ajuste Bernoulli + lognormal aos totais mensais"""
+    entradas = [
+        {'data_entrada': '2026-01-05', 'valor': 100},
+        {'data_entrada': '2026-01-20', 'valor': 100},
+        {'data_entrada': '2026-03-10', 'valor': 200},
+    ]
+    modelo = ajustar_modelo(entradas, fim=date(2026, 4, 30))
+
+    assert modelo.probabilidade_mensal == 0.5  # 2 meses com venda em 4
+    assert abs(modelo.media_log - 5.298317366548036) < 1e-9  # log(200)
+    assert modelo.desvio_log == 0
+    print("✓ Teste ajuste do modelo: PASSOU")
+
+
+def test_simulacao_reproduzivel():
+    """Testa se a mesma semente gera o mesmo resultado, com ou sem pool"""
+    calc = CalculadoraAmortizacao(15000, 0.012, 400, datetime(2026, 1, 1))
+    modelo = ModeloRenda(probabilidade_mensal=0.4, media_log=6.0, desvio_log=0.5)
+
+    serial = simular(calc, modelo, simulacoes=300, semente=7, processos=1, tamanho_lote=100)
+    paralelo = simular(calc, modelo, simulacoes=300, semente=7, processos=2, tamanho_lote=100)
+
+    assert serial == paralelo
+    assert serial.simulacoes == 300
+    assert serial.meses[10] <= serial.meses[50] <= serial.meses[90] < calc.resumir().parcelas
+    assert 0 < serial.economia_juros[10] <= serial.economia_juros[90]
+    print("✓ Teste simulação reproduzível: PASSOU")
+
+
+def test_monte_carlo_do_banco():
+    """Testa o Monte Carlo a partir das entradas extras registradas"""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        sistema = SistemaFinanciamento(Path(tmpdir) / "test.db")
+        fin_id = sistema.criar_financiamento_completo("Moto", 15000, 0.012, 400)
+        sistema.bd.registrar_entrada_extra(fin_id, 300, "Venda 1")
+
+        resultado = sistema.simular_renda_incerta(fin_id, simulacoes=50, semente=1, processos=1)
+
+        assert resultado.simulacoes == 50
+        assert resultado.economia_juros[50] > 0
+        
+        # Sem entradas registradas: nenhuma venda, prazo e juros do plano base
+        outro_id = sistema.criar_financiamento_completo("Carro", 40000, 0.015, 1200)
+        resultado = sistema.simular_renda_incerta(outro_id, simulacoes=20, semente=1, processos=1)
+        base = sistema._calculadora(sistema.bd.obter_financiamento(outro_id)).resumir()
+        assert set(resultado.meses.values()) == {base.parcelas}
+        assert set(resultado.economia_juros.values()) == {0}
+    print("✓ Teste Monte Carlo do banco: PASSOU")
+
+
+if __name__ == "__main__":
+    print("Executando testes do Monte Carlo...\n")
+
+    test_ajustar_modelo()
+    test_simulacao_reproduzivel()
+    test_monte_carlo_do_banco()
+
+    print("\n✅ Todos os testes do Monte Carlo passaram!")
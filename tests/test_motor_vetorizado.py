@@ -0,0 +1,98 @@
+"""
+Testes para o motor vetorizado (NumPy) de amortização
+"""
+
+import sys
+from pathlib import Path
+from datetime import datetime
+
+# Adiciona src ao path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from src.amortizacao import CalculadoraAmortizacao, FinanciamentoNaoAmortizavel
+from src.motor_vetorizado import CalculadoraAmortizacaoVetorizada, gerar_planos_em_lote
+
+
+CENARIOS = [
+    (15000, 0.012, 400, None),
+    (15000, 0.012, 400, {3: 500, 7: 1000}),
+    (1000, 0.01, 100, None),
+    (250000, 0.0079, 2100, {12: 10000, 24: 10000, 36: 25000}),
+    (15000, 0.011000000000000001, 400, {5: 300.5}),
+    (5000, 0.03, 100, {1: 4000}),  # Parcela só amortiza depois do aporte
+    (5000, 0.012, 400, {2: 10000}),  # Aporte maior que o saldo
+]
+
+
+def _assert_planos_iguais(plano_a, plano_b):
+    assert len(plano_a.parcelas) == len(plano_b.parcelas), "Quantidade de parcelas difere"
+    for pa, pb in zip(plano_a.parcelas, plano_b.parcelas):
+        assert pa == pb, f"Parcela difere:\n  {pa}\n  {pb}"
+    assert plano_a.total_juros_pago == plano_b.total_juros_pago
+
+
+def test_vetorizado_igual_ao_decimal():
+    """Testa se o motor vetorizado reproduz o motor Decimal centavo a centavo"""
+    inicio = datetime(2026, 2, 3)
+    for saldo, taxa, parcela, aportes in CENARIOS:
+        original = CalculadoraAmortizacao(saldo, taxa, parcela, inicio)
+        vetorizada = CalculadoraAmortizacaoVetorizada(saldo, taxa, parcela, inicio)
+        _assert_planos_iguais(
+            original.gerar_plano_completo(aportes),
+            vetorizada.gerar_plano_completo(aportes)
+        )
+    print("✓ Teste vetorizado igual ao Decimal: PASSOU")
+
+
+def test_lote_igual_ao_individual():
+    """Testa se o cálculo em lote gera os mesmos planos que um a um"""
+    inicio = datetime(2026, 2, 3)
+    calcs = [CalculadoraAmortizacaoVetorizada(s, t, p, inicio) for s, t, p, _ in CENARIOS]
+    aportes = [a for _, _, _, a in CENARIOS]
+
+    planos, falhas = gerar_planos_em_lote(calcs, aportes)
+
+    assert len(planos) == len(CENARIOS) and not falhas
+    for calc, ap, plano in zip(calcs, aportes, planos):
+        _assert_planos_iguais(CalculadoraAmortizacao.gerar_plano_completo(calc, ap), plano)
+    print("✓ Teste lote igual ao individual: PASSOU")
+
+
+def test_lote_com_financiamento_que_nao_amortiza():
+    """Testa que um financiamento que não amortiza não impede os demais do lote"""
+    inicio = datetime(2026, 2, 3)
+    parametros = [
+        (15000, 0.012, 400),
+        (300000, 0.0075, 2250),   # Parcela = juros do primeiro mês
+        (5000, 0.03, 100.005),    # Fração de centavo (motor Decimal), também não amortiza
+        (1000, 0.01, 100),
+    ]
+    calcs = [CalculadoraAmortizacaoVetorizada(s, t, p, inicio) for s, t, p in parametros]
+
+    planos, falhas = gerar_planos_em_lote(calcs)
+
+    assert sorted(falhas) == [1, 2] and planos[1] is None and planos[2] is None
+    assert isinstance(falhas[1], FinanciamentoNaoAmortizavel)
+    assert falhas[1].numero_parcela == 1 and str(falhas[1].parcela_minima) == "2250.01"
+    for i in (0, 3):
+        _assert_planos_iguais(CalculadoraAmortizacao.gerar_plano_completo(calcs[i]), planos[i])
+    print("✓ Teste lote com financiamento que não amortiza: PASSOU")
+
+
+def test_fracao_de_centavo_usa_motor_decimal():
+    """Testa o fallback para valores com fração de centavo"""
+    calc = CalculadoraAmortizacaoVetorizada(1000.005, 0.01, 100, datetime(2026, 1, 1))
+    plano = calc.gerar_plano_completo()
+    assert plano.parcelas[0].saldo_anterior == calc.saldo_devedor
+    print("✓ Teste fallback fração de centavo: PASSOU")
+
+
+if __name__ == "__main__":
+    print("Executando testes do motor vetorizado...\n")
+
+    test_vetorizado_igual_ao_decimal()
+    test_lote_igual_ao_individual()
+    test_lote_com_financiamento_que_nao_amortiza()
+    test_fracao_de_centavo_usa_motor_decimal()
+
+    print("\n✅ Todos os testes do motor vetorizado passaram!")
@@ -0,0 +1,71 @@
+"""
+Testes para o otimizador de aportes
+"""
+
+import sys
+import tempfile
+from pathlib import Path
+from datetime import datetime
+
+# Adiciona src ao path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from src.amortizacao import CalculadoraAmortizacao
+from src.integracao import SistemaFinanciamento
+from src.otimizador import otimizar_aportes, parcela_disponivel
+
+
+def test_otimizador_igual_forca_bruta():
+    """Testa se o guloso encontra a mesma economia que a enumeração completa"""
+    calc = CalculadoraAmortizacao(15000, 0.012, 400, datetime(2026, 1, 1))
+    disponibilidades = [(3, 300), (8, 500), (20, 400)]
+
+    resultado = otimizar_aportes(calc, disponibilidades, orcamento=700, passo=100)
+
+    base = calc.resumir().total_juros
+    melhor = max(
+        base - calc.resumir({3: a, 8: b, 20: c}).total_juros
+        for a in range(0, 301, 100)
+        for b in range(0, 501, 100)
+        for c in range(0, 401, 100)
+        if a + b + c <= 700
+    )
+    assert resultado.economia_juros == melhor, f"{resultado.economia_juros} != {melhor}"
+    assert resultado.total_alocado == 700
+    print("✓ Teste otimizador igual à força bruta: PASSOU")
+
+
+def test_parcela_disponivel_por_data():
+    """Testa a conversão da data da venda para a primeira parcela possível"""
+    calc = CalculadoraAmortizacao(15000, 0.012, 400, datetime(2026, 1, 1))
+    assert parcela_disponivel(calc, datetime(2025, 12, 1)) == 1
+    assert parcela_disponivel(calc, datetime(2026, 1, 1)) == 1
+    assert parcela_disponivel(calc, datetime(2026, 1, 2)) == 2
+    assert parcela_disponivel(calc, datetime(2026, 3, 1)) == 3  # Vencimento: 01/03
+    assert parcela_disponivel(calc, datetime(2026, 3, 2)) == 4
+    print("✓ Teste parcela disponível por data: PASSOU")
+
+
+def test_otimizar_entradas_do_banco():
+    """Testa a sugestão de aportes a partir das entradas extras registradas"""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        sistema = SistemaFinanciamento(Path(tmpdir) / "test.db")
+        fin_id = sistema.criar_financiamento_completo("Moto", 15000, 0.012, 400)
+        sistema.bd.registrar_entrada_extra(fin_id, 300, "Venda 1")
+        sistema.bd.registrar_entrada_extra(fin_id, 450, "Venda 2")
+
+        resultado = sistema.otimizar_aportes_entradas(fin_id)
+
+        assert resultado.total_alocado == 750
+        assert resultado.economia_juros > 0 and resultado.meses_economizados > 0
+    print("✓ Teste otimizar entradas do banco: PASSOU")
+
+
+if __name__ == "__main__":
+    print("Executando testes do otimizador de aportes...\n")
+
+    test_otimizador_igual_forca_bruta()
+    test_parcela_disponivel_por_data()
+    test_otimizar_entradas_do_banco()
+
+    print("\n✅ Todos os testes do otimizador passaram!")
@@ -0,0 +1,111 @@
+"""
+Testes para o formato binário de planos
+"""
+
+import sys
+import tempfile
+from pathlib import Path
+from datetime import date, datetime
+
+# Adiciona src ao path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from src.amortizacao import CalculadoraAmortizacao, BACKEND_DECIMAL, MODO_PARCELA, MODO_PRAZO
+from src.calendario import Calendario
+from src.curva_taxas import CalculadoraTaxaVariavel, CurvaTaxas
+from src.plano_binario import (
+    carregar_plano, ler_cabecalho, plano_de_buffer, plano_para_bytes, salvar_plano
+)
+
+
+def test_arquivo_mmap_sem_copia():
+    """Testa gravação e leitura via mmap com colunas somente leitura"""
+    calendario = Calendario(dia_util=True, feriados_locais=frozenset({date(2026, 3, 3)}))
+    calc = CalculadoraAmortizacao(15000, 0.012, 400, datetime(2026, 2, 3, 9, 30), calendario=calendario)
+    aportes = {3: 500, 7: 1000}
+    plano = calc.gerar_plano_completo(aportes)
+    
+    with tempfile.TemporaryDirectory() as tmpdir:
+        caminho = salvar_plano(plano, Path(tmpdir) / "plano.plano", aportes)
+        carregado = carregar_plano(caminho, aportes)
+        
+        assert list(carregado.parcelas) == list(plano.parcelas)
+        assert carregado.colunas['juros'].readonly, "Colunas são vistas sobre o mmap"
+        assert carregado.calendario == calendario and carregado.data_inicio == plano.data_inicio
+        assert carregado.juros_entre(2, 9) == plano.juros_entre(2, 9)
+        assert carregado.total_juros_pago == plano.total_juros_pago
+        
+        try:
+            carregar_plano(caminho, {3: 500})
+            assert False, "Hash dos aportes deveria divergir"
+        except ValueError:
+            pass
+    print("✓ Teste arquivo via mmap: PASSOU")
+
+
+def test_bytes_e_validacao():
+    """Testa o plano do backend decimal em bytes e a rejeição de buffers inválidos"""
+    calc = CalculadoraAmortizacao(15000, 0.012, 400, datetime(2026, 2, 3), backend=BACKEND_DECIMAL)
+    plano = calc.gerar_plano_completo({5: 300})
+    dados = plano_para_bytes(plano, {5: 300})
+    
+    cabecalho = ler_cabecalho(dados)
+    assert cabecalho.quantidade_parcelas == plano.quantidade_parcelas
+    assert cabecalho.taxa_mensal == plano.taxa_mensal
+    assert list(plano_de_buffer(dados).parcelas) == list(plano.parcelas)
+    
+    for invalido in (dados[:-8], b'XXXX' + dados[4:], b''):
+        try:
+            plano_de_buffer(invalido)
+            assert False, "Buffer inválido aceito"
+        except ValueError:
+            pass
+    
+    fracionado = CalculadoraAmortizacao(100.005, 0.01, 50, backend=BACKEND_DECIMAL).gerar_plano_completo()
+    try:
+        plano_para_bytes(fracionado)
+        assert False, "Fração de centavo não é representável"
+    except ValueError:
+        pass
+    print("✓ Teste bytes e validação: PASSOU")
+
+
+def test_modo_e_curva_no_cabecalho():
+    """Testa se modo e curva de taxas ficam no cabeçalho e são conferidos na leitura"""
+    inicio = datetime(2026, 2, 3)
+    curva = CurvaTaxas.de_alteracoes({1: 0.012, 13: 0.015})
+    variavel = CalculadoraTaxaVariavel(15000, curva, 400, inicio).gerar_plano_completo({3: 500})
+    dados = plano_para_bytes(variavel, {3: 500}, curva=curva)
+    
+    cabecalho = ler_cabecalho(dados)
+    assert cabecalho.taxa_variavel and cabecalho.modo == MODO_PRAZO
+    assert list(plano_de_buffer(dados, {3: 500}, MODO_PRAZO, curva).parcelas) == list(variavel.parcelas)
+    
+    fixa = CalculadoraAmortizacao(15000, 0.012, 400, inicio)
+    reduz_parcela = fixa.gerar_plano_completo({3: 500}, MODO_PARCELA)
+    dados_parcela = plano_para_bytes(reduz_parcela, {3: 500}, MODO_PARCELA)
+    assert not ler_cabecalho(dados_parcela).taxa_variavel
+    assert ler_cabecalho(dados_parcela).modo == MODO_PARCELA
+    assert plano_de_buffer(dados_parcela, modo=MODO_PARCELA, curva=CurvaTaxas([0.012])).quantidade_parcelas \
+        == reduz_parcela.quantidade_parcelas
+    
+    # Mesma taxa na parcela 1, mas outra curva ou outro modo: o arquivo é recusado
+    for buffer, modo, curva_pedida in ((dados, None, CurvaTaxas([0.012])),
+                                       (dados, MODO_PARCELA, None),
+                                       (dados_parcela, MODO_PRAZO, None)):
+        try:
+            plano_de_buffer(buffer, modo=modo, curva=curva_pedida)
+            assert False, "Plano de outro modo ou outra curva aceito"
+        except ValueError:
+            pass
+    print("✓ Teste modo e curva no cabeçalho: PASSOU")
+
+
+if __name__ == "__main__":
+    print("Executando testes do formato binário...\n")
+    
+    test_arquivo_mmap_sem_copia()
+    test_bytes_e_validacao()
+    test_modo_e_curva_no_cabecalho()
+    
+    print("\n✅ Todos os testes do formato binário passaram!")
@@ -0,0 +1,216 @@
+"""
+Testes para o pool de conexões SQLite
+"""
+
+import sqlite3
+import sys
+import tempfile
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+# Adiciona src ao path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from src.database import GerenciadorBancoDados
+from src.pool_conexoes import PerfilDurabilidade
+
+
+def test_conexao_reutilizada_entre_chamadas():
+    """Testa que um resumo completo usa uma única conexão já configurada"""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        bd = GerenciadorBancoDados(Path(tmpdir) / "test.db")
+        fin_id = bd.criar_financiamento("Moto", 15000, 0.012, 400)
+        bd.registrar_aporte(fin_id, 3, 500)
+
+        resumo = bd.gerar_resumo_financiamento(fin_id)
+        assert resumo['total_aportes'] == 500
+
+        estatisticas = bd.estatisticas_pool()
+        assert estatisticas.criadas == 1 and estatisticas.abertas == 1
+        assert estatisticas.reutilizadas >= 7
+        assert bd._conexao().execute("PRAGMA temp_store").fetchone()[0] == 2  # MEMORY
+
+        # Chamada que falha antes do commit não deixa a transação pendurada
+        conn = bd._conexao()
+        conn.execute("UPDATE financiamentos SET saldo_atual = 0 WHERE id = ?", (fin_id,))
+        assert bd.obter_financiamento(fin_id)['saldo_atual'] == 15000
+
+        bd.fechar()
+        assert bd.estatisticas_pool().abertas == 0
+        assert bd.obter_financiamento(fin_id)['nome'] == "Moto"  # Reabre sob demanda
+        bd.fechar()
+        print("✓ Teste conexão reutilizada entre chamadas: PASSOU")
+
+
+def test_uma_conexao_por_thread():
+    """Testa conexões separadas por thread e o descarte das threads encerradas"""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        bd = GerenciadorBancoDados(Path(tmpdir) / "test.db")
+        fin_id = bd.criar_financiamento("Carro", 40000, 0.015, 1200)
+        erros = []
+
+        def consultar():
+            try:
+                for _ in range(20):
+                    assert bd.obter_financiamento(fin_id)['nome'] == "Carro"
+                bd.registrar_aporte(fin_id, 2, 100)
+            except Exception as erro:  # pragma: no cover - falha aparece no assert abaixo
+                erros.append(erro)
+
+        threads = [threading.Thread(target=consultar) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert not erros, erros
+        assert bd.total_aportes(fin_id) == 400
+        estatisticas = bd.estatisticas_pool()
+        assert estatisticas.criadas == 5  # Thread principal + 4 threads
+        assert estatisticas.descartadas == 4 and estatisticas.abertas == 1
+        bd.fechar()
+        print("✓ Teste uma conexão por thread: PASSOU")
+
+
+def test_perfil_e_retentativa_com_banco_ocupado():
+    """Testa os PRAGMAs do perfil e as novas tentativas quando outro processo trava o banco"""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        caminho = Path(tmpdir) / "test.db"
+        perfil = PerfilDurabilidade(busy_timeout_ms=0, tentativas=20, espera_inicial=0.01,
+                                    espera_maxima=0.02)
+        bd = GerenciadorBancoDados(caminho, perfil)
+        conn = bd._conexao()
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        assert conn.execute("PRAGMA synchronous").fetchone()[0] == 1  # NORMAL
+        fin_id = bd.criar_financiamento("Moto", 15000, 0.012, 400)
+
+        # Outro escritor segura a trava de escrita por 150 ms
+        outro = sqlite3.connect(str(caminho), isolation_level=None, check_same_thread=False)
+        outro.execute("BEGIN IMMEDIATE")
+        threading.Timer(0.15, outro.commit).start()
+        bd.registrar_aporte(fin_id, 3, 500)
+        assert bd.obter_aportes_dict(fin_id) == {3: 500}
+        assert bd.estatisticas_pool().retentativas > 0
+
+        # Trava que nunca é liberada: desiste depois das tentativas do perfil
+        outro.execute("BEGIN IMMEDIATE")
+        try:
+            bd.registrar_aporte(fin_id, 4, 500)
+            assert False, "Deveria desistir com o banco travado"
+        except sqlite3.OperationalError as erro:
+            assert "locked" in str(erro)
+        outro.rollback()
+        outro.close()
+        bd.fechar()
+        print("✓ Teste perfil e retentativa com banco ocupado: PASSOU")
+
+
+def test_falha_libera_trava_de_escrita():
+    """Testa que uma escrita que falha desfaz a transação na hora, sem esperar o próximo uso"""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        caminho = Path(tmpdir) / "test.db"
+        bd = GerenciadorBancoDados(caminho)
+        fin_id = bd.criar_financiamento("Moto", 15000, 0.012, 400)
+        outro = sqlite3.connect(str(caminho), timeout=0, isolation_level=None)
+
+        try:
+            bd.registrar_aporte(fin_id, 1, None)  # valor_aporte é NOT NULL
+            assert False, "Deveria recusar o aporte sem valor"
+        except sqlite3.IntegrityError:
+            pass
+        outro.execute("BEGIN IMMEDIATE")  # A thread que falhou não segura a trava
+        outro.rollback()
+
+        # Dentro de transacao(), o erro tratado no bloco não desfaz o que veio antes
+        with bd.transacao():
+            bd.registrar_aporte(fin_id, 2, 300)
+            try:
+                bd.registrar_aporte(fin_id, 3, None)
+            except sqlite3.IntegrityError:
+                pass
+            bd.registrar_aporte(fin_id, 4, 200)
+        assert bd.obter_aportes_dict(fin_id) == {2: 300, 4: 200}
+
+        outro.execute("BEGIN IMMEDIATE")
+        outro.rollback()
+        outro.close()
+        bd.fechar()
+        print("✓ Teste falha libera trava de escrita: PASSOU")
+
+
+def test_pragma_que_falha_fecha_conexao():
+    """Testa que a conexão é fechada quando um PRAGMA da abertura falha"""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        bd = GerenciadorBancoDados(Path(tmpdir) / "test.db")
+        bd.fechar()
+        abertas = []
+        conectar = sqlite3.connect
+
+        def registrar(*args, **kwargs):
+            abertas.append(conectar(*args, **kwargs))
+            return abertas[-1]
+
+        bd.pool.pragmas = list(bd.pool.pragmas) + ["PRAGMA journal_mode = inexistente("]
+        sqlite3.connect = registrar
+        try:
+            bd.listar_financiamentos()
+            assert False, "Deveria propagar o erro do PRAGMA"
+        except sqlite3.OperationalError:
+            pass
+        finally:
+            sqlite3.connect = conectar
+
+        assert len(abertas) == 1 and bd.estatisticas_pool().abertas == 0
+        try:
+            abertas[0].execute("SELECT 1")
+            assert False, "A conexão deveria estar fechada"
+        except sqlite3.ProgrammingError:
+            pass
+        print("✓ Teste PRAGMA que falha fecha a conexão: PASSOU")
+
+
+def _escrever_aportes(caminho: str, fin_id: int, inicio: int, quantidade: int) -> int:
+    """Processo escritor: registra `quantidade` aportes, um por transação"""
+    bd = GerenciadorBancoDados(Path(caminho))
+    for numero in range(inicio, inicio + quantidade):
+        bd.registrar_aporte(fin_id, numero, 10)
+        bd.obter_aportes_dict(fin_id)
+    retentativas = bd.estatisticas_pool().retentativas
+    bd.fechar()
+    return retentativas
+
+
+def test_escritores_concorrentes():
+    """Testa vários processos escrevendo no mesmo banco ao mesmo tempo"""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        caminho = Path(tmpdir) / "test.db"
+        bd = GerenciadorBancoDados(caminho)
+        fin_id = bd.criar_financiamento("Moto", 15000, 0.012, 400)
+
+        processos, por_processo = 4, 50
+        with ProcessPoolExecutor(max_workers=processos) as executor:
+            tarefas = [
+                executor.submit(_escrever_aportes, str(caminho), fin_id, i * por_processo, por_processo)
+                for i in range(processos)
+            ]
+            retentativas = sum(tarefa.result() for tarefa in tarefas)
+
+        aportes = bd.obter_aportes_dict(fin_id)
+        assert len(aportes) == processos * por_processo
+        assert bd.total_aportes(fin_id) == 10 * processos * por_processo
+        bd.fechar()
+        print(f"✓ Teste escritores concorrentes: PASSOU ({retentativas} retentativas)")
+
+
+if __name__ == "__main__":
+    print("Executando testes do pool de conexões...\n")
+
+    test_conexao_reutilizada_entre_chamadas()
+    test_uma_conexao_por_thread()
+    test_perfil_e_retentativa_com_banco_ocupado()
+    test_falha_libera_trava_de_escrita()
+    test_pragma_que_falha_fecha_conexao()
+    test_escritores_concorrentes()
+
+    print("\n✅ Todos os testes do pool de conexões passaram!")
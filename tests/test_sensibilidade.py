@@ -0,0 +1,53 @@
+"""
+Testes para a análise de sensibilidade
+"""
+
+import sys
+from pathlib import Path
+from datetime import datetime
+
+# Adiciona src ao path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from src.amortizacao import CalculadoraAmortizacao, BACKEND_DECIMAL
+
+
+def test_juros_por_taxa_diferenca_finita():
+    """Testa d(juros)/d(taxa) contra a diferença finita do motor exato"""
+    inicio = datetime(2026, 2, 3)
+    calc = CalculadoraAmortizacao(15000, 0.012, 400, inicio)
+    sens = calc.sensibilidades()
+    
+    h = 0.0001
+    acima = CalculadoraAmortizacao(15000, 0.012 + h, 400, inicio).resumir().total_juros
+    abaixo = CalculadoraAmortizacao(15000, 0.012 - h, 400, inicio).resumir().total_juros
+    diferenca = float(acima - abaixo) / (2 * h)
+    assert abs(float(sens.juros_por_taxa) - diferenca) / diferenca < 0.01
+    
+    decimal = CalculadoraAmortizacao(15000, 0.012, 400, inicio, backend=BACKEND_DECIMAL)
+    assert decimal.sensibilidades().juros_por_taxa == sens.juros_por_taxa
+    print("✓ Teste juros por taxa: PASSOU")
+
+
+def test_economia_por_real_de_aporte():
+    """Testa a economia marginal por real contra simular_aporte"""
+    calc = CalculadoraAmortizacao(15000, 0.012, 400, datetime(2026, 2, 3))
+    sens = calc.sensibilidades()
+    
+    for parcela in (5, 20, 35):
+        _, economia = calc.simular_aporte(1, parcela)
+        assert abs(sens.economia_por_real[parcela - 1] - float(economia)) < 0.05
+    
+    assert all(sens.economia_por_real[:-1] > sens.economia_por_real[1:]), "Quanto antes, melhor"
+    assert all(sens.custo_de_adiar()[:-1] > 0)
+    assert all(sens.prazo_por_real < 0)
+    print("✓ Teste economia por real de aporte: PASSOU")
+
+
+if __name__ == "__main__":
+    print("Executando testes de sensibilidade...\n")
+    
+    test_juros_por_taxa_diferenca_finita()
+    test_economia_por_real_de_aporte()
+    
+    print("\n✅ Todos os testes de sensibilidade passaram!")